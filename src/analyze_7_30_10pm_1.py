@@ -8,6 +8,8 @@ from datetime import datetime
 from collections import defaultdict
 import sys
 
+from parsely_analysis.aliases import AuthorIdentities
+
 
 # Column mapping from CSV headers to metric names
 METRIC_COLUMNS = {
@@ -20,7 +22,7 @@ METRIC_COLUMNS = {
 
 
 def parse_authors(author_string):
-    """Parse comma-separated authors, extract first names."""
+    """Parse comma-separated authors, return full names."""
     if pd.isna(author_string):
         return []
     
@@ -28,10 +30,7 @@ def parse_authors(author_string):
     for author in author_string.split(','):
         author = author.strip()
         if author:
-            # Extract first name
-            parts = author.split()
-            if parts:
-                authors.append(parts[0])
+            authors.append(author)
     return authors
 
 
@@ -39,31 +38,34 @@ def aggregate_journalist_metrics(df, ignored_authors):
     """Aggregate metrics by journalist."""
     journalist_data = defaultdict(lambda: defaultdict(float))
     journalist_articles = defaultdict(int)
+    identities = AuthorIdentities(ignored_authors)
     
     for _, row in df.iterrows():
         authors = parse_authors(row['Authors'])
         
         for author in authors:
             # Skip ignored authors
-            if author in ignored_authors:
+            key = identities.key(author)
+            if key is None:
                 continue
-                
-            journalist_articles[author] += 1
+            
+            journalist_articles[key] += 1
             
             # Aggregate each metric
             for metric_key, csv_column in METRIC_COLUMNS.items():
                 value = row.get(csv_column, 0)
                 if pd.isna(value):
                     value = 0
-                journalist_data[author][metric_key] += value
+                journalist_data[key][metric_key] += value
     
-    return journalist_data, journalist_articles
+    return identities.label(journalist_data), identities.label(journalist_articles)
 
 
 def aggregate_monthly_metrics(df, ignored_authors):
     """Aggregate metrics by journalist and month."""
     monthly_data = defaultdict(lambda: defaultdict(lambda: defaultdict(float)))
     monthly_articles = defaultdict(lambda: defaultdict(int))
+    identities = AuthorIdentities(ignored_authors)
     
     for _, row in df.iterrows():
         authors = parse_authors(row['Authors'])
@@ -74,19 +76,21 @@ def aggregate_monthly_metrics(df, ignored_authors):
         
         for author in authors:
             # Skip ignored authors
-            if author in ignored_authors:
+            key = identities.key(author)
+            if key is None:
                 continue
-                
-            monthly_articles[year_month][author] += 1
+            
+            monthly_articles[year_month][key] += 1
             
             # Aggregate each metric
             for metric_key, csv_column in METRIC_COLUMNS.items():
                 value = row.get(csv_column, 0)
                 if pd.isna(value):
                     value = 0
-                monthly_data[year_month][author][metric_key] += value
+                monthly_data[year_month][key][metric_key] += value
     
-    return monthly_data, monthly_articles
+    return ({month: identities.label(authors) for month, authors in monthly_data.items()},
+            {month: identities.label(authors) for month, authors in monthly_articles.items()})
 
 
 def get_top_n_overall(journalist_data, journalist_articles, metric, n):
@@ -0,0 +1,187 @@
+"""Array containers for per-author and per-month aggregates.
+
+A (year_month, author) aggregate table is held as one float64 array of
+(month, author) rows by metric, grouped by month, plus author codes and
+month offsets, instead of nested dicts of boxed floats. Only months an
+author published in take a row: month x author grids of long exports are
+mostly empty. The containers are read-only mappings with the same shape as
+the dicts they replace:
+
+    monthly_metrics[month][metric_key][author] -> value
+
+Iteration follows the aggregate table's row order, and count columns are
+returned as ints, so reports built on the mapping API are unchanged.
+Rankings use top(), which ranks every month in one sort.
+"""
+
+from collections.abc import Mapping
+
+import numpy as np
+import pandas as pd
+
+
+def top_segments(values, offsets, n):
+    """Top n row indices of each segment, by value descending then row order.
+
+    Segment i is rows offsets[i]:offsets[i + 1]. NaN values are skipped and
+    ties keep row order, like heapq.nlargest over the mapping.
+
+    Returns a list with one index array per segment.
+    """
+    sizes = np.diff(offsets)
+    segment = np.repeat(np.arange(len(sizes)), sizes)
+    valid = ~np.isnan(values)
+    # lexsort is stable: within a segment, equal values stay in row order
+    ranked = np.lexsort((np.where(valid, -values, np.inf), segment))
+    counts = np.minimum(np.bincount(segment[valid], minlength=len(sizes)), n)
+    return [ranked[start:start + count] for start, count in zip(offsets[:-1], counts)]
+
+
+class AuthorValues(Mapping):
+    """Read-only {author: value} view of one metric."""
+
+    def __init__(self, parent, column):
+        self.parent = parent
+        self.column = column
+
+    def value(self, row):
+        value = self.parent.data[row, self.column]
+        return int(value) if self.parent.integer[self.column] else float(value)
+
+    def __getitem__(self, author):
+        return self.value(self.parent.rows[author])
+
+    def __contains__(self, author):
+        return author in self.parent.rows
+
+    def __iter__(self):
+        return iter(self.parent.names)
+
+    def __len__(self):
+        return len(self.parent.names)
+
+    def values(self):
+        values = self.parent.data[:, self.column]
+        return values.astype(np.int64).tolist() if self.parent.integer[self.column] else values.tolist()
+
+    def items(self):
+        return list(zip(self.parent.names, self.values()))
+
+
+class AuthorMetrics(Mapping):
+    """Read-only {metric: {author: value}} view of an author x metric array.
+
+    Args:
+        names: Author names, one per array row, in display order.
+        metrics: Metric keys, one per array column.
+        data: Author x metric float64 array.
+        integer: Whether each metric holds counts.
+    """
+
+    def __init__(self, names, metrics, data, integer):
+        self.names = names
+        self.rows = {name: row for row, name in enumerate(names)}
+        self.metrics = metrics
+        self.data = data
+        self.integer = integer
+
+    @classmethod
+    def from_table(cls, table):
+        """Container for an aggregate table indexed by author."""
+        return cls(
+            [str(author) for author in table.index],
+            list(table.columns),
+            table.to_numpy(dtype=np.float64),
+            [table[c].dtype.kind in 'iu' for c in table.columns],
+        )
+
+    def __getitem__(self, metric_key):
+        return AuthorValues(self, self.metrics.index(metric_key))
+
+    def __iter__(self):
+        return iter(self.metrics)
+
+    def __len__(self):
+        return len(self.metrics)
+
+    def top(self, metric_key, n):
+        """Top n (author, value) pairs by one metric, NaN values skipped."""
+        view = self[metric_key]
+        (rows,) = top_segments(self.data[:, view.column], np.array([0, len(self.names)]), n)
+        return [(self.names[row], view.value(row)) for row in rows]
+
+
+class MonthlyMetrics(Mapping):
+    """Read-only {month: {metric: {author: value}}} view of month-grouped author rows.
+
+    Args:
+        months: Months in order.
+        authors: Distinct author names.
+        codes: Author of each row, as an index into authors.
+        offsets: Rows offsets[i]:offsets[i + 1] belong to months[i].
+        metrics: Metric keys, one per array column.
+        data: Row x metric float64 array.
+        integer: Whether each metric holds counts.
+    """
+
+    def __init__(self, months, authors, codes, offsets, metrics, data, integer):
+        self.months = months
+        self.month_index = {month: i for i, month in enumerate(months)}
+        self.authors = authors
+        self.codes = codes
+        self.offsets = offsets
+        self.metrics = metrics
+        self.data = data
+        self.integer = integer
+
+    @classmethod
+    def from_table(cls, table):
+        """Container for an aggregate table indexed by (year_month, author), or by tag instead of author."""
+        month_codes, months = pd.factorize(table.index.get_level_values('year_month'), sort=True)
+        author_codes, authors = pd.factorize(table.index.get_level_values(1))
+
+        # Group rows by month, keeping table order within each month
+        by_month = np.argsort(month_codes, kind='stable')
+        offsets = np.searchsorted(month_codes[by_month], np.arange(len(months) + 1))
+        return cls(
+            list(months),
+            np.asarray([str(author) for author in authors], dtype=object),
+            author_codes[by_month],
+            offsets,
+            list(table.columns),
+            table.to_numpy(dtype=np.float64)[by_month],
+            [table[c].dtype.kind in 'iu' for c in table.columns],
+        )
+
+    def __getitem__(self, month):
+        i = self.month_index[month]
+        start, end = self.offsets[i], self.offsets[i + 1]
+        return AuthorMetrics(self.authors[self.codes[start:end]].tolist(), self.metrics, self.data[start:end],
+                             self.integer)
+
+    def __iter__(self):
+        return iter(self.months)
+
+    def __len__(self):
+        return len(self.months)
+
+    def select(self, months):
+        """Container restricted to the given months."""
+        bounds = [(self.offsets[self.month_index[m]], self.offsets[self.month_index[m] + 1]) for m in months]
+        rows = np.concatenate([np.arange(start, end) for start, end in bounds] + [np.zeros(0, dtype=np.int64)])
+        offsets = np.concatenate([[0], np.cumsum([end - start for start, end in bounds], dtype=np.int64)])
+        return MonthlyMetrics(list(months), self.authors, self.codes[rows], offsets, self.metrics, self.data[rows],
+                              self.integer)
+
+    def top(self, metric_key, n):
+        """Top n (author, value) pairs by one metric for every month, ranked in one sort.
+
+        Returns a dict of month -> list of pairs, NaN values skipped.
+        """
+        column = self.metrics.index(metric_key)
+        values = self.data[:, column]
+        tops = {}
+        for month, rows in zip(self.months, top_segments(values, self.offsets, n)):
+            month_values = values[rows].astype(np.int64).tolist() if self.integer[column] else values[rows].tolist()
+            tops[month] = list(zip(self.authors[self.codes[rows]].tolist(), month_values))
+        return tops
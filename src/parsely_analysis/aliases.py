@@ -0,0 +1,211 @@
+"""Canonical author identities: automatic name normalization plus configured aliases.
+
+Names are compared by a key (Unicode NFKC, casefolded, whitespace collapsed),
+so "Lena  Geller" and "lena geller" are one author. An alias file maps further
+variants onto a canonical name:
+
+    {"INDY staff": ["Staff", "INDY Staff Writer"]}
+
+Keys are computed once per distinct name in the author dictionary, never per
+article.
+"""
+
+from collections import Counter
+from pathlib import Path
+import json
+import unicodedata
+
+import numpy as np
+import pandas as pd
+
+
+# Active alias table: normalized variant -> canonical name (see use_aliases)
+ALIASES = {}
+
+
+def normalize_name(name):
+    """Comparison key for a name: NFKC-normalized, casefolded, single-spaced."""
+    return ' '.join(unicodedata.normalize('NFKC', name).casefold().split())
+
+
+def load_aliases(path):
+    """Read an alias file mapping canonical names to lists of variants.
+
+    Returns a dict of normalized variant -> canonical name.
+    """
+    config = json.loads(Path(path).read_text())
+    aliases = {}
+    for canonical, variants in config.items():
+        for variant in [canonical] + list(variants):
+            aliases[normalize_name(variant)] = canonical
+    return aliases
+
+
+def use_aliases(path):
+    """Make the aliases in path (or none, if path is None) active for author parsing."""
+    ALIASES.clear()
+    if path is not None:
+        ALIASES.update(load_aliases(path))
+
+
+def author_key(name):
+    """Canonical identity key of an author name, after aliases."""
+    key = normalize_name(name)
+    if key in ALIASES:
+        return normalize_name(ALIASES[key])
+    return key
+
+
+def display_names(keys, names, counts):
+    """Display name for each distinct key.
+
+    An aliased key shows its configured canonical name; otherwise the most
+    common spelling is used, ties going to the alphabetically first.
+
+    Args:
+        keys: Key of each spelling.
+        names: The spellings.
+        counts: How often each spelling occurs.
+
+    Returns:
+        Dict of key -> display name.
+    """
+    canonical = {normalize_name(c): c for c in ALIASES.values()}
+    spellings = pd.DataFrame({'key': keys, 'name': names, 'count': counts})
+    spellings = spellings.sort_values(['key', 'count', 'name'], ascending=[True, False, True], kind='stable')
+    display = spellings.drop_duplicates('key').set_index('key')['name'].to_dict()
+    for key in display:
+        if key in canonical:
+            display[key] = canonical[key]
+    return display
+
+
+def canonicalize_names(names, parents, codes, ignored=()):
+    """Map dictionary-encoded author names to canonical identities.
+
+    Args:
+        names: Distinct spellings (the dictionary).
+        parents: Article of every (article, author) pair.
+        codes: Dictionary code of every (article, author) pair.
+        ignored: Authors to drop, matched by canonical identity.
+
+    Returns:
+        (keep, codes, display): a mask of the pairs to keep (ignored authors
+        and repeated credits dropped), their codes into display, and display
+        (the distinct canonical display names).
+    """
+    key_codes, unique_keys, dropped = name_keys(names, ignored)
+    keep = ~dropped[key_codes[codes]] & first_credits(parents, key_codes[codes])
+
+    counts = np.bincount(codes[keep], minlength=len(names))
+    display = display_names(unique_keys[key_codes], list(names), counts)
+    return keep, key_codes[codes], [display[key] for key in unique_keys]
+
+
+def name_keys(names, ignored=()):
+    """Identity keys of distinct names.
+
+    Returns (key_codes, keys, dropped): the code of each name into keys (the
+    distinct keys, an object array) and whether each key is an ignored author.
+    """
+    keys = [author_key(name) for name in names]
+    key_codes, unique_keys = pd.factorize(np.asarray(keys, dtype=object))
+    unique_keys = np.asarray(unique_keys, dtype=object)
+    dropped = np.zeros(len(unique_keys), dtype=bool)
+    if ignored:
+        ignored_keys = {author_key(name) for name in ignored}
+        dropped = np.fromiter((key in ignored_keys for key in unique_keys), dtype=bool, count=len(unique_keys))
+    return key_codes, unique_keys, dropped
+
+
+def first_credits(parents, keys):
+    """Mask of the first pair of each (article, identity), so an author named twice in a byline is credited once.
+
+    This happens when a byline lists two variants of one author, e.g.
+    "Staff, INDY staff" with an alias merging them.
+    """
+    pairs = np.asarray(parents, dtype=np.int64) * (int(np.max(keys, initial=-1)) + 1) + keys
+    _, first = np.unique(pairs, return_index=True)
+    mask = np.zeros(len(pairs), dtype=bool)
+    mask[first] = True
+    return mask
+
+
+def resolve_names(names, known):
+    """Spell each name as it appears in known when both are the same author."""
+    lookup = {author_key(name): name for name in known}
+    return [lookup.get(author_key(name), name) for name in names]
+
+
+def short_names(authors):
+    """Short display name for each distinct author, computed once per author.
+
+    Authors are shown by first name. Authors sharing a first name get their
+    last initial ("Lena G."), and full names are used where that still
+    collides, so two people never share a display name.
+    """
+    parts = {author: author.split() for author in authors}
+    first = {author: words[0] if words else "Unknown" for author, words in parts.items()}
+    first_counts = Counter(first.values())
+
+    names = {}
+    for author, words in parts.items():
+        if first_counts[first[author]] == 1:
+            names[author] = first[author]
+        elif len(words) > 1:
+            names[author] = f"{words[0]} {words[-1][0]}."
+        else:
+            names[author] = author
+
+    counts = Counter(names.values())
+    return {author: name if counts[name] == 1 else author for author, name in names.items()}
+
+
+def short_display_names(spellings):
+    """Collision-safe short name of each author key, derived once per author.
+
+    Args:
+        spellings: Counter of (key, spelling) -> occurrences.
+
+    Returns:
+        Dict of key -> short name of its display name (see display_names
+        and short_names).
+    """
+    if not spellings:
+        return {}
+    keys, names = zip(*spellings)
+    display = display_names(keys, names, list(spellings.values()))
+    short = short_names(display.values())
+    return {key: short[name] for key, name in display.items()}
+
+
+class AuthorIdentities:
+    """Identity keys of the author spellings seen in a row-by-row aggregation.
+
+    key() is computed once per distinct spelling; label() relabels a dict
+    keyed by identity with collision-safe short names (see
+    short_display_names).
+    """
+
+    def __init__(self, ignored=()):
+        self.keys = {}
+        self.spellings = Counter()
+        self.ignored = {author_key(name) for name in ignored}
+        self.names = None
+
+    def key(self, author):
+        """Identity key of a credited spelling, or None for an ignored author."""
+        if author not in self.keys:
+            self.keys[author] = author_key(author)
+        key = self.keys[author]
+        if key in self.ignored:
+            return None
+        self.spellings[key, author] += 1
+        self.names = None
+        return key
+
+    def label(self, by_key):
+        """by_key with each identity key replaced by the author's short name."""
+        if self.names is None:
+            self.names = short_display_names(self.spellings)
+        return {self.names[key]: value for key, value in by_key.items()}
@@ -0,0 +1,134 @@
+"""Author and tag list parsing on Arrow arrays."""
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from parsely_analysis.aliases import canonicalize_names
+
+
+def to_arrow_strings(values):
+    """Convert an Authors column (pandas Series, Arrow array or list) to an Arrow string array.
+
+    Arrow-backed pandas columns are passed through without copying; object
+    columns are converted once.
+    """
+    if isinstance(values, pd.Series):
+        array = pa.array(values, from_pandas=True)
+    elif isinstance(values, (pa.Array, pa.ChunkedArray)):
+        array = values
+    else:
+        array = pa.array(values, type=pa.string(), from_pandas=True)
+
+    if isinstance(array, pa.ChunkedArray):
+        array = array.combine_chunks()
+    if pa.types.is_dictionary(array.type):
+        array = array.cast(array.type.value_type)
+    if pa.types.is_null(array.type):
+        array = array.cast(pa.string())
+    if pa.types.is_large_string(array.type) or pa.types.is_string_view(array.type):
+        array = array.cast(pa.string())
+    return array
+
+
+# Stand-in for ", " inside a single name while splitting on bare commas
+SPACED_COMMA = '\x1f'
+
+
+def split_strings(array, keep_spaced_commas=False):
+    """Split, flatten and trim an Arrow string array of comma-separated names.
+
+    With keep_spaced_commas, only bare commas separate names, so smart tags
+    such as "Law, Gov't & Politics" stay whole.
+
+    Returns (parents, codes, dictionary); parents are positions in array and
+    are sorted ascending.
+    """
+    if keep_spaced_commas:
+        array = pc.replace_substring(array, pattern=', ', replacement=SPACED_COMMA)
+    lists = pc.split_pattern(array, pattern=',')
+    parents = pc.list_parent_indices(lists)
+    names = pc.list_flatten(lists)
+    if keep_spaced_commas:
+        names = pc.replace_substring(names, pattern=SPACED_COMMA, replacement=', ')
+    names = pc.utf8_trim_whitespace(names)
+
+    keep = pc.not_equal(names, '')
+    names = pc.filter(names, keep)
+    parents = pc.filter(parents, keep)
+
+    encoded = pc.dictionary_encode(names)
+    codes = encoded.indices.to_numpy(zero_copy_only=False).astype(np.int32, copy=False)
+    parents = parents.to_numpy(zero_copy_only=False).astype(np.int64, copy=False)
+    return parents, codes, encoded.dictionary
+
+
+def split_categorical(values, keep_spaced_commas=False):
+    """Split a categorical list column by parsing each distinct string once.
+
+    Every article's names are then gathered from its category's slice of the
+    parsed result with integer arithmetic only.
+    """
+    categories = pa.array(values.cat.categories.to_numpy(dtype=object), type=pa.string(), from_pandas=True)
+    if len(categories) == 0:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int32), pa.array([], type=pa.string())
+    cat_parents, cat_codes, dictionary = split_strings(categories, keep_spaced_commas)
+
+    # Names of category c occupy cat_codes[starts[c]:starts[c] + counts[c]]
+    counts = np.bincount(cat_parents, minlength=len(categories))
+    starts = np.concatenate([[0], np.cumsum(counts)[:-1]])
+
+    article_cats = values.cat.codes.to_numpy()
+    valid = article_cats >= 0
+    lens = np.where(valid, counts[np.where(valid, article_cats, 0)], 0)
+
+    parents = np.repeat(np.arange(len(values), dtype=np.int64), lens)
+    ramp = np.arange(len(parents)) - np.repeat(np.cumsum(lens) - lens, lens)
+    entries = np.repeat(starts[np.where(valid, article_cats, 0)], lens) + ramp
+    return parents, cat_codes[entries], dictionary
+
+
+def split_names(values, ignored=(), keep_spaced_commas=False):
+    """Split a comma-separated list column into (row, name) pairs with Arrow compute.
+
+    Names are trimmed and empty names dropped without materializing a Python
+    string per occurrence: the split, flatten and trim all happen on Arrow
+    buffers and the result is dictionary-encoded. Categorical columns are
+    split once per distinct string.
+
+    Args:
+        values: List column, one comma-separated string (or null) per row.
+        ignored: Names to drop, matched against the dictionary once.
+        keep_spaced_commas: Treat ", " as part of a name (smart tags).
+
+    Returns:
+        (parents, codes, dictionary) where parents[i] is the row position of
+        the i-th name, codes[i] indexes into dictionary (an Arrow string array
+        of the distinct names).
+    """
+    if isinstance(values, pd.Series) and isinstance(values.dtype, pd.CategoricalDtype):
+        parents, codes, dictionary = split_categorical(values, keep_spaced_commas)
+    else:
+        parents, codes, dictionary = split_strings(to_arrow_strings(values), keep_spaced_commas)
+
+    if ignored:
+        # Code-set lookup: resolve ignored names against the dictionary once
+        ignored = pc.is_in(dictionary, value_set=pa.array(list(ignored), type=pa.string()))
+        keep = ~ignored.to_numpy(zero_copy_only=False)[codes]
+        parents = parents[keep]
+        codes = codes[keep]
+
+    return parents, codes, dictionary
+
+
+def split_authors(values, ignored_authors=()):
+    """Split an Authors column into (article, author) pairs; see split_names.
+
+    Authors are resolved to canonical identities (see aliases) through the
+    dictionary, so spelling variants are merged, an author named twice on
+    one article is credited once, and ignored_authors matches every variant.
+    """
+    parents, codes, dictionary = split_names(values)
+    keep, codes, names = canonicalize_names(dictionary.to_pylist(), parents, codes, ignored_authors)
+    return parents[keep], codes[keep].astype(np.int32, copy=False), pa.array(names, type=pa.string())
@@ -0,0 +1,380 @@
+#!/usr/bin/env python3
+"""Pluggable dataframe backends for the load -> filter -> explode -> aggregate pipeline."""
+
+from pathlib import Path
+import click
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+from parsely_analysis.aliases import author_key, display_names, first_credits, name_keys
+from parsely_analysis.authors import split_names
+from parsely_analysis.loader import load_export
+from parsely_analysis.metrics import (
+    CREDIT_SCALE, METRIC_CATALOG, DEFAULT_METRICS, aggregate_metrics, combine_split_credit, finalize_metrics,
+    partial_metrics, resolve_metrics,
+)
+
+
+BACKENDS = ['auto', 'pandas', 'polars']
+
+
+def polars_available():
+    """Return True if the optional polars dependency is installed."""
+    try:
+        import polars  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def resolve_backend(backend):
+    """Resolve 'auto' to polars when installed, otherwise pandas."""
+    if backend == 'auto':
+        return 'polars' if polars_available() else 'pandas'
+    if backend == 'polars' and not polars_available():
+        raise ImportError("The polars backend requires polars. Install it with: pip install 'parsely_analysis[polars]'")
+    return backend
+
+
+def needed_columns(metric_keys):
+    """Source columns the pipeline reads for the given metrics (projection)."""
+    _, sums = resolve_metrics(metric_keys)
+    return ['Authors', 'Publish date'] + [METRIC_CATALOG[key]['column'] for key in sums]
+
+
+def aggregate_pandas(path, metric_keys=None, after_date=None, ignored_authors=(), by_month=False):
+    """Run the pipeline eagerly with pandas, reading only the needed columns."""
+    df, by = prepare_frame(load_export(path, columns=needed_columns(metric_keys)), after_date, by_month)
+    return aggregate_metrics(df, metric_keys, by=by, ignored_authors=ignored_authors)
+
+
+def prepare_frame(df, after_date=None, by_month=False):
+    """Parse dates, apply the date filter and add year_month; returns (df, by)."""
+    df['Publish date'] = pd.to_datetime(df['Publish date'], errors='coerce')
+    if after_date:
+        df = df[df['Publish date'] > pd.to_datetime(after_date)]
+
+    by = None
+    if by_month:
+        df = df.dropna(subset=['Publish date'])
+        df = df.assign(year_month=df['Publish date'].dt.to_period('M'))
+        by = 'year_month'
+    return df, by
+
+
+def aggregate_polars(path, metric_keys=None, after_date=None, ignored_authors=(), by_month=False):
+    """Run the pipeline on a polars LazyFrame.
+
+    The date filter and column selection are pushed down into the CSV,
+    Parquet or Arrow scan, and the explode + group_by run multi-threaded
+    inside polars. Only the per-author result is converted back to pandas.
+    """
+    return aggregate_lazy(scan_polars(path, resolve_metrics(metric_keys)[1]), metric_keys, after_date,
+                          ignored_authors, by_month)
+
+
+def aggregate_lazy(lf, metric_keys=None, after_date=None, ignored_authors=(), by_month=False):
+    """The polars pipeline of aggregate_polars, on an already scanned (or converted) LazyFrame."""
+    selected, sums = resolve_metrics(metric_keys)
+    partial, spellings = lazy_partial(lf, sums, after_date, ignored_authors, by_month)
+    return finalize_metrics(merge_partials([partial], [spellings], sums), selected)
+
+
+def lazy_partial(lf, sums, after_date=None, ignored_authors=(), by_month=False):
+    """Identity-keyed partial of a polars LazyFrame (see frame_partial)."""
+    import polars as pl
+
+    schema = lf.collect_schema()
+    lf = lf.select(
+        pl.col('Authors').cast(pl.String),
+        publish_date_expr(schema).alias('publish_dt'),
+        *[
+            pl.col(METRIC_CATALOG[key]['column']).cast(pl.Float64, strict=False).fill_null(0).alias(key)
+            if METRIC_CATALOG[key]['column'] in schema else pl.lit(0.0).alias(key)
+            for key in sums
+        ],
+    )
+
+    if after_date:
+        lf = lf.filter(pl.col('publish_dt') > pd.to_datetime(after_date).to_pydatetime())
+
+    by = []
+    if by_month:
+        lf = lf.filter(pl.col('publish_dt').is_not_null())
+        lf = lf.with_columns(pl.col('publish_dt').dt.truncate('1mo').alias('year_month'))
+        by = ['year_month']
+
+    lf = (
+        lf.with_row_index('row')
+        .with_columns(pl.col('Authors').str.split(',').alias('author'))
+        .explode('author')
+        .with_columns(pl.col('author').str.strip_chars())
+        .filter(pl.col('author').is_not_null() & (pl.col('author') != ''))
+    )
+    # One call over the whole column, so each distinct spelling is keyed once
+    lf = lf.with_columns(pl.col('author').map_batches(author_key_series, return_dtype=pl.String).alias('key'))
+    if ignored_authors:
+        lf = lf.filter(~pl.col('key').is_in([author_key(a) for a in ignored_authors]))
+    # An author named twice on one article (e.g. under two aliases) is credited once
+    lf = lf.unique(subset=['row', 'key'], keep='first', maintain_order=True)
+    lf = lf.with_columns(pl.len().over('row').alias('num_authors'))
+
+    # Group by spelling and co-author count, summing in fixed point; spellings
+    # of one author are merged on the small result
+    result = lf.group_by(by + ['key', 'author', 'num_authors'], maintain_order=True).agg(
+        *[(pl.col(key) * CREDIT_SCALE).round().cast(pl.Int64).sum().alias(key) for key in sums],
+        pl.len().cast(pl.Int64).alias('article_count'),
+        (pl.col('num_authors') == 1).sum().cast(pl.Int64).alias('solo_articles'),
+        (pl.col('num_authors') > 1).sum().cast(pl.Int64).alias('collab_articles'),
+    ).collect()
+
+    table = result.to_pandas()
+    if by_month:
+        table['year_month'] = table['year_month'].dt.to_period('M')
+    spellings = table.groupby(['key', 'author'], sort=False)['article_count'].sum()
+    spellings = pd.DataFrame({
+        'key': spellings.index.get_level_values('key'),
+        'name': spellings.index.get_level_values('author'),
+        'count': spellings.to_numpy(),
+    })
+    partial = table.drop(columns='author').rename(columns={'key': 'author'})
+    partial = partial.groupby(by + ['author', 'num_authors'], sort=False).sum()
+    return partial, spellings
+
+
+def frame_partial(df, sums, after_date=None, ignored_authors=(), by_month=False):
+    """Identity-keyed partial aggregate of an article table, with pandas.
+
+    Authors are keyed by identity (see aliases.author_key) rather than
+    display name, which depends on spelling counts over everything being
+    aggregated. Partials of disjoint article tables add up exactly (see
+    merge_partials).
+
+    Returns (partial, spellings): the metrics.partial_metrics table, keyed by
+    (*by, author identity, num_authors), and a (key, name, count) frame of
+    the author spellings it credits.
+    """
+    df, by = prepare_frame(df, after_date, by_month)
+
+    parents, codes, dictionary = split_names(df['Authors'])
+    key_codes, keys, dropped = name_keys(dictionary.to_pylist(), ignored_authors)
+    keep = ~dropped[key_codes[codes]] & first_credits(parents, key_codes[codes])
+    parents, codes = parents[keep], codes[keep]
+
+    pairs = pd.DataFrame({
+        'row': parents,
+        'author': pd.Categorical.from_codes(key_codes[codes], categories=pd.Index(keys, dtype=object)),
+        'num_authors': np.bincount(parents, minlength=len(df))[parents],
+    })
+    partial = partial_metrics(df, sums, by, pairs)
+    authors = partial.index.levels[partial.index.names.index('author')]
+    partial.index = partial.index.set_levels(authors.astype(object), level='author')
+
+    spellings = pd.DataFrame({
+        'key': keys[key_codes],
+        'name': dictionary.to_pylist(),
+        'count': np.bincount(codes, minlength=len(dictionary)),
+    })
+    return partial, spellings[spellings['count'] > 0]
+
+
+def merge_partials(partials, spellings, sums):
+    """Add up identity-keyed partials and resolve identities to display names once.
+
+    Returns the per-(*by, author) sums table (see metrics.combine_split_credit).
+    """
+    partial = pd.concat(partials)
+    partial = partial.groupby(level=list(partial.index.names), sort=False).sum()
+
+    counts = pd.concat(spellings).groupby(['key', 'name'], sort=False)['count'].sum()
+    display = display_names(counts.index.get_level_values('key'), counts.index.get_level_values('name'),
+                            counts.to_numpy())
+    partial = partial.rename(index=display, level='author')
+    return combine_split_credit(partial, sums)
+
+
+def scan_polars(path, sums=()):
+    """polars LazyFrame over a CSV, Parquet or Arrow export."""
+    import polars as pl
+
+    if str(path).endswith('.csv'):
+        # Metric columns are read as text and cast by the caller, so a float or
+        # stray value far down a column of integers is handled as pd.to_numeric does
+        overrides = {METRIC_CATALOG[key]['column']: pl.String for key in sums}
+        return pl.scan_csv(path, infer_schema_length=10000, schema_overrides=overrides)
+    if str(path).endswith('.arrow'):
+        return pl.scan_ipc(path)
+    return pl.scan_parquet(path)
+
+
+def publish_date_expr(schema):
+    """Publish date as a datetime expression, parsed leniently when stored as text."""
+    import polars as pl
+
+    publish = pl.col('Publish date')
+    if schema['Publish date'] == pl.String:
+        publish = publish.str.to_datetime(strict=False)
+    return publish
+
+
+def summarize_dates(dates, after_date=None):
+    """Counts of parsed publish dates, for the load diagnostics the CLIs print.
+
+    Returns a dict with the number of articles ('rows'), the first and last
+    valid dates (None when there are none), the number of invalid dates and,
+    with after_date, the number of articles published after it ('after').
+    """
+    valid = dates.dropna()
+    summary = {
+        'rows': len(dates),
+        'first': valid.min() if len(valid) else None,
+        'last': valid.max() if len(valid) else None,
+        'invalid': len(dates) - len(valid),
+    }
+    if after_date:
+        summary['after'] = int((valid > pd.to_datetime(after_date)).sum())
+    return summary
+
+
+def date_summary(path, after_date=None, backend='pandas', workers=1):
+    """summarize_dates of an export, reading only its Publish date column."""
+    if backend == 'polars':
+        lf = scan_polars(path)
+        dates = lf.select(publish_date_expr(lf.collect_schema())).collect().to_series().to_pandas()
+    else:
+        dates = load_export(path, columns=['Publish date'], workers=workers)['Publish date']
+        dates = pd.to_datetime(dates, errors='coerce')
+    return summarize_dates(dates, after_date)
+
+
+def author_key_series(names):
+    """Canonical author keys for a polars Series, computed once per distinct name."""
+    import polars as pl
+
+    distinct = names.unique()
+    keys = [None if name is None else author_key(name) for name in distinct.to_list()]
+    return names.replace_strict(distinct, pl.Series(keys, dtype=pl.String), return_dtype=pl.String)
+
+
+def aggregate_file(path, metric_keys=None, after_date=None, ignored_authors=(), by_month=False, backend='auto',
+                   workers=1):
+    """Load, filter, explode and aggregate an export with the chosen backend.
+
+    Returns the same per-author table as metrics.aggregate_metrics, indexed by
+    author (or by year_month and author when by_month is set), regardless of
+    the backend used. With more than one worker, row chunks are aggregated
+    in parallel processes with pandas (see parallel).
+    """
+    if workers > 1:
+        from parsely_analysis.parallel import aggregate_parallel
+        return aggregate_parallel(path, metric_keys, after_date, ignored_authors, by_month, workers)
+    backend = resolve_backend(backend)
+    runner = aggregate_polars if backend == 'polars' else aggregate_pandas
+    return runner(path, metric_keys, after_date, ignored_authors, by_month)
+
+
+def aggregate_frame(df, metric_keys=None, after_date=None, ignored_authors=(), by_month=False, backend='auto'):
+    """aggregate_file for an article table already loaded with pandas (e.g. merged exports)."""
+    if resolve_backend(backend) == 'polars':
+        import polars as pl
+        return aggregate_lazy(pl.from_pandas(df).lazy(), metric_keys, after_date, ignored_authors, by_month)
+    df, by = prepare_frame(df, after_date, by_month)
+    return aggregate_metrics(df, metric_keys, by=by, ignored_authors=ignored_authors)
+
+
+def partial_file(path, sums, after_date=None, ignored_authors=(), by_month=False, backend='auto'):
+    """Identity-keyed partial of an export with the chosen backend (see frame_partial)."""
+    if resolve_backend(backend) == 'polars':
+        return lazy_partial(scan_polars(path, sums), sums, after_date, ignored_authors, by_month)
+    return frame_partial(load_export(path, columns=needed_columns(sums)), sums, after_date, ignored_authors, by_month)
+
+
+def partial_frame(df, sums, after_date=None, ignored_authors=(), by_month=False, backend='auto'):
+    """partial_file for an article table already loaded with pandas (e.g. merged exports)."""
+    if resolve_backend(backend) == 'polars':
+        import polars as pl
+        return lazy_partial(pl.from_pandas(df).lazy(), sums, after_date, ignored_authors, by_month)
+    return frame_partial(df, sums, after_date, ignored_authors, by_month)
+
+
+def compare_tables(left, right):
+    """Return the largest relative difference between two aggregate tables."""
+    # Author levels may be categorical on one side; compare on plain names
+    left = left.reset_index().astype({'author': str}).set_index(left.index.names).sort_index()
+    right = right.reset_index().astype({'author': str}).set_index(right.index.names).sort_index()
+    if not left.index.equals(right.index):
+        raise AssertionError("Backends produced different author/month keys")
+    a = left.to_numpy(dtype=np.float64)
+    b = right[left.columns].to_numpy(dtype=np.float64)
+    both_nan = np.isnan(a) & np.isnan(b)
+    diff = np.abs(a - b) / np.maximum(np.abs(a), 1.0)
+    return float(np.nanmax(np.where(both_nan, 0.0, diff))) if diff.size else 0.0
+
+
+def benchmark_scaling(parquet_file, after_date, ignore_authors, by_month, repeat):
+    """Time parallel aggregation at doubling worker counts and check results match one worker exactly."""
+    metric_keys = list(DEFAULT_METRICS) + ['avg_minutes_per_view']
+    cpus = os.cpu_count() or 1
+    print(f"Input: {parquet_file} ({Path(parquet_file).stat().st_size / 1e6:.1f} MB), {cpus} CPUs")
+
+    counts = [1]
+    while counts[-1] * 2 <= cpus:
+        counts.append(counts[-1] * 2)
+    if counts[-1] != cpus:
+        counts.append(cpus)
+
+    serial = None
+    for workers in counts:
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            table = aggregate_file(parquet_file, metric_keys, after_date, ignore_authors, by_month, 'pandas', workers)
+            timings.append(time.perf_counter() - start)
+        if serial is None:
+            serial, baseline = table, min(timings)
+        elif not table.reset_index().astype({'author': str}).equals(serial.reset_index().astype({'author': str})):
+            raise click.ClickException(f"{workers} workers produced a different table than 1 worker")
+        print(f"{workers:>3} workers  best {min(timings):.3f}s  speedup {baseline / min(timings):.2f}x")
+    print("Results identical at every worker count")
+
+
+@click.command()
+@click.argument('parquet_file', type=click.Path(exists=True))
+@click.option('--after-date', default=None, help='Only include articles published after this date (YYYY-MM-DD)')
+@click.option('--ignore-authors', '-i', multiple=True, help='Authors to ignore (can be specified multiple times)')
+@click.option('--monthly', 'by_month', is_flag=True, help='Aggregate by month and author instead of author only')
+@click.option('--repeat', default=3, help='Timed runs per backend (default: 3)')
+@click.option('--scaling', is_flag=True,
+              help='Instead, time parallel aggregation with 1, 2, 4, ... workers up to one per CPU')
+def main(parquet_file, after_date, ignore_authors, by_month, repeat, scaling):
+    """Benchmark the pandas and polars backends and check that they agree."""
+    if scaling:
+        benchmark_scaling(parquet_file, after_date, ignore_authors, by_month, repeat)
+        return
+    if not polars_available():
+        raise click.ClickException("polars is not installed; nothing to compare against pandas")
+
+    metric_keys = list(DEFAULT_METRICS) + ['avg_minutes_per_view']
+    print(f"Input: {parquet_file} ({Path(parquet_file).stat().st_size / 1e6:.1f} MB)")
+
+    tables = {}
+    for backend in ('pandas', 'polars'):
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            tables[backend] = aggregate_file(parquet_file, metric_keys, after_date, ignore_authors, by_month, backend)
+            timings.append(time.perf_counter() - start)
+        print(f"{backend:<8} best {min(timings):.3f}s  mean {sum(timings) / len(timings):.3f}s  ({len(tables[backend])} rows)")
+
+    max_diff = compare_tables(tables['pandas'], tables['polars'])
+    print(f"Largest relative difference between backends: {max_diff:.2e}")
+    if max_diff > 1e-9:
+        raise click.ClickException("Backends disagree")
+    print("Backends agree")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,54 @@
+"""Staff baselines computed from per-author aggregates."""
+
+import numpy as np
+import pandas as pd
+
+from parsely_analysis.metrics import format_metric
+
+
+def baseline_summary(author_values, baseline_authors):
+    """Mean and median of one metric over the baseline authors.
+
+    Authors are matched by exact name against the aggregate, so the cost is
+    one lookup per baseline author. Authors without a value are skipped.
+
+    Returns a dict with mean, median and count, or None if no baseline
+    author has a value.
+    """
+    values = [author_values[a] for a in baseline_authors if a in author_values and pd.notna(author_values[a])]
+    if not values:
+        return None
+    values = np.asarray(values, dtype=np.float64)
+    return {'mean': float(values.mean()), 'median': float(np.median(values)), 'count': len(values)}
+
+
+def compute_baselines(metrics, baseline_authors, metric_keys):
+    """Baseline summaries for each metric of a {metric: {author: value}} aggregate."""
+    return {key: baseline_summary(metrics[key], baseline_authors) for key in metric_keys}
+
+
+def missing_baseline_authors(metrics, baseline_authors):
+    """Baseline authors that do not appear in the aggregate at all."""
+    return [a for a in baseline_authors if a not in metrics['article_count']]
+
+
+def baseline_delta(value, summary):
+    """Relative difference of value from the baseline mean, or NaN."""
+    if summary is None or not summary['mean'] or pd.isna(value):
+        return np.nan
+    return (value - summary['mean']) / summary['mean']
+
+
+def format_delta(delta):
+    """Format a baseline delta as a signed percentage."""
+    if pd.isna(delta):
+        return "-"
+    return f"{delta:+.1%}"
+
+
+def format_baseline(metric_key, summary):
+    """One-line description of a baseline summary."""
+    if summary is None:
+        return "Baseline: no data for baseline authors"
+    return (f"Baseline ({summary['count']} authors): avg {format_metric(metric_key, summary['mean'])}, "
+            f"median {format_metric(metric_key, summary['median'])}")
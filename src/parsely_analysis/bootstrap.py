@@ -0,0 +1,197 @@
+"""Rank stability from bootstrap resamples of articles.
+
+Each resample draws the export's articles with replacement. Per-author totals
+for a whole batch of resamples come from one segmented product of the
+resample count matrix with the sparse article -> author credit weights.
+"""
+
+import numpy as np
+import pandas as pd
+
+from parsely_analysis.metrics import METRIC_CATALOG, explode_authors, format_metric, resolve_metrics
+from parsely_analysis.render import ranking_table
+
+
+# Upper bound on (resamples x credited pairs) elements materialized per batch
+BATCH_ELEMENTS = 4_000_000
+
+
+def credit_weights(df, sums, ignored_authors=()):
+    """Sparse article -> author weights for each sum metric, grouped by author.
+
+    Returns (rows, starts, authors, weights): the article row of every
+    credited (article, author) pair sorted by author, the offset where each
+    author's pairs start, the author names, and per metric the split credit
+    of every pair (for the count metrics, 1 where the pair counts).
+    """
+    pairs = explode_authors(df, ignored_authors)
+    codes = pairs['author'].cat.codes.to_numpy()
+    order = np.argsort(codes, kind='stable')
+    codes = codes[order]
+    rows = pairs['row'].to_numpy()[order]
+    share = 1.0 / pairs['num_authors'].to_numpy()[order]
+
+    starts = np.flatnonzero(np.r_[True, codes[1:] != codes[:-1]]) if len(codes) else np.array([], dtype=np.int64)
+    authors = pd.Index(pairs['author'].cat.categories[codes[starts]], dtype=object)
+
+    weights = {}
+    for key in sums:
+        source = METRIC_CATALOG[key]['column']
+        if source in df.columns:
+            values = pd.to_numeric(df[source], errors='coerce').fillna(0).to_numpy(dtype=np.float64)
+        else:
+            values = np.zeros(len(df))
+        weights[key] = values[rows] * share
+    solo = pairs['num_authors'].to_numpy()[order] == 1
+    weights['article_count'] = np.ones(len(rows))
+    weights['solo_articles'] = solo.astype(np.float64)
+    weights['collab_articles'] = (~solo).astype(np.float64)
+    return rows, starts, authors, weights
+
+
+def resample_counts(rng, n_articles, batch):
+    """How often each article is drawn in each of batch resamples (batch x articles)."""
+    draws = rng.integers(0, n_articles, size=(batch, n_articles))
+    draws += np.arange(batch)[:, None] * n_articles
+    return np.bincount(draws.ravel(), minlength=batch * n_articles).reshape(batch, n_articles)
+
+
+def metric_values(totals, metric_key):
+    """Resamples x authors values of one metric from summed totals, NaN where undefined."""
+    spec = METRIC_CATALOG[metric_key]
+    if spec['kind'] == 'ratio':
+        denominator = totals[spec['denominator']]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            values = np.where(denominator != 0, totals[spec['numerator']] / denominator, np.nan)
+    else:
+        values = totals[metric_key]
+    # Authors with no articles drawn in a resample are not ranked in it
+    return np.where(totals['article_count'] > 0, values, np.nan)
+
+
+def rank_values(values):
+    """Rank authors within each resample (1 = best); unranked authors come last."""
+    filled = np.where(np.isnan(values), -np.inf, values)
+    order = np.argsort(-filled, axis=1, kind='stable')
+    ranks = np.empty_like(order)
+    np.put_along_axis(ranks, order, np.arange(1, values.shape[1] + 1)[None, :], axis=1)
+    return ranks
+
+
+def bootstrap_rankings(df, metric_keys, n_resamples, top_n, ignored_authors=(), seed=None):
+    """Bootstrap rank stability for the observed top authors of each metric.
+
+    Args:
+        df: Article-level DataFrame the rankings were computed from.
+        metric_keys: Metrics to rank by.
+        n_resamples: Number of bootstrap resamples.
+        top_n: Size of the leaderboard whose membership is tested.
+        ignored_authors: Authors to drop before splitting credit.
+        seed: Random seed, for reproducible intervals.
+
+    Returns:
+        Dict of metric key -> DataFrame indexed by the observed top_n authors
+        in rank order, with the observed value, the probability of ranking
+        first, of staying in the top_n and of beating the next author down,
+        and 95% intervals for rank and value.
+    """
+    _, sums = resolve_metrics(metric_keys)
+    rows, starts, authors, weights = credit_weights(df, sums, ignored_authors)
+    if len(authors) == 0:
+        return {}
+
+    keys = list(weights)
+    stacked = np.stack([weights[k] for k in keys])
+    observed = dict(zip(keys, np.add.reduceat(stacked, starts, axis=1)[:, None, :]))
+
+    rng = np.random.default_rng(seed)
+    batch = max(1, min(n_resamples, BATCH_ELEMENTS // max(len(rows), 1)))
+    samples = {key: [] for key in metric_keys}
+    for done in range(0, n_resamples, batch):
+        counts = resample_counts(rng, len(df), min(batch, n_resamples - done))
+        drawn = counts[:, rows]
+        totals = {k: np.add.reduceat(drawn * w, starts, axis=1) for k, w in zip(keys, stacked)}
+        for key in metric_keys:
+            samples[key].append(metric_values(totals, key))
+
+    results = {}
+    for key in metric_keys:
+        point = metric_values(observed, key)[0]
+        ranked = np.flatnonzero(~np.isnan(point))
+        top = ranked[np.argsort(-point[ranked], kind='stable')][:top_n]
+
+        values = np.concatenate(samples[key])
+        ranks = rank_values(values)[:, top]
+        chosen = values[:, top]
+        beats_next = np.full(len(top), np.nan)
+        if len(top) > 1:
+            filled = np.where(np.isnan(chosen), -np.inf, chosen)
+            beats_next[:-1] = (filled[:, :-1] > filled[:, 1:]).mean(axis=0)
+
+        with np.errstate(all='ignore'):
+            value_lo, value_hi = np.nanpercentile(chosen, [2.5, 97.5], axis=0)
+        results[key] = pd.DataFrame({
+            'value': point[top],
+            'p_first': (ranks == 1).mean(axis=0),
+            'p_top': (ranks <= top_n).mean(axis=0),
+            'p_beats_next': beats_next,
+            'rank_lo': np.percentile(ranks, 2.5, axis=0, method='lower'),
+            'rank_hi': np.percentile(ranks, 97.5, axis=0, method='higher'),
+            'value_lo': value_lo,
+            'value_hi': value_hi,
+        }, index=authors[top])
+    return results
+
+
+def format_bound(metric_key, value):
+    """A confidence bound: ratio metrics as the catalog formats them, sums as whole numbers."""
+    if METRIC_CATALOG[metric_key]['kind'] == 'ratio' or pd.isna(value):
+        return format_metric(metric_key, value)
+    return f"{value:.0f}"
+
+
+def format_chance(value):
+    """A probability as a whole percentage, or "-" where it is undefined."""
+    return "-" if pd.isna(value) else f"{value:.0%}"
+
+
+def bootstrap_table(stability, metric_key, n_resamples, top_n):
+    """Rank stability for the top authors of one metric, as a ranking table."""
+    display = METRIC_CATALOG[metric_key]['display']
+    rows = [
+        (i, author, row['p_first'], row['p_top'], row['p_beats_next'],
+         int(row['rank_lo']), int(row['rank_hi']), row['value_lo'], row['value_hi'])
+        for i, (author, row) in enumerate(stability.iterrows(), 1)
+    ]
+
+    def bound(value):
+        return format_bound(metric_key, value)
+
+    return ranking_table(
+        f"RANK STABILITY BY {display.upper()} ({n_resamples} resamples)",
+        ['Rank', 'Journalist', 'P(#1)', f'P(top {top_n})', 'P(>next)', 'Rank low', 'Rank high', 'Value low', 'Value high'],
+        rows,
+        meta={'report': 'bootstrap', 'metric': metric_key, 'resamples': n_resamples},
+        formats={
+            'P(#1)': format_chance,
+            f'P(top {top_n})': format_chance,
+            'P(>next)': format_chance,
+            'Value low': bound,
+            'Value high': bound,
+        },
+    )
+
+
+def format_bootstrap(table):
+    """Text lines of a rank stability table."""
+    metric_key = table['meta']['metric']
+    display = METRIC_CATALOG[metric_key]['display']
+    lines = ["", "=" * 60, table['title'], "=" * 60]
+    lines.append(f"{'Rank':<5} {'Journalist':<30} {'P(#1)':>6} {table['columns'][3]:>10} {'P(>next)':>9} "
+                 f"{'Rank 95% CI':>12}  {display} 95% CI")
+    lines.append("-" * 60)
+    for i, author, p_first, p_top, p_beats_next, rank_lo, rank_hi, value_lo, value_hi in table['rows']:
+        rank_ci = f"{rank_lo}-{rank_hi}"
+        lines.append(f"{i:<5} {author:<30} {p_first:>6.0%} {p_top:>10.0%} {format_chance(p_beats_next):>9} "
+                     f"{rank_ci:>12}  {format_bound(metric_key, value_lo)} - {format_bound(metric_key, value_hi)}")
+    return lines
@@ -0,0 +1,170 @@
+"""Cache of rendered reports keyed by input fingerprints and parameters.
+
+Besides each rendered report, the ranking tables a command hands over (see
+keep_tables) are stored under a key without the output format, so a
+markdown, CSV or JSON report is rendered from them without rerunning the
+command.
+"""
+
+from pathlib import Path
+import click
+import contextlib
+import functools
+import hashlib
+import io
+import json
+import os
+import sys
+
+from parsely_analysis.render import freeze_tables, render_tables
+
+
+DEFAULT_CACHE_DIR = Path(os.environ.get('XDG_CACHE_HOME', Path.home() / '.cache')) / 'parsely_analysis' / 'reports'
+
+# Least recently used reports are evicted beyond this total size
+CACHE_MAX_BYTES = 256 * 1024 * 1024
+
+# Options whose order doesn't change the report
+UNORDERED_PARAMS = {'ignore_authors'}
+
+# Options that change how a report is computed but not what it says
+EXECUTION_PARAMS = ('no_cache', 'workers', 'backend', 'cache_format')
+
+# Context meta entry holding the ranking tables of the running command
+TABLES_META = 'parsely_analysis.tables'
+
+
+def file_fingerprint(path):
+    """Resolved path, size and modification time of an input file."""
+    path = Path(path).resolve()
+    stat = path.stat()
+    return [str(path), stat.st_size, stat.st_mtime_ns]
+
+
+def code_fingerprint():
+    """Latest modification time of the package's modules, so edits invalidate reports."""
+    package_dir = Path(__file__).parent
+    return max(path.stat().st_mtime_ns for path in package_dir.glob('*.py'))
+
+
+def normalize_params(params, skip=()):
+    """Parameters as they affect the report: skipped ones dropped, unordered ones sorted."""
+    return {
+        name: sorted(set(value)) if name in UNORDERED_PARAMS else value
+        for name, value in params.items() if name not in skip
+    }
+
+
+def cache_key(command, inputs, params):
+    """Key of a report: command, input fingerprints, normalized parameters and code version."""
+    payload = {
+        'command': command,
+        'inputs': [file_fingerprint(path) for path in inputs if path is not None],
+        'params': params,
+        'code': code_fingerprint(),
+    }
+    return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode()).hexdigest()
+
+
+def lookup(key, cache_dir=None, suffix='.txt'):
+    """Stored report (or tables, with suffix '.json') for key, or None; a hit marks it as recently used."""
+    path = Path(cache_dir or DEFAULT_CACHE_DIR) / f"{key}{suffix}"
+    try:
+        report = path.read_text()
+    except FileNotFoundError:
+        return None
+    os.utime(path)
+    return report
+
+
+def store(key, report, cache_dir=None, max_bytes=CACHE_MAX_BYTES, suffix='.txt'):
+    """Store a report, then evict least recently used entries beyond max_bytes."""
+    cache_dir = Path(cache_dir or DEFAULT_CACHE_DIR)
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    tmp = cache_dir / f"{key}.tmp"
+    tmp.write_text(report)
+    os.replace(tmp, cache_dir / f"{key}{suffix}")
+
+    paths = list(cache_dir.glob('*.txt')) + list(cache_dir.glob('*.json'))
+    entries = sorted(((p.stat(), p) for p in paths), key=lambda e: e[0].st_mtime_ns, reverse=True)
+    total = 0
+    for stat, path in entries:
+        total += stat.st_size
+        if total > max_bytes:
+            path.unlink(missing_ok=True)
+
+
+def keep_tables(tables):
+    """Hand the running command's ranking tables to cached_report, to store for other output formats."""
+    ctx = click.get_current_context(silent=True)
+    if ctx is not None:
+        ctx.meta[TABLES_META] = tables
+
+
+class Tee(io.TextIOBase):
+    """Text stream that writes through to another stream and keeps a copy."""
+
+    def __init__(self, stream):
+        self.stream = stream
+        self.buffer = io.StringIO()
+
+    def write(self, text):
+        self.buffer.write(text)
+        return self.stream.write(text)
+
+    def flush(self):
+        self.stream.flush()
+
+
+def cached_report(command, input_params, bypass=None):
+    """Decorator caching the stdout of a click command's callback.
+
+    The report is keyed by the fingerprints of the input files named in
+    input_params (path, size and modification time, not content) and every
+    other parameter except the EXECUTION_PARAMS, so progress and timing
+    lines that depend on those belong on stderr. On a hit the
+    stored report is written and the command is skipped; on a miss stdout is
+    recorded and stored once the command returns without error. A markdown,
+    CSV or JSON report missing from the cache is rendered from stored
+    tables when a run in another format kept them (see keep_tables). Runs
+    with --no-cache, or for which bypass(params) is true (side effects,
+    unseeded randomness), are neither looked up nor stored.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(**params):
+            if params['no_cache'] or (bypass is not None and bypass(params)):
+                return func(**params)
+
+            inputs = [params[name] for name in input_params]
+            key = cache_key(command, inputs, normalize_params(params, skip=EXECUTION_PARAMS))
+            report = lookup(key)
+            if report is not None:
+                sys.stdout.write(report)
+                return None
+
+            # Tables don't depend on the output format they are rendered in
+            tables_key = cache_key(command, inputs, normalize_params(params, skip=EXECUTION_PARAMS + ('output_format',)))
+            output_format = params.get('output_format', 'text')
+            if output_format != 'text':
+                tables = lookup(tables_key, suffix='.json')
+                if tables is not None:
+                    report = render_tables(json.loads(tables), output_format)
+                    sys.stdout.write(report)
+                    store(key, report)
+                    return None
+
+            # Registered on the context so redirects the command adds unwind first
+            ctx = click.get_current_context()
+            tee = Tee(sys.stdout)
+            ctx.with_resource(contextlib.redirect_stdout(tee))
+            result = func(**params)
+
+            def store_all():
+                store(key, tee.buffer.getvalue())
+                if ctx.meta.get(TABLES_META) is not None:
+                    store(tables_key, json.dumps(freeze_tables(ctx.meta[TABLES_META]), default=str), suffix='.json')
+            ctx.call_on_close(store_all)
+            return result
+        return wrapper
+    return decorator
@@ -0,0 +1,307 @@
+#!/usr/bin/env python3
+"""Catalog of Parsely exports for picking the files that cover a date range.
+
+Scanning an input tree records each export's site and date range (from its
+filename), row count, schema, content hash and Arrow copy in an SQLite
+database. Later scans only stat files, re-reading new or changed ones, so
+--from/--to is resolved to a set of exports without opening any CSV.
+"""
+
+from datetime import timedelta
+from pathlib import Path
+import click
+import csv
+import hashlib
+import heapq
+import os
+import re
+import sqlite3
+
+import numpy as np
+import pandas as pd
+import pyarrow.parquet as pq
+
+from parsely_analysis.loader import CACHE_FORMATS, arrow_copy_path, copy_is_current, next_record_start
+
+
+DEFAULT_CATALOG = Path(os.environ.get('XDG_CACHE_HOME', Path.home() / '.cache')) / 'parsely_analysis' / 'catalog.sqlite'
+
+# Bumped when the table layout changes; older catalogs are rebuilt
+CATALOG_VERSION = 1
+
+COLUMNS = ['path', 'site', 'start_date', 'end_date', 'rows', 'schema', 'hash', 'size', 'mtime_ns', 'artifact']
+
+# Bytes read at a time when hashing and counting records
+READ_BLOCK = 16 << 20
+
+
+# posts-export-by-page-views-Jul-01-2024-Jul-31-2025-indyweek-com[_suffix].csv, or an Arrow copy
+# of one (...-indyweek-com[_suffix]-<digest>.arrow, see loader.arrow_copy_path)
+EXPORT_NAME = re.compile(
+    r'^posts-export-by-[a-z-]+?-'
+    r'(?P<start>[A-Z][a-z]{2}-\d{2}-\d{4})-(?P<end>[A-Z][a-z]{2}-\d{2}-\d{4})-'
+    r'(?P<site>[a-z0-9-]+?)(?:_[^.]*)?(?:\.(?:csv|parquet)|-[0-9a-f]{12}\.arrow)$'
+)
+
+
+def parse_export_name(path):
+    """Site and date range from a Parsely export filename, or None if it doesn't match.
+
+    The site is the domain with its last hyphen turned back into a dot
+    ("indyweek-com" -> "indyweek.com").
+    """
+    match = EXPORT_NAME.match(Path(path).name)
+    if match is None:
+        return None
+    site = match['site']
+    if '-' in site:
+        head, _, tld = site.rpartition('-')
+        site = f"{head}.{tld}"
+    return {
+        'site': site,
+        'start': pd.to_datetime(match['start'], format='%b-%d-%Y'),
+        'end': pd.to_datetime(match['end'], format='%b-%d-%Y'),
+    }
+
+
+def export_files(paths, recursive=False):
+    """Export files given directly or found in directories (and their subdirectories, if recursive).
+
+    When a CSV has an up-to-date Parquet copy next to it, only the Parquet
+    file is used.
+    """
+    files = []
+    for path in map(Path, paths):
+        glob = path.rglob if recursive else path.glob
+        files.extend(sorted(glob('*.csv')) + sorted(glob('*.parquet')) if path.is_dir() else [path])
+
+    chosen = {}
+    for path in files:
+        stem = path.with_suffix('')
+        if stem not in chosen or (path.suffix == '.parquet' and path.stat().st_mtime > chosen[stem].stat().st_mtime):
+            chosen[stem] = path
+    return sorted(chosen.values())
+
+
+def open_catalog(catalog_file=DEFAULT_CATALOG):
+    """Open (creating or rebuilding as needed) the catalog database."""
+    Path(catalog_file).parent.mkdir(parents=True, exist_ok=True)
+    db = sqlite3.connect(str(catalog_file))
+    if db.execute('PRAGMA user_version').fetchone()[0] != CATALOG_VERSION:
+        db.execute('DROP TABLE IF EXISTS exports')
+        db.execute(f'PRAGMA user_version = {CATALOG_VERSION}')
+    db.execute(
+        'CREATE TABLE IF NOT EXISTS exports (path TEXT PRIMARY KEY, site TEXT, start_date TEXT, end_date TEXT, '
+        'rows INTEGER, schema TEXT, hash TEXT, size INTEGER, mtime_ns INTEGER, artifact TEXT)'
+    )
+    return db
+
+
+def schema_version(columns):
+    """Short fingerprint of an export's column names, equal for exports with the same layout."""
+    return hashlib.sha1('\x1f'.join(columns).encode()).hexdigest()[:8]
+
+
+def csv_stats(path):
+    """Content hash, record count and column names of a CSV, in one read.
+
+    Records are counted as newlines outside quoted fields, less the header
+    (see loader.next_record_start).
+    """
+    digest = hashlib.sha256()
+    newlines, quotes = 0, 0
+    header, last = None, b'\n'
+    with open(path, 'rb') as f:
+        while block := f.read(READ_BLOCK):
+            digest.update(block)
+            data = np.frombuffer(block, dtype=np.uint8)
+            if header is None:
+                header = block[:next_record_start(data, 0, 0)]
+            is_quote = data == ord('"')
+            inside = (quotes + np.cumsum(is_quote)) % 2 == 1
+            newlines += int(np.count_nonzero((data == ord('\n')) & ~inside))
+            quotes += int(np.count_nonzero(is_quote))
+            last = block[-1:]
+    records = newlines + (last != b'\n') - 1
+    columns = next(csv.reader([(header or b'').decode('utf-8-sig', errors='replace')]), [])
+    return digest.hexdigest(), max(records, 0), columns
+
+
+def parquet_stats(path):
+    """Content hash, row count and column names of a Parquet export."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        while block := f.read(READ_BLOCK):
+            digest.update(block)
+    metadata = pq.ParquetFile(path).metadata
+    return digest.hexdigest(), metadata.num_rows, list(metadata.schema.to_arrow_schema().names)
+
+
+def current_artifact(path):
+    """Path of an up-to-date Arrow copy of the export (see --cache-format), or None."""
+    for cache_format in CACHE_FORMATS:
+        arrow_path = arrow_copy_path(path, cache_format)
+        if arrow_path is not None and copy_is_current(path, arrow_path):
+            return str(arrow_path)
+    return None
+
+
+def update_catalog(paths, catalog_file=DEFAULT_CATALOG):
+    """Record the exports in paths (files or directory trees) in the catalog.
+
+    Exports whose size and modification time are unchanged are not read
+    again. Entries of files that no longer exist are dropped.
+
+    Returns the catalog entries of the exports in paths, as dicts with
+    start_date and end_date as Timestamps, sorted by site and start date.
+    """
+    db = open_catalog(catalog_file)
+    stored = {row[0]: dict(zip(COLUMNS, row)) for row in db.execute(f"SELECT {', '.join(COLUMNS)} FROM exports")}
+    for gone in [p for p in stored if not Path(p).exists()]:
+        db.execute('DELETE FROM exports WHERE path = ?', (gone,))
+
+    entries = []
+    for path in export_files(paths, recursive=True):
+        info = parse_export_name(path)
+        if info is None:
+            continue
+        key = str(path.resolve())
+        stat = path.stat()
+        entry = stored.get(key)
+        if entry is None or (entry['size'], entry['mtime_ns']) != (stat.st_size, stat.st_mtime_ns):
+            print(f"Cataloging: {path.name}")
+            digest, rows, columns = csv_stats(path) if path.suffix == '.csv' else parquet_stats(path)
+            entry = {
+                'path': key, 'site': info['site'], 'start_date': str(info['start'].date()),
+                'end_date': str(info['end'].date()), 'rows': rows, 'schema': schema_version(columns), 'hash': digest,
+                'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns,
+            }
+        entry['artifact'] = current_artifact(path)
+        db.execute(f"INSERT OR REPLACE INTO exports VALUES ({', '.join('?' * len(COLUMNS))})",
+                   [entry[c] for c in COLUMNS])
+        entries.append({**entry, 'start_date': pd.Timestamp(entry['start_date']),
+                        'end_date': pd.Timestamp(entry['end_date'])})
+    db.commit()
+    db.close()
+    return sorted(entries, key=lambda e: (e['site'], e['start_date'], e['end_date']))
+
+
+def interval_cover(entries, start, end):
+    """Pick exports that cover start..end (inclusive days) without overlapping.
+
+    Each chosen export begins the day after the previous one ends; only the
+    first may begin before start, and only the last may run past end. Among
+    such chains, the one leaving the fewest days uncovered wins, then the one
+    spilling the fewest days outside the period (so monthly files beat a
+    longer export that runs past it), then the one with the fewest files.
+
+    Returns (chosen, gaps): the chosen entries in date order and the
+    (first, last) days of each uncovered stretch.
+    """
+    day = timedelta(days=1)
+    best = {start: (0, 0, 0)}
+    previous = {}
+    heap = [((0, 0, 0), start)]
+    while heap:
+        cost, cursor = heapq.heappop(heap)
+        if cost > best[cursor]:
+            continue
+        if cursor > end:
+            break
+
+        # Covering the next days with an export, skipping to the next export's
+        # start, or giving up on the rest of the period
+        steps = [((end - cursor).days + 1, 0, 0, end + day, None)]
+        for entry in entries:
+            first, last = entry['start_date'], entry['end_date']
+            if last < cursor:
+                continue
+            if first == cursor or (cursor == start and first < start):
+                spill = max((start - first).days, 0) + max((last - end).days, 0)
+                steps.append((0, spill, 1, last + day, entry))
+            elif cursor < first <= end:
+                steps.append(((first - cursor).days, 0, 0, first, None))
+
+        for gap, spill, files, following, entry in steps:
+            total = (cost[0] + gap, cost[1] + spill, cost[2] + files)
+            if following not in best or total < best[following]:
+                best[following] = total
+                previous[following] = (cursor, entry)
+                heapq.heappush(heap, (total, following))
+
+    chosen, gaps = [], []
+    node = cursor
+    while node != start:
+        prior, entry = previous[node]
+        if entry is None:
+            gaps.append((prior, min(node, end + day) - day))
+        else:
+            chosen.append(entry)
+        node = prior
+    return chosen[::-1], gaps[::-1]
+
+
+def select_exports(entries, start=None, end=None, site=None):
+    """Cover start..end for each site with its cataloged exports (see interval_cover).
+
+    A missing start or end defaults to the site's earliest start or latest
+    end. Returns a dict of site -> (chosen entries, gaps).
+    """
+    sites = {}
+    for entry in entries:
+        if site is None or entry['site'] == site:
+            sites.setdefault(entry['site'], []).append(entry)
+
+    selection = {}
+    for name, site_entries in sites.items():
+        first = start if start is not None else min(e['start_date'] for e in site_entries)
+        last = end if end is not None else max(e['end_date'] for e in site_entries)
+        selection[name] = interval_cover(site_entries, first, last)
+    return selection
+
+
+def print_gaps(site, gaps):
+    """Warn about the days of the requested period no chosen export covers."""
+    for first, last in gaps:
+        print(f"Warning: no {site} export covers {first.date()} to {last.date()}")
+
+
+@click.command()
+@click.argument('paths', nargs=-1, type=click.Path(exists=True))
+@click.option('--catalog', 'catalog_file', type=click.Path(dir_okay=False), default=str(DEFAULT_CATALOG),
+              help='Catalog database (default: ~/.cache/parsely_analysis/catalog.sqlite)')
+@click.option('--from', 'start', type=click.DateTime(['%Y-%m-%d']), default=None,
+              help='List only the exports covering the period from this day (YYYY-MM-DD)')
+@click.option('--to', 'end', type=click.DateTime(['%Y-%m-%d']), default=None,
+              help='List only the exports covering the period up to this day (YYYY-MM-DD)')
+@click.option('--site', default=None, help='Only list exports of this site (e.g. indyweek.com)')
+def main(paths, catalog_file, start, end, site):
+    """Catalog Parsely exports and list the ones covering a date range.
+
+    PATHS are export files or directories to scan (default: the current
+    directory). With --from and/or --to, only the fewest non-overlapping
+    exports covering that period are listed, one path per line.
+    """
+
+    entries = update_catalog(paths or ['.'], catalog_file)
+    if not entries:
+        raise click.ClickException("No Parsely exports found (expected names like posts-export-by-page-views-...-site-com.csv)")
+
+    if start is None and end is None:
+        print(f"{'Site':<20} {'From':<10}  {'To':<10}  {'Rows':>8}  {'Schema':<8}  Path")
+        for entry in entries:
+            if site is None or entry['site'] == site:
+                print(f"{entry['site']:<20} {entry['start_date'].date()}  {entry['end_date'].date()}  "
+                      f"{entry['rows']:>8}  {entry['schema']:<8}  {entry['path']}")
+        return
+
+    start = pd.Timestamp(start) if start is not None else None
+    end = pd.Timestamp(end) if end is not None else None
+    for name, (chosen, gaps) in select_exports(entries, start, end, site).items():
+        print_gaps(name, gaps)
+        for entry in chosen:
+            print(entry['artifact'] or entry['path'])
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,114 @@
+"""Co-authorship analysis from the sparse article x author matrix."""
+
+import numpy as np
+import pandas as pd
+
+from parsely_analysis.metrics import METRIC_CATALOG, explode_authors
+from parsely_analysis.render import ranking_table
+
+
+def coauthor_pairs(df, metric_key='views', ignored_authors=()):
+    """Off-diagonal entries of W^T W for the article x author incidence matrix W.
+
+    Every article contributes one entry per pair of its credited authors, so
+    the work grows with the number of co-author pairs rather than with the
+    square of the number of authors. Entries for the same pair are then
+    summed, as in a sparse COO -> CSR conversion.
+
+    Returns:
+        DataFrame indexed by (author_a, author_b), author_a < author_b, with
+        shared_articles and shared_credit (the metric credited to the two of
+        them on their joint articles), sorted by shared_articles.
+    """
+    pairs = explode_authors(df, ignored_authors)
+    # Recode authors in name order so each pair is keyed (author_a, author_b) alphabetically
+    categories = pairs['author'].cat.categories
+    rank = np.argsort(np.argsort(np.asarray(categories, dtype=object), kind='stable'))
+    categories = categories[np.argsort(rank)]
+    rows = pairs['row'].to_numpy()
+    codes = rank[pairs['author'].cat.codes.to_numpy()].astype(np.int64)
+    num_authors = pairs['num_authors'].to_numpy()
+
+    source = METRIC_CATALOG[metric_key]['column']
+    if source in df.columns:
+        values = pd.to_numeric(df[source], errors='coerce').fillna(0).to_numpy(dtype=np.float64)
+    else:
+        values = np.zeros(len(df))
+
+    # Pairs arrive grouped by article; pair each entry with the later entries of its article
+    order = np.argsort(rows, kind='stable')
+    rows, codes, num_authors = rows[order], codes[order], num_authors[order]
+    starts = np.flatnonzero(np.r_[True, rows[1:] != rows[:-1]]) if len(rows) else np.array([], dtype=np.int64)
+    position = np.arange(len(rows)) - np.repeat(starts, np.diff(np.r_[starts, len(rows)]))
+    partners = num_authors - 1 - position
+
+    left = np.repeat(np.arange(len(rows)), partners)
+    first_partner = np.repeat(np.cumsum(partners) - partners, partners)
+    right = left + 1 + (np.arange(len(left)) - first_partner)
+
+    a = np.minimum(codes[left], codes[right])
+    b = np.maximum(codes[left], codes[right])
+    keep = a != b
+    a, b, article = a[keep], b[keep], rows[left][keep]
+    credit = values[article] * 2 / num_authors[left][keep]
+
+    keys, inverse, shared = np.unique(a * len(categories) + b, return_inverse=True, return_counts=True)
+    result = pd.DataFrame({
+        'author_a': np.asarray(categories[keys // len(categories)], dtype=object),
+        'author_b': np.asarray(categories[keys % len(categories)], dtype=object),
+        'shared_articles': shared,
+        'shared_credit': np.bincount(inverse, weights=credit, minlength=len(keys)),
+    })
+    result = result.sort_values(['shared_articles', 'shared_credit'], ascending=False, kind='stable')
+    return result.set_index(['author_a', 'author_b'])
+
+
+def collaborator_counts(pair_table):
+    """Number of distinct co-authors per author (the degree in the co-authorship graph)."""
+    authors = pair_table.index.to_frame(index=False)
+    return pd.concat([authors['author_a'], authors['author_b']]).value_counts()
+
+
+def collaboration_tables(metrics, pair_table, metric_key='views', top_n=10, min_articles=5):
+    """Top collaborator pairs and the most collaborative journalists, as two ranking tables."""
+    display = METRIC_CATALOG[metric_key]['display']
+    degree = collaborator_counts(pair_table)
+    pairs = ranking_table(
+        "TOP COLLABORATOR PAIRS",
+        ['Journalist', 'Co-author', 'Shared', f'Shared {display}'],
+        [(a, b, shared, credit) for (a, b), shared, credit in pair_table.head(top_n).itertuples()],
+        meta={'report': 'collaborator_pairs', 'metric': metric_key},
+        formats={f'Shared {display}': lambda value: f"{value:.0f}"},
+    )
+
+    collab_ratios = []
+    for author, total in metrics['article_count'].items():
+        collab = metrics['collab_articles'][author]
+        if total > min_articles:
+            collab_ratios.append((author, collab / total, total, collab, degree.get(author, 0)))
+    collab_ratios.sort(key=lambda x: x[1], reverse=True)
+    ratios = ranking_table(
+        f"COLLABORATION ANALYSIS (journalists with >{min_articles} articles)",
+        ['Journalist', 'Collab %', 'Total', 'Collabs', 'Co-authors'],
+        collab_ratios[:top_n],
+        meta={'report': 'collaboration'},
+        formats={'Collab %': lambda value: f"{value*100:.1f}%"},
+    )
+    return [pairs, ratios]
+
+
+def format_collaboration(tables):
+    """Text lines of the collaborator pairs and collaboration analysis tables."""
+    pairs, ratios = tables
+    lines = ["", "=" * 60, pairs['title'], "=" * 60]
+    lines.append(f"{'Journalists':<50} {'Shared':>7} {pairs['columns'][3]:>20}")
+    lines.append("-" * 60)
+    for a, b, shared, credit in pairs['rows']:
+        lines.append(f"{f'{a} + {b}':<50} {shared:>7} {credit:>20.0f}")
+
+    lines += ["", "=" * 60, ratios['title'], "=" * 60]
+    lines.append(f"{'Journalist':<30} {'Collab %':<10} {'Total':<8} {'Collabs':<8} {'Co-authors'}")
+    lines.append("-" * 60)
+    for author, ratio, total, collabs, partners in ratios['rows']:
+        lines.append(f"{author:<30} {ratio*100:>8.1f}% {total:>8} {collabs:>8} {partners:>10}")
+    return lines
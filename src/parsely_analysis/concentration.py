@@ -0,0 +1,97 @@
+"""How concentrated each author's total is in a few articles."""
+
+import numpy as np
+import pandas as pd
+
+from parsely_analysis.metrics import METRIC_CATALOG, explode_authors
+from parsely_analysis.render import ranking_table
+
+
+def author_concentration(df, metric_key='views', ignored_authors=()):
+    """Per-author distribution statistics of one sum metric over their articles.
+
+    Uses each article's credited (split) value, so totals match the rankings.
+    The exploded frame is sorted once by (author, value); every statistic is
+    then a segmented reduction over the sorted values.
+
+    Returns:
+        DataFrame indexed by author with total, articles, median (per
+        article), top_share (largest article's share of the total) and gini
+        (0 = evenly spread, towards 1 = one article carries the total).
+    """
+    pairs = explode_authors(df, ignored_authors)
+    source = METRIC_CATALOG[metric_key]['column']
+    if source in df.columns:
+        values = pd.to_numeric(df[source], errors='coerce').fillna(0).to_numpy(dtype=np.float64)
+    else:
+        values = np.zeros(len(df))
+    credited = values[pairs['row'].to_numpy()] / pairs['num_authors'].to_numpy()
+    codes = pairs['author'].cat.codes.to_numpy()
+
+    order = np.lexsort((credited, codes))
+    codes, sorted_values = codes[order], credited[order]
+    if len(codes) == 0:
+        return pd.DataFrame(columns=['total', 'articles', 'median', 'top_share', 'gini'])
+
+    starts = np.flatnonzero(np.r_[True, codes[1:] != codes[:-1]])
+    counts = np.diff(np.r_[starts, len(codes)])
+    ends = starts + counts
+
+    totals = np.add.reduceat(sorted_values, starts)
+    median = (sorted_values[starts + (counts - 1) // 2] + sorted_values[starts + counts // 2]) / 2
+    top = sorted_values[ends - 1]
+
+    # Gini of ascending x_1..x_n: 2 * sum(i * x_i) / (n * sum(x)) - (n + 1) / n
+    position = np.arange(len(codes)) - np.repeat(starts, counts) + 1
+    weighted = np.add.reduceat(position * sorted_values, starts)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        top_share = np.where(totals > 0, top / totals, np.nan)
+        gini = np.where(totals > 0, 2 * weighted / (counts * totals) - (counts + 1) / counts, np.nan)
+
+    authors = pd.Index(pairs['author'].cat.categories[codes[starts]], dtype=object, name='author')
+    return pd.DataFrame({
+        'total': totals,
+        'articles': counts,
+        'median': median,
+        'top_share': top_share,
+        'gini': gini,
+    }, index=authors)
+
+
+def format_share(value, spec):
+    """A share or Gini value, or "-" where it is undefined."""
+    return "-" if pd.isna(value) else format(value, spec)
+
+
+def concentration_table(table, metric_key, top_n=20):
+    """Concentration statistics of the top authors by total, as a ranking table."""
+    display = METRIC_CATALOG[metric_key]['display']
+    ranked = table.sort_values('total', ascending=False, kind='stable').head(top_n)
+    rows = [
+        (i, author, row['total'], int(row['articles']), row['median'], row['top_share'], row['gini'])
+        for i, (author, row) in enumerate(ranked.iterrows(), 1)
+    ]
+    return ranking_table(
+        f"CONCENTRATION OF {display.upper()} (TOP {top_n} JOURNALISTS)",
+        ['Rank', 'Journalist', 'Total', 'Articles', 'Median', 'Top share', 'Gini'],
+        rows,
+        meta={'report': 'concentration', 'metric': metric_key},
+        formats={
+            'Total': lambda value: f"{value:.0f}",
+            'Median': lambda value: f"{value:.0f}",
+            'Top share': lambda value: format_share(value, '.0%'),
+            'Gini': lambda value: format_share(value, '.2f'),
+        },
+    )
+
+
+def format_concentration(table):
+    """Text lines of a concentration table."""
+    display = METRIC_CATALOG[table['meta']['metric']]['display']
+    lines = ["", "=" * 60, table['title'], "=" * 60]
+    lines.append(f"{'Rank':<5} {'Journalist':<30} {display:>15} {'Articles':>8} {'Median':>10} {'Top share':>10} {'Gini':>6}")
+    lines.append("-" * 60)
+    for i, author, total, articles, median, top_share, gini in table['rows']:
+        lines.append(f"{i:<5} {author:<30} {total:>15.0f} {articles:>8} {median:>10.0f} "
+                     f"{format_share(top_share, '.0%'):>10} {format_share(gini, '.2f'):>6}")
+    return lines
@@ -0,0 +1,159 @@
+"""Multi-key aggregation cube for section and tag breakdowns."""
+
+from pathlib import Path
+import json
+
+import numpy as np
+import pandas as pd
+
+from parsely_analysis.aliases import ALIASES
+from parsely_analysis.authors import split_names
+from parsely_analysis.metrics import METRIC_CATALOG, DEFAULT_METRICS, aggregate_metrics, finalize_metrics, resolve_metrics
+
+
+TAG_COLUMNS = ['High-Level Smart Tags', 'Tags']
+NO_SECTION = '(no section)'
+
+
+def cube_sums(metric_keys):
+    """Sum metrics the cube must hold to derive the given metrics (and the defaults)."""
+    _, sums = resolve_metrics(list(DEFAULT_METRICS) + [k for k in metric_keys or [] if k not in DEFAULT_METRICS])
+    return sums
+
+
+def with_section(df):
+    """Return df's Section column with missing sections given their own label."""
+    section = df['Section'] if 'Section' in df.columns else pd.Series(np.nan, index=df.index)
+    if isinstance(section.dtype, pd.CategoricalDtype):
+        if NO_SECTION not in section.cat.categories:
+            section = section.cat.add_categories(NO_SECTION)
+        return section.fillna(NO_SECTION)
+    return section.fillna(NO_SECTION).astype('category')
+
+
+def aggregate_tags(df, sums, tag_column):
+    """Aggregate full (unsplit) article metrics per (year_month, tag)."""
+    parents, codes, dictionary = split_names(df[tag_column], keep_spaced_commas=True)
+    categories = pd.Index(dictionary.to_numpy(zero_copy_only=False), dtype=object)
+
+    columns = {
+        'year_month': df['year_month'].array.take(parents),
+        'tag': pd.Categorical.from_codes(codes, categories=categories),
+    }
+    for key in sums:
+        source = METRIC_CATALOG[key]['column']
+        if source in df.columns:
+            values = pd.to_numeric(df[source], errors='coerce').fillna(0).to_numpy(dtype=np.float64)
+        else:
+            values = np.zeros(len(df))
+        columns[key] = values[parents]
+    columns['article_count'] = np.ones(len(parents), dtype=np.int64)
+
+    return pd.DataFrame(columns).groupby(['year_month', 'tag'], sort=False, observed=True).sum()
+
+
+def build_cube(df, metric_keys=None, ignored_authors=(), tag_column=None):
+    """Aggregate an export over (month, section, author) and (month, tag).
+
+    Author credit is split equally between co-authors as in the main
+    rankings; tags get each article's full metrics. The cube holds sums and
+    counts only, so any ratio can be derived after slicing or rolling up.
+
+    Args:
+        df: Article-level DataFrame with a parsed 'Publish date'.
+        metric_keys: Metrics the cube must be able to report.
+        ignored_authors: Authors to drop before splitting credit.
+        tag_column: Tag list column (default: first of TAG_COLUMNS present).
+
+    Returns:
+        Dict with 'author_section' indexed by (year_month, section, author)
+        and 'tag' indexed by (year_month, tag).
+    """
+    sums = cube_sums(metric_keys)
+    df = df.dropna(subset=['Publish date'])
+    df = df.assign(year_month=df['Publish date'].dt.to_period('M'), section=with_section(df))
+
+    cube = {
+        'author_section': aggregate_metrics(df, sums, by=['year_month', 'section'], ignored_authors=ignored_authors),
+    }
+    if tag_column is None:
+        tag_column = next((c for c in TAG_COLUMNS if c in df.columns), None)
+    if tag_column is not None:
+        cube['tag'] = aggregate_tags(df, sums, tag_column)
+    return cube
+
+
+def slice_section(cube, section, metric_keys):
+    """(year_month, author) table for one section, ratios derived from the slice."""
+    table = cube['author_section'].xs(section, level='section')
+    return finalize_metrics(table.copy(), list(metric_keys))
+
+
+def rollup_authors(cube, metric_keys):
+    """(year_month, author) table across all sections."""
+    table = cube['author_section'].groupby(level=['year_month', 'author'], sort=False, observed=True).sum()
+    return finalize_metrics(table, list(metric_keys))
+
+
+def tag_table(cube, metric_keys):
+    """(year_month, tag) table with ratios derived, for tag leaderboards."""
+    keep = [k for k in metric_keys if METRIC_CATALOG[k]['kind'] != 'count' or k == 'article_count']
+    table = cube['tag'].copy()
+    for key in keep:
+        spec = METRIC_CATALOG[key]
+        if spec['kind'] == 'ratio':
+            table[key] = table[spec['numerator']] / table[spec['denominator']].replace(0, np.nan)
+    return table[keep + (['article_count'] if 'article_count' not in keep else [])]
+
+
+def sections_by_volume(cube):
+    """Sections ordered by total views, largest first."""
+    totals = cube['author_section'].groupby(level='section', observed=True)['views'].sum()
+    return totals.sort_values(ascending=False).index.tolist()
+
+
+def cube_params(source_path, after_date, ignored_authors):
+    """Input and filter parameters a stored cube was built with."""
+    return {'source': str(Path(source_path).resolve()), 'after_date': after_date, 'ignored_authors': sorted(ignored_authors),
+            'aliases': dict(sorted(ALIASES.items()))}
+
+
+def save_cube(cube, cube_dir, params):
+    """Store each cube table as Parquet under cube_dir, with the parameters used."""
+    cube_dir = Path(cube_dir)
+    cube_dir.mkdir(parents=True, exist_ok=True)
+    (cube_dir / 'params.json').write_text(json.dumps(params))
+    for name, table in cube.items():
+        flat = table.reset_index()
+        flat['year_month'] = flat['year_month'].astype(str)
+        flat.to_parquet(cube_dir / f"{name}.parquet", engine='pyarrow')
+    print(f"Saved aggregation cube to: {cube_dir}")
+
+
+def load_cube(cube_dir, params, source_path=None, metric_keys=None):
+    """Load a cube saved by save_cube.
+
+    Returns None if it is missing, was built with different parameters, is
+    older than source_path, or lacks sums needed for metric_keys.
+    """
+    cube_dir = Path(cube_dir)
+    main_file = cube_dir / 'author_section.parquet'
+    params_file = cube_dir / 'params.json'
+    if not main_file.exists() or not params_file.exists():
+        return None
+    if json.loads(params_file.read_text()) != params:
+        return None
+    if source_path is not None and main_file.stat().st_mtime < Path(source_path).stat().st_mtime:
+        return None
+
+    cube = {}
+    for name, keys in (('author_section', ['year_month', 'section', 'author']), ('tag', ['year_month', 'tag'])):
+        path = cube_dir / f"{name}.parquet"
+        if not path.exists():
+            continue
+        flat = pd.read_parquet(path)
+        flat['year_month'] = pd.PeriodIndex(flat['year_month'], freq='M')
+        cube[name] = flat.set_index(keys)
+
+    missing = [k for k in cube_sums(metric_keys) if k not in cube['author_section'].columns]
+    return None if missing else cube
@@ -3,45 +3,25 @@
 
 import pandas as pd
 from pathlib import Path
-from collections import defaultdict
 import click
+import contextlib
 from datetime import datetime
-import os
+import sys
 import time
 
-
-def parse_authors(author_str):
-    """Parse author string into list of cleaned names."""
-    if pd.isna(author_str) or author_str.strip() == '':
-        return []
-    
-    # Split by comma and clean whitespace
-    authors = [a.strip() for a in author_str.split(',')]
-    # Filter out empty strings
-    return [a for a in authors if a]
-
-
-def save_parquet_if_needed(csv_path, df):
-    """Save DataFrame as Parquet if source was CSV and Parquet doesn't exist or is older."""
-    csv_path = Path(csv_path)
-    parquet_path = csv_path.with_suffix('.parquet')
-    
-    # Check if parquet exists and is newer
-    if parquet_path.exists():
-        csv_mtime = csv_path.stat().st_mtime
-        parquet_mtime = parquet_path.stat().st_mtime
-        
-        if parquet_mtime > csv_mtime:
-            print(f"Skipping Parquet save - {parquet_path.name} is newer than source CSV")
-            return
-    
-    # Save as Parquet
-    try:
-        df.to_parquet(parquet_path, engine='pyarrow')
-        print(f"Saved Parquet file: {parquet_path}")
-    except Exception as e:
-        print(f"ERROR: Failed to save Parquet file: {e}")
-        raise
+from parsely_analysis.aggregates import AuthorMetrics
+from parsely_analysis.aliases import resolve_names, use_aliases
+from parsely_analysis.baseline import (
+    baseline_delta, compute_baselines, format_baseline, format_delta, missing_baseline_authors,
+)
+from parsely_analysis.backends import BACKENDS, aggregate_file, date_summary, resolve_backend, summarize_dates
+from parsely_analysis.bootstrap import bootstrap_rankings, bootstrap_table, format_bootstrap
+from parsely_analysis.cache import cached_report, keep_tables
+from parsely_analysis.collaboration import coauthor_pairs, collaboration_tables, format_collaboration
+from parsely_analysis.concentration import author_concentration, concentration_table, format_concentration
+from parsely_analysis.loader import CACHE_FORMATS, arrow_source, load_export, save_parquet_if_needed
+from parsely_analysis.metrics import METRIC_CATALOG, DEFAULT_METRICS, aggregate_metrics, format_metric
+from parsely_analysis.render import FORMATS, ranking_table, render_tables, write_lines
 
 
 def save_analysis_data(df, after_date=None, output_dir=None):
@@ -78,69 +58,125 @@ def save_analysis_data(df, after_date=None, output_dir=None):
     return filepath
 
 
-def analyze_journalists(df):
-    """Analyze journalist metrics with equal credit distribution."""
-    
-    # Initialize metric dictionaries
-    metrics = {
-        'views': defaultdict(float),
-        'visitors': defaultdict(float),
-        'social_refs': defaultdict(float),
-        'new_visitors': defaultdict(float),
-        'engaged_minutes': defaultdict(float),
-        'article_count': defaultdict(int),
-        'solo_articles': defaultdict(int),
-        'collab_articles': defaultdict(int)
-    }
-    
-    # Process each article
-    for _, row in df.iterrows():
-        authors = parse_authors(row['Authors'])
-        if not authors:
-            continue
-            
-        num_authors = len(authors)
-        
-        # Equal split for all metrics
-        views_per_author = row['Views'] / num_authors
-        visitors_per_author = row['Visitors'] / num_authors
-        social_refs_per_author = row['Social refs'] / num_authors if pd.notna(row['Social refs']) else 0
-        new_vis_per_author = row['New vis.'] / num_authors
-        minutes_per_author = row['Engaged minutes'] / num_authors
-        
-        for author in authors:
-            metrics['views'][author] += views_per_author
-            metrics['visitors'][author] += visitors_per_author
-            metrics['social_refs'][author] += social_refs_per_author
-            metrics['new_visitors'][author] += new_vis_per_author
-            metrics['engaged_minutes'][author] += minutes_per_author
-            metrics['article_count'][author] += 1
-            
-            if num_authors == 1:
-                metrics['solo_articles'][author] += 1
-            else:
-                metrics['collab_articles'][author] += 1
-    
-    return metrics
-
-
-def print_top_journalists(metrics, metric_name, metric_key, top_n=20):
+def analyze_journalists(df, metric_keys=None):
+    """Analyze journalist metrics with equal credit distribution.
+
+    Returns a metric key -> {author: value} mapping (see
+    aggregates.AuthorMetrics), always including article_count, solo_articles
+    and collab_articles.
+    """
+    return AuthorMetrics.from_table(aggregate_metrics(df, metric_keys))
+
+
+def top_journalists_table(metrics, metric_key, top_n=20, baseline=None):
+    """Rank journalists by one metric into a table shared by all output formats.
+    
+    With a baseline summary (see baseline.compute_baselines), each row also
+    has the journalist's difference from the baseline average.
+    """
+    # Ratio metrics are undefined (NaN) for authors with a zero denominator and are skipped
+    top = metrics.top(metric_key, top_n)
+    
+    columns = ['Rank', 'Journalist', 'Value', 'Articles', 'Solo', 'Collab']
+    rows = []
+    for i, (author, value) in enumerate(top, 1):
+        row = (i, author, value, metrics['article_count'][author],
+               metrics['solo_articles'][author], metrics['collab_articles'][author])
+        if baseline is not None:
+            row += (baseline_delta(value, baseline),)
+        rows.append(row)
+    
+    if METRIC_CATALOG[metric_key]['kind'] == 'ratio':
+        format_value = lambda value: format_metric(metric_key, value)
+    else:
+        format_value = lambda value: f"{value:.0f}"
+    formats = {'Value': format_value}
+    notes = []
+    if baseline is not None:
+        columns.append('vs Avg')
+        formats['vs Avg'] = format_delta
+        notes.append(format_baseline(metric_key, baseline))
+    
+    title = f"TOP {top_n} JOURNALISTS BY {METRIC_CATALOG[metric_key]['display'].upper()}"
+    return ranking_table(title, columns, rows, meta={'metric': metric_key}, notes=notes, formats=formats)
+
+
+def format_top_journalists(table):
+    """Text lines of a top-journalists table."""
+    metric_name = METRIC_CATALOG[table['meta']['metric']]['display']
+    baseline = 'vs Avg' in table['columns']
+    
+    lines = ["", "=" * 60, table['title'], "=" * 60]
+    lines.extend(table['notes'])
+    header = f"{'Rank':<5} {'Journalist':<30} {metric_name:<15} {'Articles':<10} {'Solo/Collab'}"
+    if baseline:
+        header += f"  {'vs Avg':>8}"
+    lines.append(header)
+    lines.append("-" * 60)
+    
+    format_value = table['formats']['Value']
+    for row in table['rows']:
+        i, author, value, articles, solo, collab = row[:6]
+        line = f"{i:<5} {author:<30} {format_value(value):>15} {articles:>10} {solo:>5}/{collab:<5}"
+        if baseline:
+            line += f"  {format_delta(row[6]):>8}"
+        lines.append(line)
+    return lines
+
+
+def print_top_journalists(metrics, metric_name, metric_key, top_n=20, baseline=None):
     """Print top journalists for a specific metric."""
-    # Sort by metric
-    sorted_authors = sorted(metrics[metric_key].items(), key=lambda x: x[1], reverse=True)
+    write_lines(format_top_journalists(top_journalists_table(metrics, metric_key, top_n, baseline)))
+
+
+def print_load_summary(summary, after_date=None):
+    """Print article and date counts of a loaded export (see backends.summarize_dates).
+
+    Returns False if no articles are left after after_date.
+    """
+    print(f"Total articles loaded: {summary['rows']}")
+    if summary['first'] is not None:
+        print(f"Date range: {summary['first'].date()} to {summary['last'].date()}")
+        print(f"Articles with invalid dates: {summary['invalid']}")
+    else:
+        print("Warning: No valid dates found")
     
-    print(f"\n{'='*60}")
-    print(f"TOP {top_n} JOURNALISTS BY {metric_name.upper()}")
-    print(f"{'='*60}")
-    print(f"{'Rank':<5} {'Journalist':<30} {metric_name:<15} {'Articles':<10} {'Solo/Collab'}")
-    print(f"{'-'*60}")
+    if after_date:
+        print(f"\nFiltering articles published after: {pd.to_datetime(after_date).date()}")
+        print(f"Articles after filtering: {summary['after']} (removed {summary['rows'] - summary['after']})")
+        if summary['after'] == 0:
+            print("Warning: No articles found after the specified date!")
+            return False
+    return True
+
+
+def load_filtered(parquet_file, after_date, output_dir, save_parquet, source=None, workers=1):
+    """Load and date-filter an export with pandas; returns None if nothing is left.
+
+    source, when given, is an Arrow copy of parquet_file to read instead.
+    workers parse a CSV in parallel (see loader.read_csv_parallel).
+    """
     
-    for i, (author, value) in enumerate(sorted_authors[:top_n], 1):
-        articles = metrics['article_count'][author]
-        solo = metrics['solo_articles'][author]
-        collab = metrics['collab_articles'][author]
-        
-        print(f"{i:<5} {author:<30} {value:>15.0f} {articles:>10} {solo:>5}/{collab:<5}")
+    print(f"Loading data from: {parquet_file}", file=sys.stderr)
+    is_csv = parquet_file.endswith('.csv')
+    df = load_export(source or parquet_file, workers=workers)
+    
+    # Save as Parquet if requested and input was CSV
+    if save_parquet and is_csv:
+        save_parquet_if_needed(parquet_file, df)
+    
+    df['Publish date'] = pd.to_datetime(df['Publish date'], errors='coerce')
+    if not print_load_summary(summarize_dates(df['Publish date'], after_date), after_date):
+        return None
+    if after_date:
+        df = df[df['Publish date'] > pd.to_datetime(after_date)]
+    
+    print(f"\nAnalyzing {len(df)} articles...")
+    
+    # Save the data being analyzed
+    saved_file = save_analysis_data(df, after_date, output_dir)
+    
+    return df
 
 
 @click.command()
@@ -149,60 +185,79 @@ def print_top_journalists(metrics, metric_name, metric_key, top_n=20):
 @click.option('--after-date', default=None, help='Only include articles published after this date (YYYY-MM-DD)')
 @click.option('--output-dir', default=None, help='Output directory for journalist_metrics folder (if specified, saves CSV output)')
 @click.option('--save-parquet', is_flag=True, help='Save CSV input as Parquet file for faster future processing')
-def main(parquet_file, top_n, after_date, output_dir, save_parquet):
+@click.option('--metric', '-m', 'metric_keys', multiple=True, type=click.Choice(list(METRIC_CATALOG)),
+              help='Metric to rank by (can be specified multiple times, default: views, visitors, social_refs, new_visitors, engaged_minutes)')
+@click.option('--backend', type=click.Choice(BACKENDS), default='auto',
+              help='Dataframe backend: polars lazy execution when installed (auto), or pandas')
+@click.option('--baseline-authors', '-b', multiple=True,
+              help='Staff authors whose average and median are shown as a baseline (can be specified multiple times)')
+@click.option('--bootstrap', 'n_resamples', type=click.IntRange(min=1), default=None,
+              help='Resample articles N times and report how stable each top ranking is')
+@click.option('--seed', type=int, default=None, help='Random seed for --bootstrap')
+@click.option('--concentration', 'concentration_key', is_flag=False, flag_value='views', default=None,
+              type=click.Choice([k for k, spec in METRIC_CATALOG.items() if spec['kind'] == 'sum']),
+              help='Report per-author median per article, top-article share and Gini of a metric (default: views)')
+@click.option('--collaboration', is_flag=True, help='Report top collaborator pairs and collaboration ratios')
+@click.option('--aliases', 'aliases_file', type=click.Path(exists=True), default=None,
+              help='JSON file mapping canonical author names to lists of their variants')
+@click.option('--output-format', type=click.Choice(FORMATS), default='text',
+              help='Format of the top lists; with markdown, csv or json other messages go to stderr')
+@click.option('--cache-format', type=click.Choice(CACHE_FORMATS), default='none',
+              help='Load through an uncompressed Arrow copy memory-mapped on later runs: arrow (user cache) or shm (/dev/shm)')
+@click.option('--workers', type=click.IntRange(min=1), default=1,
+              help='Worker processes aggregating row chunks of the export in parallel (default: 1)')
+@click.option('--no-cache', is_flag=True,
+              help='Recompute the report instead of reusing a cached one (cached reports match input files by '
+                   'path, size and modification time, not content)')
+@cached_report('combined', ['parquet_file', 'aliases_file'],
+               bypass=lambda p: p['output_dir'] or p['save_parquet'] or (p['n_resamples'] and p['seed'] is None))
+def main(parquet_file, top_n, after_date, output_dir, save_parquet, metric_keys, backend, baseline_authors,
+         n_resamples, seed, concentration_key, collaboration, aliases_file, output_format, cache_format,
+         workers, no_cache):
     """Analyze journalist metrics from parquet file."""
     
-    print(f"Loading data from: {parquet_file}")
-    is_csv = parquet_file.endswith('.csv')
-    df = pd.read_csv(parquet_file) if is_csv else pd.read_parquet(parquet_file)
-    
-    print(f"Total articles loaded: {len(df)}")
+    metric_keys = list(metric_keys) or DEFAULT_METRICS
+    use_aliases(aliases_file)
     
-    # Save as Parquet if requested and input was CSV
-    if save_parquet and is_csv:
-        save_parquet_if_needed(parquet_file, df)
-    
-    # Handle date parsing more robustly
+    report_out = sys.stdout
+    if output_format != 'text':
+        # Keep stdout for the report document; progress messages go to stderr
+        click.get_current_context().with_resource(contextlib.redirect_stdout(sys.stderr))
     try:
-        df['Publish date'] = pd.to_datetime(df['Publish date'], errors='coerce')
-        valid_dates = df['Publish date'].dropna()
-        if len(valid_dates) > 0:
-            print(f"Date range: {valid_dates.min().date()} to {valid_dates.max().date()}")
-            print(f"Articles with invalid dates: {len(df) - len(valid_dates)}")
-        else:
-            print("Warning: No valid dates found")
-    except Exception as e:
-        print(f"Warning: Could not parse dates - {e}")
-    
-    # Apply date filter if specified
+        backend = resolve_backend(backend)
+    except ImportError as e:
+        raise click.ClickException(str(e))
+    
     if after_date:
         try:
-            filter_date = pd.to_datetime(after_date)
-            print(f"\nFiltering articles published after: {filter_date.date()}")
-            
-            # Filter dataframe
-            original_count = len(df)
-            df = df[df['Publish date'] > filter_date]
-            filtered_count = len(df)
-            
-            print(f"Articles after filtering: {filtered_count} (removed {original_count - filtered_count})")
-            
-            if filtered_count == 0:
-                print("Warning: No articles found after the specified date!")
-                return
-                
-        except Exception as e:
+            pd.to_datetime(after_date)
+        except ValueError as e:
             print(f"Error parsing date filter '{after_date}': {e}")
             print("Please use YYYY-MM-DD format (e.g., 2024-01-01)")
             return
     
-    print(f"\nAnalyzing {len(df)} articles...")
-    
-    # Save the data being analyzed
-    saved_file = save_analysis_data(df, after_date, output_dir)
-    
-    # Analyze metrics
-    metrics = analyze_journalists(df)
+    lazy = backend == 'polars' or workers > 1
+    if lazy and (output_dir or save_parquet or n_resamples or concentration_key or collaboration):
+        print("Note: --output-dir, --save-parquet, --bootstrap, --concentration and --collaboration need the full "
+              "article table, aggregating with pandas in one process", file=sys.stderr)
+        backend, lazy = 'pandas', False
+    source = arrow_source(parquet_file, cache_format, workers)
+    
+    if lazy:
+        # Filter, explode and aggregate lazily (or chunk by chunk) without materializing the article table
+        mode = f"{workers} workers" if workers > 1 else "polars lazy backend"
+        print(f"Loading data from: {parquet_file} ({mode})", file=sys.stderr)
+        summary = date_summary(source, after_date, backend, workers)
+        if not print_load_summary(summary, after_date):
+            return
+        print(f"\nAnalyzing {summary['after'] if after_date else summary['rows']} articles...")
+        table = aggregate_file(source, metric_keys, after_date, backend=backend, workers=workers)
+        metrics = AuthorMetrics.from_table(table)
+    else:
+        df = load_filtered(parquet_file, after_date, output_dir, save_parquet, source, workers)
+        if df is None:
+            return
+        metrics = analyze_journalists(df, metric_keys)
     
     # Print summary statistics
     total_authors = len(metrics['article_count'])
@@ -211,31 +266,53 @@ def main(parquet_file, top_n, after_date, output_dir, save_parquet):
     print(f"\nTotal unique journalists: {total_authors}")
     print(f"Journalists with collaborations: {authors_with_collabs} ({authors_with_collabs/total_authors*100:.1f}%)")
     
-    # Print top lists
-    print_top_journalists(metrics, "Page Views", "views", top_n)
-    print_top_journalists(metrics, "Visitors", "visitors", top_n)
-    print_top_journalists(metrics, "Social Referrals", "social_refs", top_n)
-    print_top_journalists(metrics, "New Visitors", "new_visitors", top_n)
-    print_top_journalists(metrics, "Engaged Minutes", "engaged_minutes", top_n)
-    
-    # # Additional analysis: collaboration patterns
-    # print(f"\n{'='*60}")
-    # print("COLLABORATION ANALYSIS")
-    # print(f"{'='*60}")
-    
-    # collab_ratios = []
-    # for author in metrics['article_count']:
-    #     total = metrics['article_count'][author]
-    #     collab = metrics['collab_articles'][author]
-    #     if total > 5:  # Only include authors with >5 articles
-    #         collab_ratios.append((author, collab/total, total, collab))
-    
-    # collab_ratios.sort(key=lambda x: x[1], reverse=True)
-    
-    # print(f"{'Journalist':<30} {'Collab %':<10} {'Total':<8} {'Collabs'}")
-    # print(f"{'-'*60}")
-    # for author, ratio, total, collabs in collab_ratios[:10]:
-    #     print(f"{author:<30} {ratio*100:>8.1f}% {total:>8} {collabs:>8}")
+    # Staff baselines from the aggregate, matched by canonical author name
+    baselines = {}
+    if baseline_authors:
+        baseline_authors = resolve_names(baseline_authors, metrics['article_count'])
+        baselines = compute_baselines(metrics, baseline_authors, metric_keys)
+        print(f"Baseline authors: {', '.join(baseline_authors)}")
+        missing = missing_baseline_authors(metrics, baseline_authors)
+        if missing:
+            print(f"Warning: baseline authors with no articles: {', '.join(missing)}")
+    
+    # Rank every top list once; text is written section by section, other formats in one go at the end
+    tables = [
+        top_journalists_table(metrics, metric_key, top_n, baselines.get(metric_key) if baseline_authors else None)
+        for metric_key in metric_keys
+    ]
+    text = output_format == 'text'
+    if text:
+        write_lines([line for table in tables for line in format_top_journalists(table)])
+    
+    # Whether each author's total rests on a few articles
+    if concentration_key:
+        table = concentration_table(author_concentration(df, concentration_key), concentration_key, top_n)
+        tables.append(table)
+        if text:
+            write_lines(format_concentration(table))
+    
+    # Rank stability of each top list under resampling of articles
+    if n_resamples:
+        start = time.perf_counter()
+        stability = bootstrap_rankings(df, metric_keys, n_resamples, top_n, seed=seed)
+        for metric_key in metric_keys:
+            table = bootstrap_table(stability[metric_key], metric_key, n_resamples, top_n)
+            tables.append(table)
+            if text:
+                write_lines(format_bootstrap(table))
+        print(f"\nBootstrap: {n_resamples} resamples in {time.perf_counter() - start:.1f}s", file=sys.stderr)
+    
+    # Additional analysis: collaboration patterns
+    if collaboration:
+        pair_tables = collaboration_tables(metrics, coauthor_pairs(df), top_n=top_n)
+        tables.extend(pair_tables)
+        if text:
+            write_lines(format_collaboration(pair_tables))
+    
+    keep_tables(tables)
+    if not text:
+        report_out.write(render_tables(tables, output_format))
     
     # Reminder about saved data
     if output_dir:
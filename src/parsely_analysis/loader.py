@@ -0,0 +1,308 @@
+"""Load Parsely exports with repeated string columns dictionary-encoded."""
+
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+import csv
+import hashlib
+import json
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pa_csv
+import pyarrow.feather as feather
+
+
+# Low-cardinality string columns repeated across thousands of rows. They are
+# loaded as pandas categoricals and stored dictionary-encoded in Parquet.
+CATEGORICAL_COLUMNS = ['Authors', 'Section', 'Tags', 'High-Level Smart Tags', 'Low-Level Smart Tags']
+
+# Where --cache-format keeps uncompressed Arrow IPC copies of exports ('none' reads the export itself)
+ARROW_CACHE_DIRS = {
+    'none': None,
+    'arrow': Path(os.environ.get('XDG_CACHE_HOME', Path.home() / '.cache')) / 'parsely_analysis' / 'arrow',
+    'shm': Path('/dev/shm/parsely_analysis'),
+}
+CACHE_FORMATS = list(ARROW_CACHE_DIRS)
+
+# Read as text, as pandas does, rather than letting Arrow infer timestamps
+STRING_COLUMNS = ['Publish date']
+
+# pandas' default missing-value markers, so both CSV readers agree
+CSV_NULL_VALUES = [
+    '', '#N/A', '#N/A N/A', '#NA', '-1.#IND', '-1.#QNAN', '-NaN', '-nan', '1.#IND', '1.#QNAN', '<NA>', 'N/A', 'NA',
+    'NULL', 'NaN', 'None', 'n/a', 'nan', 'null',
+]
+
+# Bytes scanned at a time when looking for the next record boundary
+BOUNDARY_WINDOW = 1 << 20
+
+# Bytes that may precede a quote opening a field, or follow one closing it
+FIELD_BOUNDARY_BYTES = np.frombuffer(b',\n\r"', dtype=np.uint8)
+UTF8_BOM = b'\xef\xbb\xbf'
+
+
+def encode_categoricals(df):
+    """Convert the repeated string columns of an export to categoricals in place.
+
+    Categories are always sorted, whichever reader produced them: pandas'
+    CSV reader orders them by the chunk they first appear in and Arrow by
+    first appearance, so a frame means the same thing however it was read.
+    """
+    for col in CATEGORICAL_COLUMNS:
+        if col not in df.columns:
+            continue
+        if not isinstance(df[col].dtype, pd.CategoricalDtype):
+            df[col] = df[col].astype('category')
+        elif not df[col].cat.categories.is_monotonic_increasing:
+            df[col] = df[col].cat.reorder_categories(df[col].cat.categories.sort_values())
+    return df
+
+
+def load_export(path, columns=None, workers=1):
+    """Load a CSV or Parquet export, optionally reading only some columns.
+
+    Parquet files written by save_parquet_if_needed keep their dictionary
+    encoding; older caches and CSVs are encoded on load. With more than one
+    worker, byte ranges of a CSV are parsed in parallel processes (see
+    read_csv_parallel).
+    """
+    path = str(path)
+    if path.endswith('.arrow'):
+        # Memory-mapped: only the selected columns' pages are read, numeric buffers without copying
+        table = feather.read_table(path, memory_map=True)
+        if columns is not None:
+            table = table.select([c for c in columns if c in table.column_names])
+        return encode_categoricals(table.to_pandas(split_blocks=True))
+    if path.endswith('.csv') and workers > 1:
+        return read_csv_parallel(path, columns, workers)
+    if path.endswith('.csv'):
+        usecols = (lambda c: c in columns) if columns is not None else None
+        dtype = {col: 'category' for col in CATEGORICAL_COLUMNS}
+        df = pd.read_csv(path, usecols=usecols, dtype=dtype)
+    else:
+        df = pd.read_parquet(path)
+        if columns is not None:
+            df = df[[c for c in columns if c in df.columns]]
+    return encode_categoricals(df)
+
+
+def next_record_start(data, start, quotes):
+    """Offset just past the first newline at or after start that ends a record.
+
+    A newline ends a record unless it is inside a quoted field, i.e. unless
+    an odd number of '"' bytes precede it (escaped quotes come in pairs, and
+    curly quotes are multi-byte UTF-8 that never match). quotes is the
+    number of '"' bytes before start. Returns len(data) if no record ends.
+    """
+    while start < len(data):
+        window = data[start:start + BOUNDARY_WINDOW]
+        inside = (quotes + np.cumsum(window == ord('"'))) % 2 == 1
+        ends = np.flatnonzero((window == ord('\n')) & ~inside)
+        if len(ends):
+            return start + int(ends[0]) + 1
+        quotes += int(np.count_nonzero(window == ord('"')))
+        start += len(window)
+    return len(data)
+
+
+def record_ranges(path, parts):
+    """Split a CSV into about parts byte ranges of whole records, in one pass.
+
+    Quotes are counted once from the start of the file up to each cut, and
+    each cut moves forward to the next newline outside quotes, so titles
+    with quoted commas or line breaks are never split.
+
+    Returns (header, ranges): the header line's bytes and (start, end) byte
+    offsets of each non-empty range, in file order.
+    """
+    data = np.memmap(path, dtype=np.uint8, mode='r')
+    body = next_record_start(data, 0, 0)
+    cuts = [body]
+    position, quotes = 0, 0
+    for target in np.linspace(body, len(data), parts + 1)[1:-1].astype(np.int64):
+        target = max(int(target), cuts[-1])
+        quotes += int(np.count_nonzero(data[position:target] == ord('"')))
+        position = target
+        cuts.append(next_record_start(data, target, quotes))
+    cuts.append(len(data))
+    ranges = [(start, end) for start, end in zip(cuts[:-1], cuts[1:]) if end > start]
+    return bytes(data[:body]), ranges
+
+
+def read_csv_range(path, start, end, header, columns=None):
+    """Parse the records in one byte range of a CSV into an Arrow table."""
+    with open(path, 'rb') as f:
+        f.seek(start)
+        data = header + f.read(end - start)
+    names = next(csv.reader([header.decode('utf-8-sig')]))
+    convert = pa_csv.ConvertOptions(
+        include_columns=[c for c in names if columns is None or c in columns],
+        column_types={col: pa.string() for col in STRING_COLUMNS if col in names},
+        null_values=CSV_NULL_VALUES,
+        strings_can_be_null=True,
+    )
+    return pa_csv.read_csv(
+        pa.BufferReader(data),
+        read_options=pa_csv.ReadOptions(use_threads=False),
+        parse_options=pa_csv.ParseOptions(newlines_in_values=True),
+        convert_options=convert,
+    )
+
+
+def unify_types(tables):
+    """Cast range tables to common column types.
+
+    Ranges where a column is all null take the other ranges' type, mixed
+    integers and floats become float64, and any other mix becomes strings.
+    """
+    schema = []
+    for field in tables[0].schema:
+        types = {table.schema.field(field.name).type for table in tables} - {pa.null()}
+        if len(types) == 1:
+            (type_,) = types
+        elif types and all(pa.types.is_integer(t) or pa.types.is_floating(t) for t in types):
+            type_ = pa.float64()
+        else:
+            type_ = pa.float64() if not types else pa.string()
+        schema.append(pa.field(field.name, type_))
+    schema = pa.schema(schema)
+    return [table.cast(schema) for table in tables]
+
+
+def regular_quoting(path):
+    """Whether every '"' in a CSV opens, closes or escapes a quoted field.
+
+    record_ranges finds record boundaries by quote parity, which only holds
+    when quotes are used this way. A '"' inside an unquoted field (5" tall)
+    is read literally by CSV parsers but flips the parity, so such files
+    must be parsed serially.
+    """
+    data = np.memmap(path, dtype=np.uint8, mode='r')
+    positions = np.concatenate([
+        np.flatnonzero(data[start:start + BOUNDARY_WINDOW] == ord('"')) + start
+        for start in range(0, len(data), BOUNDARY_WINDOW)
+    ] or [np.array([], dtype=np.int64)])
+    if len(positions) % 2:
+        return False
+    opening, closing = positions[0::2], positions[1::2]
+    # An opening quote starts a field (or continues one after an escaped "")
+    first = len(UTF8_BOM) if bytes(data[:len(UTF8_BOM)]) == UTF8_BOM else 0
+    opens = (opening == first) | np.isin(data[np.maximum(opening - 1, 0)], FIELD_BOUNDARY_BYTES)
+    # A closing quote ends a field (or is the first half of an escaped "")
+    after = data[np.minimum(closing + 1, len(data) - 1)]
+    closes = (closing == len(data) - 1) | np.isin(after, FIELD_BOUNDARY_BYTES)
+    return bool(opens.all() and closes.all())
+
+
+def read_csv_parallel(path, columns=None, workers=None):
+    """Load a CSV export by parsing byte ranges of it in worker processes.
+
+    The file is cut into one range per worker at record boundaries (see
+    record_ranges), each range is parsed into Arrow, and the range tables
+    are concatenated in file order. Returns the same DataFrame as
+    load_export's single-threaded read, which it falls back to when the
+    file's quoting makes record boundaries unreliable (see regular_quoting).
+    """
+    workers = workers or os.cpu_count() or 1
+    if not regular_quoting(path):
+        return load_export(path, columns)
+    header, ranges = record_ranges(path, workers)
+    if not ranges:
+        return load_export(path, columns)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(read_csv_range, path, start, end, header, columns) for start, end in ranges]
+        table = pa.concat_tables(unify_types([future.result() for future in futures]))
+    categories = [name for name in table.column_names if name in CATEGORICAL_COLUMNS]
+    return encode_categoricals(table.to_pandas(split_blocks=True, categories=categories))
+
+
+def save_parquet_if_needed(csv_path, df):
+    """Save DataFrame as Parquet if source was CSV and Parquet doesn't exist or is older."""
+    csv_path = Path(csv_path)
+    parquet_path = csv_path.with_suffix('.parquet')
+
+    # Check if parquet exists and is newer
+    if parquet_path.exists():
+        csv_mtime = csv_path.stat().st_mtime
+        parquet_mtime = parquet_path.stat().st_mtime
+
+        if parquet_mtime > csv_mtime:
+            print(f"Skipping Parquet save - {parquet_path.name} is newer than source CSV")
+            return
+
+    # Save as Parquet; categorical columns are written dictionary-encoded
+    try:
+        encode_categoricals(df).to_parquet(parquet_path, engine='pyarrow')
+        print(f"Saved Parquet file: {parquet_path}")
+    except Exception as e:
+        print(f"ERROR: Failed to save Parquet file: {e}")
+        raise
+
+
+def source_state(path):
+    """Size and modification time of an export, recorded in its Arrow copy."""
+    stat = Path(path).stat()
+    return [stat.st_size, stat.st_mtime_ns]
+
+
+def arrow_table(df):
+    """Arrow table of an export with categoricals kept dictionary-encoded.
+
+    pandas stores missing categories as code -1 under the null mask; those
+    codes are zeroed so readers that ignore the mask (polars) stay in range.
+    """
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    for i, field in enumerate(table.schema):
+        if pa.types.is_dictionary(field.type):
+            column = table.column(i).combine_chunks()
+            indices = column.indices.fill_null(0).to_numpy()
+            mask = column.is_null().to_numpy(zero_copy_only=False)
+            column = pa.DictionaryArray.from_arrays(indices, column.dictionary, mask=mask)
+            table = table.set_column(i, field, column)
+    return table
+
+
+def arrow_copy_path(path, cache_format):
+    """Where the cache_format Arrow copy of an export lives, or None for 'none'."""
+    cache_dir = ARROW_CACHE_DIRS[cache_format]
+    if cache_dir is None:
+        return None
+    digest = hashlib.sha1(str(Path(path).resolve()).encode()).hexdigest()[:12]
+    return cache_dir / f"{Path(path).stem}-{digest}.arrow"
+
+
+def copy_is_current(path, arrow_path):
+    """Whether an Arrow copy exists and was made from the export's current contents."""
+    if not arrow_path.exists():
+        return False
+    with pa.memory_map(str(arrow_path)) as source:
+        metadata = pa.ipc.open_file(source).schema.metadata or {}
+    return metadata.get(b'parsely_source') == json.dumps(source_state(path)).encode()
+
+
+def arrow_source(path, cache_format='none', workers=1):
+    """Path to load an export from: an up-to-date Arrow IPC copy, or the export itself.
+
+    The copy is written uncompressed on the first run (and whenever the
+    export changes) so later runs can memory-map it instead of parsing or
+    decompressing the export.
+    """
+    arrow_path = arrow_copy_path(path, cache_format)
+    if arrow_path is None:
+        return str(path)
+    if copy_is_current(path, arrow_path):
+        return str(arrow_path)
+
+    state = json.dumps(source_state(path)).encode()
+    table = arrow_table(load_export(path, workers=workers))
+    table = table.replace_schema_metadata({**(table.schema.metadata or {}), b'parsely_source': state})
+    arrow_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = arrow_path.with_suffix('.tmp')
+    feather.write_feather(table, tmp, compression='uncompressed')
+    os.replace(tmp, arrow_path)
+    print(f"Saved Arrow copy: {arrow_path}", file=sys.stderr)
+    return str(arrow_path)
@@ -0,0 +1,238 @@
+"""Metric catalog and vectorized aggregation engine for Parsely exports."""
+
+from functools import reduce
+import math
+
+import numpy as np
+import pandas as pd
+
+from parsely_analysis.authors import split_authors
+
+
+# Every numeric column in a Parsely posts export, plus the derived ratios we
+# report on. 'sum' metrics are split equally between co-authors and summed;
+# 'count' metrics count articles; 'ratio' metrics are computed from the
+# aggregated sums after grouping, never averaged per row.
+METRIC_CATALOG = {
+    # Audience
+    'views': {'kind': 'sum', 'column': 'Views', 'display': 'Page Views', 'unit': 'views', 'format': '{:,.0f}'},
+    'visitors': {'kind': 'sum', 'column': 'Visitors', 'display': 'Visitors', 'unit': 'visitors', 'format': '{:,.0f}'},
+    'engaged_minutes': {'kind': 'sum', 'column': 'Engaged minutes', 'display': 'Engaged Minutes', 'unit': 'min', 'format': '{:,.0f}'},
+    'new_visitors': {'kind': 'sum', 'column': 'New vis.', 'display': 'New Visitors', 'unit': 'new vis', 'format': '{:,.0f}'},
+    'new_visitor_views': {'kind': 'sum', 'column': 'Views new vis.', 'display': 'New Visitor Views', 'unit': 'views', 'format': '{:,.0f}'},
+    'new_visitor_minutes': {'kind': 'sum', 'column': 'Minutes New Vis.', 'display': 'New Visitor Minutes', 'unit': 'min', 'format': '{:,.0f}'},
+    'returning_visitors': {'kind': 'sum', 'column': 'Returning vis.', 'display': 'Returning Visitors', 'unit': 'ret vis', 'format': '{:,.0f}'},
+    'returning_visitor_views': {'kind': 'sum', 'column': 'Views ret. vis.', 'display': 'Returning Visitor Views', 'unit': 'views', 'format': '{:,.0f}'},
+    'returning_visitor_minutes': {'kind': 'sum', 'column': 'Minutes Ret. Vis.', 'display': 'Returning Visitor Minutes', 'unit': 'min', 'format': '{:,.0f}'},
+    # Devices
+    'desktop_views': {'kind': 'sum', 'column': 'Desktop views', 'display': 'Desktop Views', 'unit': 'views', 'format': '{:,.0f}'},
+    'mobile_views': {'kind': 'sum', 'column': 'Mobile views', 'display': 'Mobile Views', 'unit': 'views', 'format': '{:,.0f}'},
+    'tablet_views': {'kind': 'sum', 'column': 'Tablet views', 'display': 'Tablet Views', 'unit': 'views', 'format': '{:,.0f}'},
+    'website_views': {'kind': 'sum', 'column': 'Website views', 'display': 'Website Views', 'unit': 'views', 'format': '{:,.0f}'},
+    'amp_views': {'kind': 'sum', 'column': 'AMP views', 'display': 'AMP Views', 'unit': 'views', 'format': '{:,.0f}'},
+    'fb_instant_views': {'kind': 'sum', 'column': 'Fb instant views', 'display': 'FB Instant Views', 'unit': 'views', 'format': '{:,.0f}'},
+    # Referrals
+    'search_refs': {'kind': 'sum', 'column': 'Search refs', 'display': 'Search Referrals', 'unit': 'search', 'format': '{:,.0f}'},
+    'internal_refs': {'kind': 'sum', 'column': 'Internal refs', 'display': 'Internal Referrals', 'unit': 'internal', 'format': '{:,.0f}'},
+    'other_refs': {'kind': 'sum', 'column': 'Other refs', 'display': 'Other Referrals', 'unit': 'other', 'format': '{:,.0f}'},
+    'direct_refs': {'kind': 'sum', 'column': 'Direct refs', 'display': 'Direct Referrals', 'unit': 'direct', 'format': '{:,.0f}'},
+    'social_refs': {'kind': 'sum', 'column': 'Social refs', 'display': 'Social Referrals', 'unit': 'social', 'format': '{:,.0f}'},
+    'fb_refs': {'kind': 'sum', 'column': 'Fb refs', 'display': 'Facebook Referrals', 'unit': 'fb', 'format': '{:,.0f}'},
+    'tw_refs': {'kind': 'sum', 'column': 'Tw refs', 'display': 'Twitter Referrals', 'unit': 'tw', 'format': '{:,.0f}'},
+    'pi_refs': {'kind': 'sum', 'column': 'Pi refs', 'display': 'Pinterest Referrals', 'unit': 'pi', 'format': '{:,.0f}'},
+    # Social
+    'social_interactions': {'kind': 'sum', 'column': 'Social interactions', 'display': 'Social Interactions', 'unit': 'interact', 'format': '{:,.0f}'},
+    'fb_interactions': {'kind': 'sum', 'column': 'Fb interactions', 'display': 'Facebook Interactions', 'unit': 'interact', 'format': '{:,.0f}'},
+    'pi_interactions': {'kind': 'sum', 'column': 'Pi interactions', 'display': 'Pinterest Interactions', 'unit': 'interact', 'format': '{:,.0f}'},
+    'channel_visitors': {'kind': 'sum', 'column': 'Channel vis.', 'display': 'Channel Visitors', 'unit': 'visitors', 'format': '{:,.0f}'},
+    # Article counts
+    'article_count': {'kind': 'count', 'display': 'Articles Published', 'unit': 'articles', 'format': '{:,.0f}'},
+    'solo_articles': {'kind': 'count', 'display': 'Solo Articles', 'unit': 'articles', 'format': '{:,.0f}'},
+    'collab_articles': {'kind': 'count', 'display': 'Collaborative Articles', 'unit': 'articles', 'format': '{:,.0f}'},
+    # Derived ratios
+    'avg_views': {'kind': 'ratio', 'numerator': 'views', 'denominator': 'visitors', 'display': 'Avg. Views per Visitor', 'unit': 'views/vis', 'format': '{:.2f}'},
+    'avg_minutes': {'kind': 'ratio', 'numerator': 'engaged_minutes', 'denominator': 'visitors', 'display': 'Avg. Minutes per Visitor', 'unit': 'min/vis', 'format': '{:.2f}'},
+    'avg_minutes_per_view': {'kind': 'ratio', 'numerator': 'engaged_minutes', 'denominator': 'views', 'display': 'Avg. Minutes per View', 'unit': 'min/view', 'format': '{:.2f}'},
+    'new_visitor_share': {'kind': 'ratio', 'numerator': 'new_visitors', 'denominator': 'visitors', 'display': 'New Visitor Share', 'unit': 'new', 'format': '{:.1%}'},
+    'returning_visitor_share': {'kind': 'ratio', 'numerator': 'returning_visitors', 'denominator': 'visitors', 'display': 'Returning Visitor Share', 'unit': 'ret', 'format': '{:.1%}'},
+    'mobile_share': {'kind': 'ratio', 'numerator': 'mobile_views', 'denominator': 'views', 'display': 'Mobile View Share', 'unit': 'mobile', 'format': '{:.1%}'},
+    'search_share': {'kind': 'ratio', 'numerator': 'search_refs', 'denominator': 'views', 'display': 'Search Referral Share', 'unit': 'search', 'format': '{:.1%}'},
+    'social_share': {'kind': 'ratio', 'numerator': 'social_refs', 'denominator': 'views', 'display': 'Social Referral Share', 'unit': 'social', 'format': '{:.1%}'},
+}
+
+# The metrics the tools have always reported, in display order
+DEFAULT_METRICS = ['views', 'visitors', 'social_refs', 'new_visitors', 'engaged_minutes']
+
+# Split credit is summed exactly as integers: metric values are held in
+# thousandths (Parsely reports at most one decimal place)
+CREDIT_SCALE = 1000
+
+
+def format_metric(metric_key, value):
+    """Format a metric value using its catalog format string."""
+    if pd.isna(value):
+        return "-"
+    return METRIC_CATALOG[metric_key]['format'].format(value)
+
+
+def resolve_metrics(metric_keys):
+    """Validate metric keys and return them along with the sums they depend on.
+
+    Returns (selected, sums) where sums lists every 'sum' metric needed to
+    compute the selection, including ratio numerators and denominators.
+    """
+    selected = list(metric_keys) if metric_keys else list(DEFAULT_METRICS)
+    unknown = [key for key in selected if key not in METRIC_CATALOG]
+    if unknown:
+        raise ValueError(f"Unknown metric(s): {', '.join(unknown)}")
+
+    sums = []
+    for key in selected:
+        spec = METRIC_CATALOG[key]
+        if spec['kind'] == 'sum':
+            deps = [key]
+        elif spec['kind'] == 'ratio':
+            deps = [spec['numerator'], spec['denominator']]
+        else:
+            deps = []
+        for dep in deps:
+            if dep not in sums:
+                sums.append(dep)
+    return selected, sums
+
+
+def fixed_point(values, scale=CREDIT_SCALE):
+    """Metric values as int64 multiples of 1/scale."""
+    return np.round(values * scale).astype(np.int64)
+
+
+def combine_split_credit(partial, sums):
+    """Exact split-credit totals from per-co-author-count sums.
+
+    partial is indexed by (*by, author, num_authors) and holds, for each sum
+    metric, the fixed-point sum (see fixed_point) of the full values of the
+    articles with that many credited authors, plus integer counts. An
+    author's credit, the sum over k of S_k / k, is accumulated as an exact
+    integer over the least common multiple of the co-author counts and
+    divided once, so totals are bit-identical whatever the row order,
+    chunking or parallelism upstream.
+
+    Returns the per-(*by, author) table with sums as float64. Its
+    attrs['credit_scale'] holds the common denominator, so every sum times
+    it is a whole number (see rolling).
+    """
+    levels = [name for name in partial.index.names if name != 'num_authors']
+    num_authors = partial.index.get_level_values('num_authors').to_numpy(dtype=np.int64)
+    lcm = reduce(lambda a, b: a * b // math.gcd(a, b), np.unique(num_authors).tolist(), 1)
+
+    # Python ints only where int64 could overflow
+    bound = int(np.abs(partial[sums].to_numpy(dtype=np.int64)).max(initial=0)) * lcm * max(len(partial), 1)
+    dtype = np.int64 if bound < 2**63 else object
+    multipliers = np.array([lcm // k for k in num_authors.tolist()], dtype=dtype)
+    numerators = partial.copy()
+    for key in sums:
+        numerators[key] = partial[key].to_numpy(dtype=np.int64).astype(dtype) * multipliers
+
+    table = numerators.groupby(level=levels, sort=False, observed=True).sum()
+    denominator = lcm * CREDIT_SCALE
+    for key in sums:
+        # int / int is correctly rounded in Python
+        table[key] = np.array([int(n) / denominator for n in table[key].tolist()], dtype=np.float64)
+    table.attrs['credit_scale'] = denominator
+    return table
+
+
+def explode_authors(df, ignored_authors=()):
+    """Split the Authors column into one entry per (article, author).
+
+    Returns a DataFrame with 'row' (positional index into df), 'author' (a
+    categorical over the distinct author names) and 'num_authors' (the
+    number of credited authors on that article, after dropping ignored
+    authors).
+    """
+    parents, codes, dictionary = split_authors(df['Authors'], ignored_authors)
+    categories = pd.Index(dictionary.to_numpy(zero_copy_only=False), dtype=object)
+    num_authors = np.bincount(parents, minlength=len(df))[parents]
+    return pd.DataFrame({
+        'row': parents,
+        'author': pd.Categorical.from_codes(codes, categories=categories),
+        'num_authors': num_authors,
+    })
+
+
+def aggregate_metrics(df, metric_keys=None, by=None, ignored_authors=(), pairs=None):
+    """Aggregate metrics per author with equal credit for co-authors.
+
+    All selected sum metrics are summed in a single groupby over the
+    exploded (article, author) frame, per co-author count and in fixed
+    point, then split exactly (see combine_split_credit); article counts
+    come from the same pass and ratio metrics are derived from the
+    aggregated sums afterwards.
+
+    Args:
+        df: Article-level DataFrame (one row per export row).
+        metric_keys: Catalog keys to compute (default: DEFAULT_METRICS).
+        by: Optional article-level column name(s) to group on before author,
+            e.g. 'year_month'.
+        ignored_authors: Authors to drop before splitting credit.
+        pairs: Precomputed explode_authors(df, ignored_authors) result, for
+            callers that also need the exploded frame.
+
+    Returns:
+        DataFrame indexed by (*by, 'author') with one column per metric.
+    """
+    selected, sums = resolve_metrics(metric_keys)
+    if pairs is None:
+        pairs = explode_authors(df, ignored_authors)
+    partial = partial_metrics(df, sums, by, pairs)
+    return finalize_metrics(combine_split_credit(partial, sums), selected)
+
+
+def partial_metrics(df, sums, by, pairs):
+    """Fixed-point sums and article counts per (*by, author, num_authors).
+
+    Partials of disjoint row chunks merge exactly by adding them up (see
+    combine_split_credit for the final split).
+
+    Args:
+        df: Article-level DataFrame.
+        sums: Sum metric keys (see resolve_metrics).
+        by: Article-level column name(s) to group on before author, or None.
+        pairs: explode_authors-style (row, author, num_authors) frame.
+    """
+    by = [by] if isinstance(by, str) else list(by or [])
+    rows = pairs['row'].to_numpy()
+
+    columns = {}
+    for col in by:
+        columns[col] = df[col].array.take(rows)
+    columns['author'] = pairs['author'].array
+
+    for key in sums:
+        source = METRIC_CATALOG[key]['column']
+        if source in df.columns:
+            values = pd.to_numeric(df[source], errors='coerce').fillna(0).to_numpy(dtype=np.float64)
+        else:
+            values = np.zeros(len(df))
+        columns[key] = fixed_point(values)[rows]
+    columns['num_authors'] = pairs['num_authors'].to_numpy()
+
+    solo = pairs['num_authors'].to_numpy() == 1
+    columns['article_count'] = np.ones(len(pairs), dtype=np.int64)
+    columns['solo_articles'] = solo.astype(np.int64)
+    columns['collab_articles'] = (~solo).astype(np.int64)
+
+    credited = pd.DataFrame(columns)
+    return credited.groupby(by + ['author', 'num_authors'], sort=False, observed=True).sum()
+
+
+def finalize_metrics(table, selected):
+    """Derive ratio metrics from aggregated sums and order the output columns."""
+    for key in selected:
+        spec = METRIC_CATALOG[key]
+        if spec['kind'] == 'ratio':
+            denominator = table[spec['denominator']].replace(0, np.nan)
+            table[key] = table[spec['numerator']] / denominator
+
+    keep = selected + [c for c in ('article_count', 'solo_articles', 'collab_articles') if c not in selected]
+    return table[keep]
@@ -2,59 +2,43 @@
 """Generate monthly rankings of journalist performance metrics."""
 
 import pandas as pd
-from pathlib import Path
 from collections import defaultdict
 import click
+import contextlib
 from datetime import datetime
 import os
 import re
-import time
+import sys
 
-
-def parse_authors(author_str):
-    """Parse author string into list of cleaned names."""
-    if pd.isna(author_str) or author_str.strip() == '':
-        return []
-    
-    # Split by comma and clean whitespace
-    authors = [a.strip() for a in author_str.split(',')]
-    # Filter out empty strings
-    return [a for a in authors if a]
-
-
-def save_parquet_if_needed(csv_path, df):
-    """Save DataFrame as Parquet if source was CSV and Parquet doesn't exist or is older."""
-    csv_path = Path(csv_path)
-    parquet_path = csv_path.with_suffix('.parquet')
-    
-    # Check if parquet exists and is newer
-    if parquet_path.exists():
-        csv_mtime = csv_path.stat().st_mtime
-        parquet_mtime = parquet_path.stat().st_mtime
-        
-        if parquet_mtime > csv_mtime:
-            print(f"Skipping Parquet save - {parquet_path.name} is newer than source CSV")
-            return
-    
-    # Save as Parquet
-    try:
-        df.to_parquet(parquet_path, engine='pyarrow')
-        print(f"Saved Parquet file: {parquet_path}")
-    except Exception as e:
-        print(f"ERROR: Failed to save Parquet file: {e}")
-        raise
+from parsely_analysis.aggregates import MonthlyMetrics
+from parsely_analysis.aliases import resolve_names, short_names, use_aliases
+from parsely_analysis.backends import BACKENDS, aggregate_file, date_summary, resolve_backend, summarize_dates
+from parsely_analysis.baseline import baseline_delta, baseline_summary, format_baseline, format_delta
+from parsely_analysis.cache import cached_report, keep_tables
+from parsely_analysis.cube import (
+    build_cube, cube_params, load_cube, save_cube, sections_by_volume, slice_section, tag_table,
+)
+from parsely_analysis.loader import CACHE_FORMATS, arrow_source, load_export, save_parquet_if_needed
+from parsely_analysis.metrics import (
+    METRIC_CATALOG, DEFAULT_METRICS, aggregate_metrics, explode_authors, finalize_metrics, format_metric,
+)
+from parsely_analysis.movers import compute_movers, format_movers, movers_tables
+from parsely_analysis.render import FORMATS, ranking_table, render_tables, write_lines
+from parsely_analysis.rolling import rolling_metrics, window_sums
 
 
-def count_category_winners(monthly_metrics, metric_key):
+def count_category_winners(monthly_metrics, metric_key, display=None):
     """Count how many times each author topped a metric category.
     
     Handles ties by counting all authors with max value as winners.
-    Returns list of (first_name, win_count) tuples, sorted by wins desc, then name.
+    Returns list of (name, win_count) tuples, sorted by wins desc, then name.
+    Names are shown through display (author -> display name, see
+    monthly_short_names); without it (e.g. for tags) the full names are kept.
     """
     winners = defaultdict(int)
     
     for month in sorted(monthly_metrics.keys()):
-        metric_data = monthly_metrics[month][metric_key]
+        metric_data = {a: v for a, v in monthly_metrics[month][metric_key].items() if pd.notna(v)}
         if not metric_data:
             continue
             
@@ -65,132 +49,118 @@ def count_category_winners(monthly_metrics, metric_key):
             if value == max_value:
                 winners[author] += 1
     
-    # Convert to first names and sort
-    first_name_winners = []
-    for author, count in winners.items():
-        first_name = author.split()[0] if author else "Unknown"
-        first_name_winners.append((first_name, count))
+    # Convert to display names and sort
+    named_winners = [(display[author] if display else author, count) for author, count in winners.items()]
     
     # Sort by wins (desc), then alphabetically
-    sorted_winners = sorted(first_name_winners, 
+    sorted_winners = sorted(named_winners, 
                           key=lambda x: (-x[1], x[0]))
     
     return sorted_winners
 
 
-def analyze_monthly_metrics(df, ignored_authors):
-    """Analyze journalist metrics by month with equal credit distribution."""
+def monthly_short_names(monthly_metrics):
+    """Collision-safe short names for every author in a monthly aggregate."""
+    return short_names(set().union(*(month['article_count'] for month in monthly_metrics.values())))
+
+
+def nest_monthly_table(table):
+    """Month -> metric -> {author: value} container of a (year_month, author) aggregate table."""
+    return MonthlyMetrics.from_table(table)
+
+
+def analyze_monthly_metrics(df, ignored_authors, metric_keys=None):
+    """Analyze journalist metrics by month with equal credit distribution.
+
+    Returns (monthly_metrics, sum_table, articles_by_month,
+    articles_by_month_author); sum_table holds the month x author sums that
+    windows and movers derive their own ratios from.
+    """
+    metric_keys = list(metric_keys or DEFAULT_METRICS)
     
     # Group by year-month
     df['year_month'] = df['Publish date'].dt.to_period('M')
     
-    # Initialize nested defaultdict for metrics by month
-    monthly_metrics = defaultdict(lambda: {
-        'views': defaultdict(float),
-        'visitors': defaultdict(float),
-        'social_refs': defaultdict(float),
-        'new_visitors': defaultdict(float),
-        'engaged_minutes': defaultdict(float),
-        'article_count': defaultdict(int)
-    })
+    # One (article, author) entry per credited author, ignored authors removed
+    pairs = explode_authors(df, ignored_authors)
+    sum_table = aggregate_metrics(df, window_sums(metric_keys), by='year_month', pairs=pairs)
+    
+    monthly_metrics = nest_monthly_table(finalize_metrics(sum_table.copy(), metric_keys))
     
     # Track articles by month and author for output
-    articles_by_month = defaultdict(list)
-    articles_by_month_author = defaultdict(lambda: defaultdict(list))
-    
-    # Process each article
-    for _, row in df.iterrows():
-        authors = parse_authors(row['Authors'])
-        # Filter out ignored authors
-        authors = [a for a in authors if a not in ignored_authors]
-        
-        if not authors:
-            continue
-            
-        month = row['year_month']
-        num_authors = len(authors)
-        
-        # Equal split for all metrics
-        views_per_author = row['Views'] / num_authors
-        visitors_per_author = row['Visitors'] / num_authors
-        social_refs_per_author = row['Social refs'] / num_authors if pd.notna(row['Social refs']) else 0
-        new_vis_per_author = row['New vis.'] / num_authors
-        minutes_per_author = row['Engaged minutes'] / num_authors
-        
-        for author in authors:
-            monthly_metrics[month]['views'][author] += views_per_author
-            monthly_metrics[month]['visitors'][author] += visitors_per_author
-            monthly_metrics[month]['social_refs'][author] += social_refs_per_author
-            monthly_metrics[month]['new_visitors'][author] += new_vis_per_author
-            monthly_metrics[month]['engaged_minutes'][author] += minutes_per_author
-            monthly_metrics[month]['article_count'][author] += 1
-            
-            # Track articles for output
-            articles_by_month_author[month][author].append(row)
-        
+    articles_by_month = {}
+    articles_by_month_author = defaultdict(dict)
+    
+    credited = df.iloc[pairs['row'].to_numpy()].assign(Author=pairs['author'].array)
+    for month, month_articles in df.iloc[pairs['row'].unique()].groupby('year_month', sort=True):
         # Track articles by month (only once per article)
-        articles_by_month[month].append(row)
+        articles_by_month[month] = month_articles
+    for (month, author), author_articles in credited.groupby(['year_month', 'Author'], sort=False, observed=True):
+        articles_by_month_author[month][author] = author_articles.drop(columns='Author')
     
-    return monthly_metrics, articles_by_month, articles_by_month_author
+    return monthly_metrics, sum_table, articles_by_month, articles_by_month_author
 
 
-def print_monthly_rankings_compact(monthly_metrics, metric_name, metric_key, top_n):
-    """Print monthly rankings in compact format."""
+def format_monthly_rankings_compact(monthly_metrics, metric_name, metric_key, top_n, display=None):
+    """Text lines of monthly rankings in compact format, journalists shown by short name."""
+    
+    if display is None:
+        display = monthly_short_names(monthly_metrics)
     
-    print(f"\n{'='*60}")
-    print(f"MONTHLY RANKINGS: {metric_name.upper()}\n")
+    lines = ["", "=" * 60, f"MONTHLY RANKINGS: {metric_name.upper()}", ""]
     
     # Show category winners summary
-    winners = count_category_winners(monthly_metrics, metric_key)
+    winners = count_category_winners(monthly_metrics, metric_key, display)
     if winners:
         # Find max name length for alignment
         max_name_len = max(len(name) for name, _ in winners)
         
         for name, win_count in winners:
             # Right-align count at consistent position
-            print(f"{name:<{max_name_len + 2}}{win_count:>2}")
-        print()  # Blank line before monthly data
+            lines.append(f"{name:<{max_name_len + 2}}{win_count:>2}")
+        lines.append("")  # Blank line before monthly data
     
-    # Sort months chronologically
-    sorted_months = sorted(monthly_metrics.keys())
+    # Top journalists by metric, every month ranked at once
+    tops = monthly_metrics.top(metric_key, top_n)
     
-    for month in sorted_months:
+    for month in sorted(monthly_metrics.keys()):
         month_data = monthly_metrics[month]
-        
-        # Sort journalists by metric for this month
-        sorted_authors = sorted(
-            month_data[metric_key].items(), 
-            key=lambda x: x[1], 
-            reverse=True
-        )[:top_n]
+        sorted_authors = tops[month]
         
         if not sorted_authors:
             continue
             
-        # Extract first names and values
-        first_names = []
+        # Extract short names and values
+        names = []
         values = []
         article_counts = []
         
         for author, value in sorted_authors:
-            # Get first name (handle edge cases)
-            first_name = author.split()[0] if author else "Unknown"
-            first_names.append(first_name)
-            values.append(f"{int(value)}")
+            names.append(display[author])
+            if METRIC_CATALOG[metric_key]['kind'] == 'ratio':
+                values.append(format_metric(metric_key, value))
+            else:
+                values.append(f"{int(value)}")
             
             # Only add article counts if this isn't the article count metric itself
             if metric_key != 'article_count':
                 article_counts.append(str(month_data['article_count'][author]))
         
         # Format output line
-        names_str = ", ".join(first_names)
+        names_str = ", ".join(names)
         values_str = ", ".join(values)
         
         if metric_key != 'article_count':
             articles_str = ", ".join(article_counts)
-            print(f"{month}  {names_str} - {values_str} - {articles_str}")
+            lines.append(f"{month}  {names_str} - {values_str} - {articles_str}")
         else:
-            print(f"{month}  {names_str} - {values_str}")
+            lines.append(f"{month}  {names_str} - {values_str}")
+    return lines
+
+
+def print_monthly_rankings_compact(monthly_metrics, metric_name, metric_key, top_n, display=None):
+    """Print monthly rankings in compact format."""
+    write_lines(format_monthly_rankings_compact(monthly_metrics, metric_name, metric_key, top_n, display))
 
 
 def sanitize_filename(name):
@@ -205,14 +175,10 @@ def get_all_top_authors(monthly_metrics, top_n):
     """Collect all authors who appeared in any top-N ranking."""
     top_authors = set()
     
-    for month, month_data in monthly_metrics.items():
-        for metric_key in ['views', 'visitors', 'social_refs', 'new_visitors', 'engaged_minutes', 'article_count']:
-            sorted_authors = sorted(
-                month_data[metric_key].items(), 
-                key=lambda x: x[1], 
-                reverse=True
-            )[:top_n]
-            
+    for metric_key in monthly_metrics.metrics:
+        if metric_key in ('solo_articles', 'collab_articles'):
+            continue
+        for sorted_authors in monthly_metrics.top(metric_key, top_n).values():
             for author, _ in sorted_authors:
                 top_authors.add(author)
     
@@ -221,7 +187,7 @@ def get_all_top_authors(monthly_metrics, top_n):
 
 def save_month_csv(articles, output_path):
     """Save articles for a specific month to CSV."""
-    if not articles:
+    if len(articles) == 0:
         return
         
     # Convert to DataFrame if needed
@@ -284,71 +250,212 @@ def save_outputs(output_dir, after_date, top_n, monthly_metrics, articles_by_mon
             print(f"  Saved {saved_count} author CSVs for {month_str}")
 
 
-def print_monthly_rankings(monthly_metrics, metric_name, metric_key, top_n):
-    """Print monthly rankings for a specific metric."""
+def monthly_ranking_tables(monthly_metrics, metric_key, top_n, entity='journalists', baseline_authors=(), meta=None):
+    """Rank each month by one metric into tables shared by all output formats.
+    
+    With baseline_authors, each month also gets the baseline average and
+    median and each ranked row its difference from that average.
+    """
+    name_column = 'Journalist' if entity == 'journalists' else 'Tag'
+    columns = ['Rank', name_column, 'Value', 'Articles']
+    formats = {'Value': lambda value: format_metric(metric_key, value)}
+    if baseline_authors:
+        columns.append('vs Avg')
+        formats['vs Avg'] = format_delta
+    
+    # Top entries by metric, every month ranked at once
+    tops = monthly_metrics.top(metric_key, top_n)
+    
+    tables = []
+    for month in sorted(monthly_metrics.keys()):
+        month_data = monthly_metrics[month]
+        top = tops[month]
+        
+        notes = []
+        baseline = None
+        if baseline_authors:
+            baseline = baseline_summary(month_data[metric_key], baseline_authors)
+            notes.append(format_baseline(metric_key, baseline))
+        
+        rows = []
+        for rank, (author, value) in enumerate(top, 1):
+            row = (rank, author, value, month_data['article_count'][author])
+            if baseline_authors:
+                row += (baseline_delta(value, baseline),)
+            rows.append(row)
+        
+        # Count total articles and unique entries for this month
+        month_meta = {
+            **(meta or {}),
+            'metric': metric_key,
+            'month': str(month),
+            'month_articles': sum(month_data['article_count'].values()),
+            f'month_{entity}': len(month_data['article_count']),
+        }
+        title = f"{month}: TOP {top_n} {entity.upper()} BY {METRIC_CATALOG[metric_key]['display'].upper()}"
+        tables.append(ranking_table(title, columns, rows, meta=month_meta, notes=notes, formats=formats))
+    return tables
+
+
+def format_monthly_rankings(tables, monthly_metrics, metric_name, metric_key, entity='journalists', display=None):
+    """Text lines of the monthly rankings for one metric, from monthly_ranking_tables."""
     
-    print(f"\n{'='*60}")
-    print(f"MONTHLY RANKINGS: {metric_name.upper()}")
-    print(f"{'='*60}")
+    lines = ["", "=" * 60, f"MONTHLY RANKINGS: {metric_name.upper()}", "=" * 60]
     
     # Show category winners summary
-    winners = count_category_winners(monthly_metrics, metric_key)
+    winners = count_category_winners(monthly_metrics, metric_key, display)
     if winners:
-        print("\nTop finishers:")
+        lines.append("")
+        lines.append("Top finishers:")
         # Find max name length for alignment
         max_name_len = max(len(name) for name, _ in winners)
         
         for name, win_count in winners:
-            print(f"  {name:<{max_name_len + 2}}{win_count:>2}")
-        print()  # Blank line before monthly data
-    
-    # Sort months chronologically
-    sorted_months = sorted(monthly_metrics.keys())
-    
-    for month in sorted_months:
-        month_data = monthly_metrics[month]
-        
-        # Count total articles and unique journalists for this month
-        total_articles = sum(month_data['article_count'].values())
-        active_journalists = len(month_data['article_count'])
-        
-        print(f"\n{month} ({total_articles} articles, {active_journalists} journalists)")
-        print(f"{'-'*60}")
+            lines.append(f"  {name:<{max_name_len + 2}}{win_count:>2}")
+        lines.append("")  # Blank line before monthly data
+    
+    unit = METRIC_CATALOG[metric_key]['unit']
+    format_value = lambda value: format_metric(metric_key, value)
+    for table in tables:
+        meta = table['meta']
+        lines.append("")
+        lines.append(f"{meta['month']} ({meta['month_articles']} articles, {meta[f'month_{entity}']} {entity})")
+        lines.extend(table['notes'])
+        lines.append("-" * 60)
         
-        # Sort journalists by metric for this month
-        sorted_authors = sorted(
-            month_data[metric_key].items(), 
-            key=lambda x: x[1], 
-            reverse=True
-        )[:top_n]
-        
-        # Print rankings
-        for rank, (author, value) in enumerate(sorted_authors, 1):
-            articles = month_data['article_count'][author]
-            
-            # Format value based on metric type
-            if metric_key in ['views', 'visitors', 'social_refs', 'new_visitors']:
-                value_str = f"{value:>12,.0f}"
-            elif metric_key == 'engaged_minutes':
-                value_str = f"{value:>12,.0f}"
-            elif metric_key == 'article_count':
-                value_str = f"{value:>12}"
-                
-            # Abbreviated unit labels
-            unit = {
-                'views': 'views',
-                'visitors': 'visitors',
-                'social_refs': 'social',
-                'new_visitors': 'new vis',
-                'engaged_minutes': 'min',
-                'article_count': 'articles'
-            }[metric_key]
+        for row in table['rows']:
+            rank, author, value, articles = row[:4]
+            value_str = f"{format_value(value):>12}"
             
             # Only show article count in parentheses if this isn't the article count metric
             if metric_key != 'article_count':
-                print(f"{rank:>2}. {author:<30} {value_str} {unit:<8} ({articles} articles)")
+                line = f"{rank:>2}. {author:<30} {value_str} {unit:<8} ({articles} articles)"
             else:
-                print(f"{rank:>2}. {author:<30} {value_str} {unit:<8}")
+                line = f"{rank:>2}. {author:<30} {value_str} {unit:<8}"
+            if 'vs Avg' in table['columns']:
+                line += f"  {format_delta(row[4])} vs avg"
+            lines.append(line)
+    return lines
+
+
+def print_monthly_rankings(monthly_metrics, metric_name, metric_key, top_n, entity='journalists', baseline_authors=(),
+                           display=None):
+    """Print monthly rankings for a specific metric.
+    
+    Journalists are shown by short name in the winners summary.
+    """
+    if display is None and entity == 'journalists':
+        display = monthly_short_names(monthly_metrics)
+    tables = monthly_ranking_tables(monthly_metrics, metric_key, top_n, entity, baseline_authors)
+    write_lines(format_monthly_rankings(tables, monthly_metrics, metric_name, metric_key, entity, display))
+
+
+def print_all_rankings(monthly_metrics, metric_keys, format, top_n, baseline_authors=(), tables=None, meta=None,
+                       out=None):
+    """Print monthly rankings for each selected metric plus articles published.
+    
+    With a tables list, the ranking tables are appended to it for a
+    markdown/csv/json report instead of being printed; meta is added to each.
+    Text goes to out (default: stdout).
+    """
+    metrics_to_display = [(METRIC_CATALOG[key]['display'], key) for key in metric_keys]
+    if 'article_count' not in metric_keys:
+        metrics_to_display.append(('Articles Published', 'article_count'))
+    
+    if baseline_authors:
+        authors = set().union(*(month['article_count'] for month in monthly_metrics.values()))
+        baseline_authors = resolve_names(baseline_authors, authors)
+    
+    if tables is not None:
+        for _, metric_key in metrics_to_display:
+            tables.extend(monthly_ranking_tables(monthly_metrics, metric_key, top_n, baseline_authors=baseline_authors,
+                                                 meta=meta))
+        return
+    
+    # Short names are derived once per distinct author for all metrics
+    display = monthly_short_names(monthly_metrics)
+    
+    lines = []
+    for metric_name, metric_key in metrics_to_display:
+        if format == 'compact':
+            lines.extend(format_monthly_rankings_compact(monthly_metrics, metric_name, metric_key, top_n, display))
+        else:
+            month_tables = monthly_ranking_tables(monthly_metrics, metric_key, top_n, baseline_authors=baseline_authors)
+            lines.extend(format_monthly_rankings(month_tables, monthly_metrics, metric_name, metric_key,
+                                                 display=display))
+    write_lines(lines, out)
+
+
+def print_all_movers(sum_table, metric_keys, top_n, tables=None):
+    """Print month-over-month movers for each selected metric plus articles published.
+
+    With a tables list, the movers tables are appended to it instead.
+    """
+    keys = list(metric_keys) + (['article_count'] if 'article_count' not in metric_keys else [])
+    movers = compute_movers(sum_table, keys)
+    lines = []
+    for metric_key in keys:
+        metric_tables = movers_tables(movers, metric_key, top_n)
+        if tables is not None:
+            tables.extend(metric_tables)
+        else:
+            lines.extend(format_movers(metric_key, metric_tables))
+    if tables is None:
+        write_lines(lines)
+
+
+def print_breakdowns(cube, breakdowns, sections, metric_keys, format, top_n, tables=None):
+    """Print per-section and per-tag leaderboards sliced from the aggregation cube.
+    
+    With a tables list, the leaderboards are appended to it instead (see
+    print_all_rankings).
+    """
+    if 'section' in breakdowns:
+        for section in sections or sections_by_volume(cube):
+            if section not in cube['author_section'].index.get_level_values('section'):
+                print(f"\nNo articles found in section: {section}")
+                continue
+            section_metrics = nest_monthly_table(slice_section(cube, section, metric_keys))
+            if tables is not None:
+                print_all_rankings(section_metrics, metric_keys, format, top_n, tables=tables,
+                                   meta={'section': section})
+                continue
+            print(f"\n{'#'*60}")
+            print(f"SECTION: {section}")
+            print(f"{'#'*60}")
+            print_all_rankings(section_metrics, metric_keys, format, top_n)
+    
+    if 'tag' in breakdowns and 'tag' in cube:
+        tag_metrics = nest_monthly_table(tag_table(cube, metric_keys))
+        if tables is not None:
+            for metric_key in metric_keys:
+                tables.extend(monthly_ranking_tables(tag_metrics, metric_key, top_n, entity='tags'))
+            return
+        print(f"\n{'#'*60}")
+        print("TAGS")
+        print(f"{'#'*60}")
+        for metric_key in metric_keys:
+            print_monthly_rankings(tag_metrics, METRIC_CATALOG[metric_key]['display'], metric_key, top_n, entity='tags')
+
+
+def print_load_summary(summary, after_date=None):
+    """Print article and date counts of a loaded export (see backends.summarize_dates).
+
+    Returns False if no dated articles are left after after_date.
+    """
+    print(f"Total articles loaded: {summary['rows']}")
+    if summary['first'] is None:
+        print("No articles with valid publish dates!")
+        return False
+    print(f"Date range: {summary['first'].date()} to {summary['last'].date()}")
+    
+    if after_date:
+        print(f"Filtering articles after: {pd.to_datetime(after_date).date()}")
+        print(f"Articles after filtering: {summary['after']}")
+        if summary['after'] == 0:
+            print("No articles found after the specified date!")
+            return False
+    return True
 
 
 @click.command()
@@ -359,42 +466,104 @@ def print_monthly_rankings(monthly_metrics, metric_name, metric_key, top_n):
 @click.option('--format', type=click.Choice(['verbose', 'compact']), default='verbose', help='Output format style')
 @click.option('--output-dir', default=None, help='Directory to save analysis outputs (optional)')
 @click.option('--save-parquet', is_flag=True, help='Save CSV input as Parquet file for faster future processing')
-def main(parquet_file, top_n, after_date, ignore_authors, format, output_dir, save_parquet):
+@click.option('--metric', '-m', 'metric_keys', multiple=True, type=click.Choice(list(METRIC_CATALOG)),
+              help='Metric to rank by (can be specified multiple times, default: views, visitors, social_refs, new_visitors, engaged_minutes)')
+@click.option('--backend', type=click.Choice(BACKENDS), default='auto',
+              help='Dataframe backend: polars lazy execution when installed (auto), or pandas')
+@click.option('--breakdown', 'breakdowns', multiple=True, type=click.Choice(['section', 'tag']),
+              help='Also print per-section author leaderboards and/or per-tag leaderboards (can be specified multiple times)')
+@click.option('--section', '-s', 'sections', multiple=True, help='Only break down these sections (default: all, by views)')
+@click.option('--cube-dir', default=None, help='Directory to store and reuse the section/tag aggregation cube')
+@click.option('--baseline-authors', '-b', multiple=True,
+              help='Staff authors whose monthly average and median are shown as a baseline in verbose format (can be specified multiple times)')
+@click.option('--window', type=click.IntRange(min=1), default=None,
+              help='Rank by trailing N-month totals ending at each month instead of single months')
+@click.option('--movers', is_flag=True, help='Also report month-over-month rank gains, drops and growth for every metric')
+@click.option('--aliases', 'aliases_file', type=click.Path(exists=True), default=None,
+              help='JSON file mapping canonical author names to lists of their variants')
+@click.option('--output-format', type=click.Choice(FORMATS), default='text',
+              help='Format of the rankings; with markdown, csv or json other messages go to stderr')
+@click.option('--cache-format', type=click.Choice(CACHE_FORMATS), default='none',
+              help='Load through an uncompressed Arrow copy memory-mapped on later runs: arrow (user cache) or shm (/dev/shm)')
+@click.option('--workers', type=click.IntRange(min=1), default=1,
+              help='Worker processes aggregating row chunks of the export in parallel (default: 1)')
+@click.option('--no-cache', is_flag=True,
+              help='Recompute the report instead of reusing a cached one (cached reports match input files by '
+                   'path, size and modification time, not content)')
+@cached_report('monthly', ['parquet_file', 'aliases_file'],
+               bypass=lambda p: p['output_dir'] or p['save_parquet'] or p['cube_dir'])
+def main(parquet_file, top_n, after_date, ignore_authors, format, output_dir, save_parquet, metric_keys, backend,
+         breakdowns, sections, cube_dir, baseline_authors, window, movers, aliases_file, output_format,
+         cache_format, workers, no_cache):
     """Generate monthly rankings of journalist performance metrics."""
     
-    print(f"Loading data from: {parquet_file}")
-    is_csv = parquet_file.endswith('.csv')
-    df = pd.read_csv(parquet_file) if is_csv else pd.read_parquet(parquet_file)
+    metric_keys = list(metric_keys) or DEFAULT_METRICS
+    use_aliases(aliases_file)
+    
+    # Text is written report by report; other formats collect every table into one document
+    report_out = sys.stdout
+    tables = None
+    if output_format != 'text':
+        tables = []
+        click.get_current_context().with_resource(contextlib.redirect_stdout(sys.stderr))
+    try:
+        backend = resolve_backend(backend)
+    except ImportError as e:
+        raise click.ClickException(str(e))
+    
+    if after_date:
+        try:
+            pd.to_datetime(after_date)
+        except ValueError as e:
+            print(f"Error parsing date filter '{after_date}': {e}")
+            return
+    
+    lazy = backend == 'polars' or workers > 1
+    if lazy and (output_dir or save_parquet or breakdowns):
+        print("Note: --output-dir, --save-parquet and --breakdown need the full article table, aggregating with "
+              "pandas in one process", file=sys.stderr)
+        backend, lazy = 'pandas', False
+    source = arrow_source(parquet_file, cache_format, workers)
+    
+    if lazy:
+        # Filter, explode and aggregate lazily (or chunk by chunk) without materializing the article table
+        mode = f"{workers} workers" if workers > 1 else "polars lazy backend"
+        print(f"Loading data from: {parquet_file} ({mode})", file=sys.stderr)
+        summary = date_summary(source, after_date, backend, workers)
+        if not print_load_summary(summary, after_date):
+            return
+        if ignore_authors:
+            print(f"Ignoring authors: {', '.join(sorted(set(ignore_authors)))}")
+        print(f"\nAnalyzing {summary['after'] if after_date else summary['rows'] - summary['invalid']} articles...")
+        sum_table = aggregate_file(source, window_sums(metric_keys), after_date, set(ignore_authors),
+                                   by_month=True, backend=backend, workers=workers)
+        if window:
+            print(f"\nRolling {window}-month windows ending at each month")
+            table = rolling_metrics(sum_table, window, metric_keys)
+        else:
+            table = finalize_metrics(sum_table.copy(), metric_keys)
+        print_all_rankings(nest_monthly_table(table), metric_keys, format, top_n, baseline_authors, tables)
+        if movers:
+            print_all_movers(sum_table, metric_keys, top_n, tables)
+        if tables is not None:
+            keep_tables(tables)
+            report_out.write(render_tables(tables, output_format))
+        return
     
-    print(f"Total articles loaded: {len(df)}")
+    print(f"Loading data from: {parquet_file}", file=sys.stderr)
+    is_csv = parquet_file.endswith('.csv')
+    df = load_export(source, workers=workers)
     
     # Save as Parquet if requested and input was CSV
     if save_parquet and is_csv:
         save_parquet_if_needed(parquet_file, df)
     
-    # Handle date parsing
-    try:
-        df['Publish date'] = pd.to_datetime(df['Publish date'], errors='coerce')
-        df = df.dropna(subset=['Publish date'])
-        print(f"Date range: {df['Publish date'].min().date()} to {df['Publish date'].max().date()}")
-    except Exception as e:
-        print(f"Error parsing dates: {e}")
+    df['Publish date'] = pd.to_datetime(df['Publish date'], errors='coerce')
+    if not print_load_summary(summarize_dates(df['Publish date'], after_date), after_date):
         return
-    
-    # Apply date filter if specified
+    df = df.dropna(subset=['Publish date'])
     if after_date:
-        try:
-            filter_date = pd.to_datetime(after_date)
-            print(f"Filtering articles after: {filter_date.date()}")
-            df = df[df['Publish date'] > filter_date]
-            print(f"Articles after filtering: {len(df)}")
-            
-            if len(df) == 0:
-                print("No articles found after the specified date!")
-                return
-        except Exception as e:
-            print(f"Error parsing date filter '{after_date}': {e}")
-            return
+        df = df[df['Publish date'] > pd.to_datetime(after_date)]
     
     # Convert ignore_authors tuple to set for faster lookup
     ignored_authors = set(ignore_authors) if ignore_authors else set()
@@ -403,24 +572,36 @@ def main(parquet_file, top_n, after_date, ignore_authors, format, output_dir, sa
     
     print(f"\nAnalyzing {len(df)} articles...")
     
-    # Analyze metrics by month
-    monthly_metrics, articles_by_month, articles_by_month_author = analyze_monthly_metrics(df, ignored_authors)
-    
-    # Print rankings for each metric
-    metrics_to_display = [
-        ('Page Views', 'views'),
-        ('Visitors', 'visitors'),
-        ('Social Referrals', 'social_refs'),
-        ('New Visitors', 'new_visitors'),
-        ('Engaged Minutes', 'engaged_minutes'),
-        ('Articles Published', 'article_count')
-    ]
-    
-    for metric_name, metric_key in metrics_to_display:
-        if format == 'compact':
-            print_monthly_rankings_compact(monthly_metrics, metric_name, metric_key, top_n)
+    # Analyze metrics by month; windows and movers reuse the month x author sums
+    monthly_metrics, sum_table, articles_by_month, articles_by_month_author = analyze_monthly_metrics(
+        df, ignored_authors, metric_keys)
+    
+    if window:
+        # Every trailing window comes from prefix sums over the month x author totals
+        print(f"\nRolling {window}-month windows ending at each month")
+        print_all_rankings(nest_monthly_table(rolling_metrics(sum_table, window, metric_keys)),
+                           metric_keys, format, top_n, baseline_authors, tables)
+    else:
+        print_all_rankings(monthly_metrics, metric_keys, format, top_n, baseline_authors, tables)
+    
+    if movers:
+        print_all_movers(sum_table, metric_keys, top_n, tables)
+    
+    # Section and tag leaderboards are sliced from one multi-key aggregation
+    if breakdowns:
+        params = cube_params(parquet_file, after_date, ignored_authors)
+        cube = load_cube(cube_dir, params, parquet_file, metric_keys) if cube_dir else None
+        if cube is None:
+            cube = build_cube(df, metric_keys, ignored_authors)
+            if cube_dir:
+                save_cube(cube, cube_dir, params)
         else:
-            print_monthly_rankings(monthly_metrics, metric_name, metric_key, top_n)
+            print(f"\nLoaded aggregation cube from: {cube_dir}")
+        print_breakdowns(cube, breakdowns, sections, metric_keys, format, top_n, tables)
+    
+    if tables is not None:
+        keep_tables(tables)
+        report_out.write(render_tables(tables, output_format))
     
     # Save outputs if directory specified
     if output_dir:
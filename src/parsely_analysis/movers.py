@@ -0,0 +1,150 @@
+"""Month-over-month rank movement computed on the month x author matrix."""
+
+import numpy as np
+import pandas as pd
+
+from parsely_analysis.metrics import METRIC_CATALOG, format_metric
+from parsely_analysis.render import ranking_table
+from parsely_analysis.rolling import dense_month_author
+
+
+def metric_matrix(dense, columns, metric_key):
+    """Months x authors matrix of one metric from a dense sums array."""
+    columns = list(columns)
+    spec = METRIC_CATALOG[metric_key]
+    if spec['kind'] == 'ratio':
+        numerator = dense[:, :, columns.index(spec['numerator'])]
+        denominator = dense[:, :, columns.index(spec['denominator'])]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.where(denominator != 0, numerator / denominator, np.nan)
+    return dense[:, :, columns.index(metric_key)]
+
+
+def rank_matrix(values, active):
+    """Rank authors within each month (1 = best), NaN where not active.
+
+    Ties share the best rank, as in a leaderboard.
+    """
+    masked = np.where(active, values, np.nan)
+    return pd.DataFrame(masked).rank(axis=1, ascending=False, method='min').to_numpy()
+
+
+def compute_movers(table, metric_keys):
+    """Rank and movement matrices for every metric from one dense matrix.
+
+    Args:
+        table: (year_month, author) table of sums and counts, including
+            everything the ratio metrics in metric_keys depend on.
+        metric_keys: Metrics to compute movement for.
+
+    Returns:
+        Dict with 'months', 'authors' and, per metric, a dict of
+        months x authors arrays: values, ranks, rank_change (positive means
+        moved up since the previous month) and growth (relative change in
+        value). Authors must be active in both months to have a change.
+    """
+    dense, months, authors = dense_month_author(table)
+    active = dense[:, :, list(table.columns).index('article_count')] > 0
+
+    result = {'months': months, 'authors': authors}
+    for key in metric_keys:
+        values = metric_matrix(dense, table.columns, key)
+        ranks = rank_matrix(values, active)
+
+        rank_change = np.full_like(ranks, np.nan)
+        rank_change[1:] = ranks[:-1] - ranks[1:]
+
+        growth = np.full_like(values, np.nan, dtype=np.float64)
+        previous = np.where(active[:-1], values[:-1], np.nan)
+        current = np.where(active[1:], values[1:], np.nan)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            growth[1:] = np.where(previous > 0, (current - previous) / previous, np.nan)
+
+        result[key] = {'values': values, 'ranks': ranks, 'rank_change': rank_change, 'growth': growth}
+    return result
+
+
+def top_indices(matrix, top_n, largest=True):
+    """Per-month column indices of the top_n finite entries, NaN-safe.
+
+    Returns a months x top_n index array and a matching validity mask.
+    """
+    fill = -np.inf if largest else np.inf
+    filled = np.where(np.isfinite(matrix), matrix, fill)
+    order = np.argsort(-filled if largest else filled, axis=1, kind='stable')[:, :top_n]
+    valid = np.isfinite(np.take_along_axis(matrix, order, axis=1))
+    if largest:
+        valid &= np.take_along_axis(matrix, order, axis=1) > 0
+    else:
+        valid &= np.take_along_axis(matrix, order, axis=1) < 0
+    return order, valid
+
+
+def finite(value, cast=float):
+    """A finite matrix entry as cast, or None."""
+    return cast(value) if np.isfinite(value) else None
+
+
+def movers_tables(movers, metric_key, top_n):
+    """Biggest rank gains, drops and growth of one metric, one ranking table per month.
+
+    Rows are labelled 'gain', 'drop' or 'growth' in the List column, each
+    list in order; a month with no movement in a list has no rows for it.
+    """
+    months = movers['months']
+    authors = movers['authors']
+    data = movers[metric_key]
+    values, ranks, growth = data['values'], data['ranks'], data['growth']
+
+    gains, gains_valid = top_indices(data['rank_change'], top_n, largest=True)
+    losses, losses_valid = top_indices(data['rank_change'], top_n, largest=False)
+    grown, grown_valid = top_indices(growth, top_n, largest=True)
+
+    def metric(value):
+        return "-" if value is None else format_metric(metric_key, value)
+
+    tables = []
+    for t in range(1, len(months)):
+        rows = [
+            (label, authors[a], finite(ranks[t - 1, a], int), finite(ranks[t, a], int),
+             finite(ranks[t - 1, a] - ranks[t, a], int), finite(growth[t, a]),
+             finite(values[t - 1, a]), finite(values[t, a]))
+            for label, indices, valid in [
+                ('gain', gains[t], gains_valid[t]),
+                ('drop', losses[t], losses_valid[t]),
+                ('growth', grown[t], grown_valid[t]),
+            ]
+            for a in indices[valid]
+        ]
+        tables.append(ranking_table(
+            f"MOVERS: {METRIC_CATALOG[metric_key]['display'].upper()} {months[t]} vs {months[t - 1]}",
+            ['List', 'Journalist', 'Previous rank', 'Rank', 'Change', 'Growth', 'Previous value', 'Value'],
+            rows,
+            meta={'report': 'movers', 'metric': metric_key, 'month': str(months[t]), 'previous': str(months[t - 1])},
+            formats={
+                'Change': lambda value: "-" if value is None else f"{value:+d}",
+                'Growth': lambda value: "-" if value is None else f"{value:+.1%}",
+                'Previous value': metric,
+                'Value': metric,
+            },
+        ))
+    return tables
+
+
+def format_movers(metric_key, tables):
+    """Text lines of the movers tables of one metric."""
+    lines = ["", "=" * 60, f"MOVERS: {METRIC_CATALOG[metric_key]['display'].upper()}", "=" * 60]
+    for table in tables:
+        lines += ["", f"{table['meta']['month']} vs {table['meta']['previous']}", "-" * 60]
+        for label, title in [('gain', "Biggest rank gains"), ('drop', "Biggest rank drops"), ('growth', "Biggest growth")]:
+            rows = [row for row in table['rows'] if row[0] == label]
+            lines.append(f"  {title}:")
+            if not rows:
+                lines.append("    (none)")
+            for _, author, previous_rank, rank, change, growth, previous, value in rows:
+                if label == 'growth':
+                    lines.append(f"    {author:<30} {growth:>+9.1%}  "
+                                 f"{format_metric(metric_key, previous)} -> {format_metric(metric_key, value)}")
+                else:
+                    lines.append(f"    {author:<30} #{previous_rank:<3} -> #{rank:<3} ({change:+d})")
+    return lines
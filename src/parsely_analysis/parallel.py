@@ -0,0 +1,124 @@
+"""Map-reduce aggregation of an export over row chunks in worker processes.
+
+A CSV export is cut into byte ranges of whole records, and each worker
+parses its own range (see loader.record_ranges). Other exports have their
+needed columns put in an uncompressed Arrow IPC file (an Arrow copy from
+--cache-format is used as is), preferably under /dev/shm, which workers
+memory-map, so column buffers are shared between processes rather than
+pickled. Each worker aggregates one contiguous chunk into a partial keyed
+by (*by, author identity, num_authors). Partials hold only
+integer sums and counts (see metrics.partial_metrics), so merging them is
+an exact, associative addition; credit is split and spellings resolved to
+display names once, on the merged result. Rows are not regrouped by month
+or author, so the merged table keeps the serial path's order.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+import contextlib
+import os
+import tempfile
+
+import numpy as np
+import pyarrow.feather as feather
+
+from parsely_analysis.aliases import ALIASES
+from parsely_analysis.backends import frame_partial, merge_partials, needed_columns
+from parsely_analysis.loader import arrow_table, load_export, read_csv_range, record_ranges, regular_quoting
+from parsely_analysis.metrics import finalize_metrics, resolve_metrics
+
+
+# Shared files go here when available, so workers map pages from memory
+SHARED_DIR = Path('/dev/shm')
+
+
+@contextlib.contextmanager
+def shared_source(path, columns):
+    """Path of a file holding the export's columns that workers can read chunks of.
+
+    CSVs and Arrow copies are used directly; other exports, and CSVs whose
+    quoting rules out cutting them into byte ranges (see
+    loader.regular_quoting), are loaded once and written to a temporary
+    Arrow file that is removed afterwards.
+    """
+    path = str(path)
+    if path.endswith('.arrow') or path.endswith('.csv') and regular_quoting(path):
+        yield path
+        return
+
+    table = arrow_table(load_export(path, columns=columns))
+    directory = SHARED_DIR if SHARED_DIR.is_dir() else Path(tempfile.gettempdir())
+    fd, shared = tempfile.mkstemp(prefix='parsely-', suffix='.arrow', dir=directory)
+    os.close(fd)
+    try:
+        feather.write_feather(table, shared, compression='uncompressed')
+        del table
+        yield shared
+    finally:
+        os.unlink(shared)
+
+
+def chunk_bounds(num_rows, chunks):
+    """(offset, length) of chunks contiguous row ranges of near-equal size."""
+    edges = np.linspace(0, num_rows, chunks + 1).astype(np.int64)
+    return [(int(start), int(end - start)) for start, end in zip(edges[:-1], edges[1:])]
+
+
+def source_chunks(path, chunks):
+    """Chunks of a shared source.
+
+    These are (start, end, header) byte ranges of whole records for a CSV,
+    or (offset, length) row ranges for an Arrow file.
+    """
+    if path.endswith('.csv'):
+        header, ranges = record_ranges(path, chunks)
+        return [(start, end, header) for start, end in ranges]
+    return chunk_bounds(feather.read_table(path, memory_map=True).num_rows, chunks)
+
+
+def chunk_frame(path, chunk, columns):
+    """Article rows of one chunk of a shared source (see source_chunks)."""
+    if path.endswith('.csv'):
+        table = read_csv_range(path, *chunk, columns=columns)
+    else:
+        offset, length = chunk
+        table = feather.read_table(path, memory_map=True)
+        table = table.select([c for c in columns if c in table.column_names]).slice(offset, length)
+    return table.to_pandas(split_blocks=True)
+
+
+def init_worker(aliases):
+    """Give a worker process the parent's author aliases."""
+    ALIASES.clear()
+    ALIASES.update(aliases)
+
+
+def chunk_partial(path, chunk, sums, after_date=None, ignored_authors=(), by_month=False):
+    """Identity-keyed partial aggregate of one chunk of a shared source.
+
+    Runs in a worker process. Returns (partial, spellings) as
+    backends.frame_partial does.
+    """
+    return frame_partial(chunk_frame(path, chunk, needed_columns(sums)), sums, after_date, ignored_authors, by_month)
+
+
+def aggregate_parallel(path, metric_keys=None, after_date=None, ignored_authors=(), by_month=False, workers=None,
+                       chunks=None):
+    """Aggregate an export over row chunks in a process pool.
+
+    Returns the same table as backends.aggregate_pandas, bit for bit.
+
+    Args:
+        workers: Worker processes (default: one per CPU).
+        chunks: Chunks to split the export into (default: one per worker).
+    """
+    selected, sums = resolve_metrics(metric_keys)
+    workers = workers or os.cpu_count() or 1
+    with shared_source(path, needed_columns(sums)) as shared:
+        with ProcessPoolExecutor(max_workers=workers, initializer=init_worker, initargs=(dict(ALIASES),)) as pool:
+            futures = [
+                pool.submit(chunk_partial, shared, chunk, sums, after_date, tuple(ignored_authors), by_month)
+                for chunk in source_chunks(shared, chunks or workers)
+            ]
+            partials, spellings = zip(*(future.result() for future in futures))
+    return finalize_metrics(merge_partials(partials, spellings, sums), selected)
@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+"""Ad-hoc journalist rankings over a Parsely export with an embedded DuckDB."""
+
+from pathlib import Path
+import click
+import time
+
+import pandas as pd
+
+from parsely_analysis.aliases import author_key, display_names, use_aliases
+from parsely_analysis.metrics import METRIC_CATALOG, format_metric
+
+
+def import_duckdb():
+    """Import duckdb, which is an optional dependency."""
+    try:
+        import duckdb
+    except ImportError as e:
+        raise ImportError(
+            "The query backend requires duckdb. Install it with: pip install 'parsely_analysis[query]'"
+        ) from e
+    return duckdb
+
+
+def resolve_source(path):
+    """Prefer the cached Parquet file next to a CSV export when it is up to date."""
+    path = Path(path)
+    if path.suffix == '.csv':
+        parquet_path = path.with_suffix('.parquet')
+        if parquet_path.exists() and parquet_path.stat().st_mtime > path.stat().st_mtime:
+            return parquet_path
+    return path
+
+
+def connect(path, database=':memory:'):
+    """Open a DuckDB connection with the export registered.
+
+    Registers three relations:
+        articles           - one row per export row, with article_id and a
+                             parsed publish_ts timestamp
+        author_identities  - one row per author spelling, with its identity
+                             key and display name (see aliases)
+        article_authors    - one row per (article, author identity), with
+                             author_key and the display name as author;
+                             empty names dropped
+    """
+    duckdb = import_duckdb()
+    source = resolve_source(path)
+    con = duckdb.connect(database)
+
+    reader = 'read_csv_auto' if source.suffix == '.csv' else 'read_parquet'
+    con.execute(f"""
+        CREATE OR REPLACE TABLE articles AS
+        SELECT row_number() OVER () - 1 AS article_id,
+               *,
+               TRY_CAST("Publish date" AS TIMESTAMP) AS publish_ts
+        FROM {reader}(?)
+    """, [str(source)])
+    con.execute("""
+        CREATE OR REPLACE VIEW author_spellings AS
+        SELECT article_id, spelling
+        FROM (
+            SELECT article_id, trim(unnest(string_split(Authors, ','))) AS spelling
+            FROM articles
+            WHERE Authors IS NOT NULL
+        )
+        WHERE spelling <> ''
+    """)
+
+    # Identities are resolved in Python once per distinct spelling
+    spellings = con.execute("SELECT spelling, count(*) FROM author_spellings GROUP BY spelling").fetchall()
+    names = [name for name, _ in spellings]
+    keys = [author_key(name) for name in names]
+    display = display_names(keys, names, [count for _, count in spellings])
+    identities = pd.DataFrame({'spelling': names, 'author_key': keys, 'author': [display[key] for key in keys]},
+                              dtype=object)
+    con.register('identities_frame', identities)
+    con.execute("CREATE OR REPLACE TABLE author_identities AS SELECT * FROM identities_frame")
+    con.unregister('identities_frame')
+
+    # A byline naming one author twice (e.g. under two aliases) credits them once
+    con.execute("""
+        CREATE OR REPLACE VIEW article_authors AS
+        SELECT DISTINCT s.article_id, i.author_key, i.author
+        FROM author_spellings s
+        JOIN author_identities i USING (spelling)
+    """)
+    return con
+
+
+def metric_sql(metric_key, columns):
+    """SQL expression computing a catalog metric over the credited rows."""
+    spec = METRIC_CATALOG[metric_key]
+    if spec['kind'] == 'ratio':
+        numerator = metric_sql(spec['numerator'], columns)
+        denominator = metric_sql(spec['denominator'], columns)
+        return f"{numerator} / NULLIF({denominator}, 0)"
+    if metric_key == 'article_count':
+        return "count(*)"
+    if metric_key == 'solo_articles':
+        return "count(*) FILTER (WHERE num_authors = 1)"
+    if metric_key == 'collab_articles':
+        return "count(*) FILTER (WHERE num_authors > 1)"
+    if spec['column'] not in columns:
+        return "0.0"
+    return f'sum(coalesce(CAST("{spec["column"]}" AS DOUBLE), 0) / num_authors)'
+
+
+def rank_authors(con, metric_keys, top_n=10, start=None, end=None, sections=(), ignored_authors=()):
+    """Rank authors by the first metric, with equal credit for co-authors.
+
+    Filters are applied before credit is split, so ignored authors do not
+    take a share of their co-authors' articles.
+
+    Args:
+        con: Connection returned by connect().
+        metric_keys: Catalog keys to compute; the first one orders the ranking.
+        top_n: Number of authors to return (None for all).
+        start, end: Inclusive publish date bounds (YYYY-MM-DD or datetime).
+        sections: Only include articles in these sections.
+        ignored_authors: Authors to drop before splitting credit, matched by
+            identity (see aliases.author_key).
+
+    Returns:
+        DataFrame with rank, author and one column per metric.
+    """
+    columns = {row[0] for row in con.execute("DESCRIBE articles").fetchall()}
+
+    where = []
+    params = []
+    if start is not None:
+        where.append("a.publish_ts >= CAST(? AS TIMESTAMP)")
+        params.append(str(start))
+    if end is not None:
+        # Inclusive end date: anything before the following midnight
+        where.append("a.publish_ts < CAST(? AS TIMESTAMP) + INTERVAL 1 DAY")
+        params.append(str(end))
+    if sections:
+        where.append("a.Section IN (SELECT unnest(?))")
+        params.append(list(sections))
+    if ignored_authors:
+        where.append("aa.author_key NOT IN (SELECT unnest(?))")
+        params.append([author_key(name) for name in ignored_authors])
+    where_sql = f"WHERE {' AND '.join(where)}" if where else ""
+
+    selects = ",\n               ".join(
+        f'{metric_sql(key, columns)} AS "{key}"' for key in metric_keys
+    )
+    limit_sql = "LIMIT ?" if top_n else ""
+    if top_n:
+        params.append(int(top_n))
+
+    sql = f"""
+        WITH credited AS (
+            SELECT aa.author, a.*,
+                   count(*) OVER (PARTITION BY a.article_id) AS num_authors
+            FROM article_authors aa
+            JOIN articles a USING (article_id)
+            {where_sql}
+        ), totals AS (
+            SELECT author,
+               {selects}
+            FROM credited
+            GROUP BY author
+        )
+        SELECT row_number() OVER (ORDER BY "{metric_keys[0]}" DESC NULLS LAST, author) AS rank, *
+        FROM totals
+        ORDER BY rank
+        {limit_sql}
+    """
+    return con.execute(sql, params).df()
+
+
+def print_ranking(ranking, metric_keys):
+    """Print a ranking DataFrame returned by rank_authors."""
+    print(f"\n{'='*60}")
+    print(f"TOP {len(ranking)} JOURNALISTS BY {METRIC_CATALOG[metric_keys[0]]['display'].upper()}")
+    print(f"{'='*60}")
+    header = f"{'Rank':<5} {'Journalist':<30}"
+    for key in metric_keys:
+        header += f" {METRIC_CATALOG[key]['unit']:>12}"
+    print(header)
+    print(f"{'-'*60}")
+
+    for row in ranking.itertuples(index=False):
+        values = row._asdict()
+        line = f"{values['rank']:<5} {values['author']:<30}"
+        for key in metric_keys:
+            line += f" {format_metric(key, values[key]):>12}"
+        print(line)
+
+
+@click.command()
+@click.argument('parquet_file', type=click.Path(exists=True))
+@click.option('--metric', '-m', 'metric_keys', multiple=True, type=click.Choice(list(METRIC_CATALOG)),
+              help='Metric to compute (can be specified multiple times, the first one orders the ranking; default: views)')
+@click.option('--top-n', default=10, help='Number of top journalists to show (default: 10)')
+@click.option('--from', 'start', default=None, help='Only include articles published on or after this date (YYYY-MM-DD)')
+@click.option('--to', 'end', default=None, help='Only include articles published on or before this date (YYYY-MM-DD)')
+@click.option('--section', '-s', 'sections', multiple=True, help='Only include articles in this section (can be specified multiple times)')
+@click.option('--ignore-authors', '-i', multiple=True, help='Authors to ignore (can be specified multiple times)')
+@click.option('--aliases', 'aliases_file', type=click.Path(exists=True), default=None,
+              help='JSON file mapping canonical author names to lists of their variants')
+@click.option('--sql', default=None, help='Run a raw SQL query against the articles and article_authors relations instead')
+def main(parquet_file, metric_keys, top_n, start, end, sections, ignore_authors, aliases_file, sql):
+    """Run ad-hoc journalist rankings against a Parsely export."""
+    use_aliases(aliases_file)
+    try:
+        load_start = time.perf_counter()
+        con = connect(parquet_file)
+    except ImportError as e:
+        raise click.ClickException(str(e))
+
+    article_count = con.execute("SELECT count(*) FROM articles").fetchone()[0]
+    print(f"Loaded {article_count} articles from {resolve_source(parquet_file)} "
+          f"in {time.perf_counter() - load_start:.2f}s")
+
+    query_start = time.perf_counter()
+    if sql:
+        print(con.execute(sql).df().to_string(index=False))
+    else:
+        metric_keys = list(metric_keys) or ['views']
+        if 'article_count' not in metric_keys:
+            metric_keys.append('article_count')
+        ranking = rank_authors(con, metric_keys, top_n, start, end, sections, ignore_authors)
+        print_ranking(ranking, metric_keys)
+    print(f"\nQuery time: {time.perf_counter() - query_start:.3f}s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,150 @@
+"""Render ranking tables as one text, Markdown, CSV or JSON document.
+
+Reports build their rankings once as tables (see ranking_table); each output
+format is rendered from the same tables into a single string and written
+with one call.
+"""
+
+import csv
+import io
+import json
+import math
+import sys
+
+
+FORMATS = ['text', 'markdown', 'csv', 'json']
+
+
+def ranking_table(title, columns, rows, meta=None, notes=(), formats=None):
+    """A ranking table shared by all output formats.
+
+    Args:
+        title: Heading, e.g. "TOP 5 JOURNALISTS BY PAGE VIEWS".
+        columns: Column names.
+        rows: Row tuples of raw values, in rank order.
+        meta: Key/value context (metric, month, ...), repeated on every CSV row.
+        notes: Extra lines shown under the heading (text and Markdown).
+        formats: Column name -> function formatting a raw value for display.
+    """
+    return {
+        'title': title,
+        'columns': list(columns),
+        'rows': [tuple(row) for row in rows],
+        'meta': dict(meta or {}),
+        'notes': list(notes),
+        'formats': dict(formats or {}),
+    }
+
+
+def plain(value):
+    """JSON/CSV-friendly scalar: NumPy scalars unwrapped, NaN as None."""
+    if hasattr(value, 'item'):
+        value = value.item()
+    if isinstance(value, float) and math.isnan(value):
+        return None
+    return value
+
+
+def display(table, column, value):
+    """Human-readable cell for text and Markdown output."""
+    if column in table['formats']:
+        return table['formats'][column](value)
+    value = plain(value)
+    if value is None:
+        return "-"
+    if isinstance(value, float):
+        return f"{value:.0f}" if value.is_integer() else f"{value:.2f}"
+    return str(value)
+
+
+def table_cells(table):
+    """Display strings of every cell: stored ones for a frozen table, formatted otherwise."""
+    if 'cells' in table:
+        return table['cells']
+    return [[display(table, col, value) for col, value in zip(table['columns'], row)] for row in table['rows']]
+
+
+def freeze_tables(tables):
+    """Tables as JSON-compatible data, with display cells pre-rendered in place of formatters.
+
+    Frozen tables render in every format except text exactly as the
+    originals do.
+    """
+    return [
+        {
+            'title': table['title'],
+            'columns': table['columns'],
+            'rows': [[plain(v) for v in row] for row in table['rows']],
+            'meta': {key: plain(value) for key, value in table['meta'].items()},
+            'notes': table['notes'],
+            'formats': {},
+            'cells': table_cells(table),
+        }
+        for table in tables
+    ]
+
+
+def render_markdown(tables):
+    """One Markdown document with a heading and pipe table per ranking."""
+    lines = []
+    for table in tables:
+        lines.append(f"## {table['title']}")
+        lines.append("")
+        for note in table['notes']:
+            lines.append(f"{note}  ")
+        if table['notes']:
+            lines.append("")
+        lines.append("| " + " | ".join(table['columns']) + " |")
+        lines.append("|" + "|".join("---" for _ in table['columns']) + "|")
+        for cells in table_cells(table):
+            lines.append("| " + " | ".join(cell.replace("|", "\\|") for cell in cells) + " |")
+        lines.append("")
+    return "\n".join(lines)
+
+
+def render_csv(tables):
+    """Rankings as CSV under one header: the union of meta fields, then of columns.
+
+    Cells a table has no value for are left empty, so tables with different
+    layouts (e.g. author and tag rankings) share one rectangular document.
+    """
+    meta_fields = dict.fromkeys(key for table in tables for key in table['meta'])
+    columns = dict.fromkeys(col for table in tables for col in table['columns'] if col not in meta_fields)
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=list(meta_fields) + list(columns), restval='')
+    writer.writeheader()
+    for table in tables:
+        meta = {key: plain(value) for key, value in table['meta'].items()}
+        writer.writerows({**meta, **dict(zip(table['columns'], (plain(v) for v in row)))} for row in table['rows'])
+    return buffer.getvalue()
+
+
+def render_json(tables):
+    """Rankings as a JSON document with one object per table."""
+    document = [
+        {
+            'title': table['title'],
+            **{key: plain(value) for key, value in table['meta'].items()},
+            'notes': table['notes'],
+            'rows': [dict(zip(table['columns'], (plain(v) for v in row))) for row in table['rows']],
+        }
+        for table in tables
+    ]
+    return json.dumps(document, indent=2, default=str) + "\n"
+
+
+RENDERERS = {
+    'markdown': render_markdown,
+    'csv': render_csv,
+    'json': render_json,
+}
+
+
+def render_tables(tables, output_format):
+    """Render tables in a machine-readable or Markdown format."""
+    return RENDERERS[output_format](tables)
+
+
+def write_lines(lines, out=None):
+    """Write a buffered text report with a single write call."""
+    (out or sys.stdout).write("\n".join(lines) + "\n")
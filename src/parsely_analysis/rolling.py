@@ -0,0 +1,86 @@
+"""Trailing-window totals from prefix sums over a month x author matrix."""
+
+import numpy as np
+import pandas as pd
+
+from parsely_analysis.metrics import CREDIT_SCALE, finalize_metrics, fixed_point, resolve_metrics
+
+
+def window_sums(metric_keys):
+    """Sum metrics (and article counts) needed to derive metric_keys over a window."""
+    _, sums = resolve_metrics(metric_keys)
+    return sums
+
+
+def dense_month_author(table):
+    """Scatter a (year_month, author) table into a dense months x authors x columns array.
+
+    Months span the full range, so months with no articles are zero rows.
+    Returns (array, months, authors).
+    """
+    month_level = table.index.get_level_values('year_month')
+    author_level = table.index.get_level_values('author')
+    months = pd.period_range(month_level.min(), month_level.max(), freq='M')
+    authors = pd.Index(author_level.unique())
+
+    dense = np.zeros((len(months), len(authors), len(table.columns)), dtype=np.float64)
+    dense[months.get_indexer(month_level), authors.get_indexer(author_level), :] = table.to_numpy(dtype=np.float64)
+    return dense, months, authors
+
+
+def rolling_totals(table, window):
+    """Trailing-window totals for every month and author.
+
+    Prefix sums along the month axis make each window a single subtraction,
+    so all windows for all months cost O(months x authors) overall. They
+    are int64 multiples of the split-credit denominator (see
+    metrics.combine_split_credit), so the subtraction is exact and a
+    window's totals don't pick up rounding error from the months before it.
+    A column whose totals are too large for that denominator is held in
+    thousandths instead.
+
+    Args:
+        table: (year_month, author) table of sums and counts, including
+            'article_count'.
+        window: Number of trailing months per window, ending at each month.
+
+    Returns:
+        Table indexed by (window label, author) with the windowed sums, keeping
+        only authors with articles in the window. Labels read "YYYY-MM" for
+        single months and "YYYY-MM..YYYY-MM" otherwise, and sort
+        chronologically.
+    """
+    dense, months, authors = dense_month_author(table)
+
+    # Sums times scale are recovered exactly from float64 only below 2**52;
+    # columns with larger totals fall back to thousandths
+    scale = table.attrs.get('credit_scale', CREDIT_SCALE)
+    totals = np.abs(dense).sum(axis=0).max(axis=0, initial=0)
+    scales = np.where(totals * scale < 2**52, scale, CREDIT_SCALE).astype(np.int64)
+    prefix = np.zeros((len(months) + 1,) + dense.shape[1:], dtype=np.int64)
+    np.cumsum(fixed_point(dense, scales), axis=0, out=prefix[1:])
+    ends = np.arange(len(months)) + 1
+    starts = np.maximum(ends - window, 0)
+    windowed = (prefix[ends] - prefix[starts]) / scales
+
+    labels = [
+        str(months[end - 1]) if end - start == 1 else f"{months[start]}..{months[end - 1]}"
+        for start, end in zip(starts, ends)
+    ]
+
+    count_col = list(table.columns).index('article_count')
+    month_pos, author_pos = np.nonzero(windowed[:, :, count_col] > 0)
+    index = pd.MultiIndex.from_arrays(
+        [np.asarray(labels, dtype=object)[month_pos], authors[author_pos]],
+        names=['year_month', 'author'],
+    )
+    result = pd.DataFrame(windowed[month_pos, author_pos, :], index=index, columns=table.columns)
+    for col in ('article_count', 'solo_articles', 'collab_articles'):
+        if col in result.columns:
+            result[col] = result[col].round().astype(np.int64)
+    return result
+
+
+def rolling_metrics(table, window, metric_keys):
+    """Windowed (label, author) table with ratio metrics derived from windowed sums."""
+    return finalize_metrics(rolling_totals(table, window), list(metric_keys))
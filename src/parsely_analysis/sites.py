@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""Leaderboards for several Parsely sites at once, one worker process per site."""
+
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+import click
+import contextlib
+import sys
+import time
+
+import pandas as pd
+
+from parsely_analysis.aggregates import AuthorMetrics
+from parsely_analysis.aliases import use_aliases
+from parsely_analysis.backends import (
+    BACKENDS, merge_partials, needed_columns, partial_file, partial_frame, resolve_backend,
+)
+from parsely_analysis.catalog import (
+    DEFAULT_CATALOG, export_files, parse_export_name, print_gaps, select_exports, update_catalog,
+)
+from parsely_analysis.journalist_metrics import format_top_journalists, top_journalists_table
+from parsely_analysis.merge import load_merged
+from parsely_analysis.metrics import METRIC_CATALOG, DEFAULT_METRICS, finalize_metrics, resolve_metrics
+from parsely_analysis.render import FORMATS, render_tables, write_lines
+
+
+def discover_exports(paths):
+    """Group export files (or the exports inside directories) by site.
+
+    Returns a dict of site -> sorted list of paths.
+    """
+    sites = defaultdict(list)
+    for path in export_files(paths):
+        info = parse_export_name(path)
+        if info is not None:
+            sites[info['site']].append(path)
+    return {site: sorted(site_paths) for site, site_paths in sorted(sites.items())}
+
+
+def catalog_exports(paths, catalog_file, start=None, end=None):
+    """Group the exports covering start..end by site, using the export catalog.
+
+    Exports with an up-to-date Arrow copy are read from the copy. Returns
+    a dict of site -> list of paths, like discover_exports.
+    """
+    start = pd.Timestamp(start) if start is not None else None
+    end = pd.Timestamp(end) if end is not None else None
+    sites = {}
+    for site, (chosen, gaps) in select_exports(update_catalog(paths, catalog_file), start, end).items():
+        print_gaps(site, gaps)
+        if chosen:
+            sites[site] = [Path(entry['artifact'] or entry['path']) for entry in chosen]
+    return sites
+
+
+def site_sums(paths, metric_keys, after_date=None, ignored_authors=(), backend='auto', aliases_file=None):
+    """Per-author sums and counts for one site, over all of its exports.
+
+    Runs in a worker process. Sums are returned as an identity-keyed
+    fixed-point partial (see backends.frame_partial), so results add up
+    exactly across sites and an author's display name is picked once, over
+    everything merged. Several exports are first merged row by row with
+    pandas (see merge.load_merged), so articles in overlapping export
+    windows are counted once, and the merged table is then aggregated with
+    the chosen backend.
+
+    Returns (partial, spellings, dropped): the partial, its author
+    spellings and the number of rows dropped as already counted in a finer
+    window.
+    """
+    use_aliases(aliases_file)
+    _, sums = resolve_metrics(metric_keys)
+    if len(paths) == 1:
+        return (*partial_file(paths[0], sums, after_date, ignored_authors, backend=backend), 0)
+    df, dropped = load_merged(paths, needed_columns(sums))
+    return (*partial_frame(df, sums, after_date, ignored_authors, backend=backend), dropped)
+
+
+def merge_sums(results, metric_keys):
+    """Per-author sums table of one or more site_sums results, merged by author identity."""
+    _, sums = resolve_metrics(metric_keys)
+    results = [(partial, spellings) for partial, spellings, _ in results if not partial.empty]
+    if not results:
+        return pd.DataFrame()
+    partials, spellings = zip(*results)
+    return merge_partials(list(partials), list(spellings), sums)
+
+
+def leaderboard_tables(sums, metric_keys, top_n, site):
+    """Top-journalist tables for one site's (or all sites') merged sums."""
+    table = finalize_metrics(sums.copy(), list(metric_keys))
+    metrics = AuthorMetrics.from_table(table)
+    tables = []
+    for metric_key in metric_keys:
+        ranking = top_journalists_table(metrics, metric_key, top_n)
+        ranking['meta'] = {'site': site, **ranking['meta']}
+        tables.append(ranking)
+    return tables
+
+
+@click.command()
+@click.argument('paths', nargs=-1, required=True, type=click.Path(exists=True))
+@click.option('--top-n', default=20, help='Number of top journalists to show per site (default: 20)')
+@click.option('--after-date', default=None, help='Only include articles published after this date (YYYY-MM-DD)')
+@click.option('--ignore-authors', '-i', multiple=True, help='Authors to ignore (can be specified multiple times)')
+@click.option('--metric', '-m', 'metric_keys', multiple=True, type=click.Choice(list(METRIC_CATALOG)),
+              help='Metric to rank by (can be specified multiple times, default: views, visitors, social_refs, new_visitors, engaged_minutes)')
+@click.option('--workers', type=click.IntRange(min=1), default=None,
+              help='Maximum number of sites processed at once (default: one per CPU)')
+@click.option('--backend', type=click.Choice(BACKENDS), default='auto',
+              help='Dataframe backend used inside each worker; a site with several exports is always read and '
+                   'merged with pandas, then aggregated with this backend')
+@click.option('--aliases', 'aliases_file', type=click.Path(exists=True), default=None,
+              help='JSON file mapping canonical author names to lists of their variants')
+@click.option('--output-format', type=click.Choice(FORMATS), default='text',
+              help='Format of the leaderboards; with markdown, csv or json other messages go to stderr')
+@click.option('--from', 'start', type=click.DateTime(['%Y-%m-%d']), default=None,
+              help='Use the fewest non-overlapping exports covering the period from this day (YYYY-MM-DD)')
+@click.option('--to', 'end', type=click.DateTime(['%Y-%m-%d']), default=None,
+              help='Use the fewest non-overlapping exports covering the period up to this day (YYYY-MM-DD)')
+@click.option('--catalog', 'catalog_file', type=click.Path(dir_okay=False), default=str(DEFAULT_CATALOG),
+              help='Export catalog used to resolve --from/--to (default: ~/.cache/parsely_analysis/catalog.sqlite)')
+def main(paths, top_n, after_date, ignore_authors, metric_keys, workers, backend, aliases_file, output_format, start,
+         end, catalog_file):
+    """Per-site and cross-site journalist leaderboards for several Parsely exports.
+
+    PATHS are export files or directories of exports; the site is read from
+    each filename (e.g. ...-indyweek-com.csv). With --from and/or --to,
+    directories are searched recursively and each site's exports are picked
+    from the export catalog instead of all being used.
+    """
+
+    metric_keys = list(metric_keys) or DEFAULT_METRICS
+    try:
+        backend = resolve_backend(backend)
+    except ImportError as e:
+        raise click.ClickException(str(e))
+
+    report_out = sys.stdout
+    if output_format != 'text':
+        # Keep stdout for the report document; progress messages go to stderr
+        click.get_current_context().with_resource(contextlib.redirect_stdout(sys.stderr))
+
+    if start is None and end is None:
+        sites = discover_exports(paths)
+    else:
+        sites = catalog_exports(paths, catalog_file, start, end)
+    if not sites:
+        raise click.ClickException("No Parsely exports found (expected names like posts-export-by-page-views-...-site-com.csv)")
+    for site, site_paths in sites.items():
+        print(f"{site}: {len(site_paths)} export(s)")
+
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {
+            site: pool.submit(site_sums, site_paths, metric_keys, after_date, tuple(ignore_authors), backend, aliases_file)
+            for site, site_paths in sites.items()
+        }
+        results = {site: future.result() for site, future in futures.items()}
+    print(f"Aggregated {len(sites)} site(s) in {time.perf_counter() - start:.1f}s")
+    for site, (_, _, dropped) in results.items():
+        if dropped:
+            print(f"{site}: skipped {dropped} rows already counted in a finer overlapping export")
+
+    tables = []
+    for site, result in results.items():
+        sums = merge_sums([result], metric_keys)
+        if sums.empty:
+            print(f"Warning: no articles found for {site}")
+            continue
+        tables.extend(leaderboard_tables(sums, metric_keys, top_n, site))
+    if len(results) > 1:
+        combined_sums = merge_sums(list(results.values()), metric_keys)
+        if not combined_sums.empty:
+            tables.extend(leaderboard_tables(combined_sums, metric_keys, top_n, 'all sites'))
+
+    if output_format != 'text':
+        report_out.write(render_tables(tables, output_format))
+        return
+
+    lines = []
+    current_site = None
+    for table in tables:
+        if table['meta']['site'] != current_site:
+            current_site = table['meta']['site']
+            lines.extend(["", "#" * 60, f"SITE: {current_site}", "#" * 60])
+        lines.extend(format_top_journalists(table))
+    write_lines(lines)
+
+
+if __name__ == '__main__':
+    main()
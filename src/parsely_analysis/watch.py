@@ -0,0 +1,315 @@
+#!/usr/bin/env python3
+"""Watch an export directory and keep monthly reports current incrementally."""
+
+from collections import defaultdict
+from pathlib import Path
+import click
+import json
+import time
+
+import pandas as pd
+
+from parsely_analysis.aliases import ALIASES, use_aliases
+from parsely_analysis.backends import (
+    BACKENDS, merge_partials, needed_columns, partial_file, partial_frame, resolve_backend,
+)
+from parsely_analysis.catalog import export_files, parse_export_name
+from parsely_analysis.merge import load_merged
+from parsely_analysis.metrics import METRIC_CATALOG, DEFAULT_METRICS, finalize_metrics
+from parsely_analysis.monthly_auth_rank import nest_monthly_table, print_all_rankings
+from parsely_analysis.rolling import window_sums
+
+
+def import_inotify():
+    """Import inotify_simple, an optional dependency; None when unavailable."""
+    try:
+        import inotify_simple
+    except ImportError:
+        return None
+    return inotify_simple
+
+
+# Bumped when the layout of stored partials changes, so older stores are rebuilt
+STORE_VERSION = 3
+
+
+def store_params(metric_keys, after_date, ignored_authors):
+    """Parameters the stored partial aggregates were built with."""
+    return {
+        'version': STORE_VERSION,
+        'sums': window_sums(metric_keys),
+        'after_date': after_date,
+        'ignored_authors': sorted(ignored_authors),
+        'aliases': dict(sorted(ALIASES.items())),
+    }
+
+
+def export_state(path):
+    """Identity of an export's current contents: modification time and size."""
+    stat = Path(path).stat()
+    return [stat.st_mtime_ns, stat.st_size]
+
+
+def load_store(store_dir, params):
+    """Load the manifest and partial aggregates of an aggregate store.
+
+    Returns (manifest, partials); both are empty when the store is missing
+    or was built with different parameters. Both are keyed by export group
+    (see export_groups), and partials maps each group to its (partial,
+    spellings) pair (see save_partial).
+    """
+    manifest_file = Path(store_dir) / 'manifest.json'
+    if not manifest_file.exists():
+        return {}, {}
+    stored = json.loads(manifest_file.read_text())
+    if stored.get('params') != params:
+        return {}, {}
+
+    manifest, partials = {}, {}
+    for name, entry in stored['exports'].items():
+        partial_file, spellings_file = Path(store_dir) / entry['partial'], Path(store_dir) / entry['spellings']
+        if not partial_file.exists() or not spellings_file.exists():
+            continue
+        flat = pd.read_parquet(partial_file)
+        flat['year_month'] = pd.PeriodIndex(flat['year_month'], freq='M')
+        manifest[name] = entry
+        partials[name] = (flat.set_index(['year_month', 'author', 'num_authors']), pd.read_parquet(spellings_file))
+    return manifest, partials
+
+
+def save_partial(store_dir, name, partial, spellings):
+    """Store one export group's partial aggregate and its author spellings.
+
+    The partial holds fixed-point sums and counts keyed by (year_month,
+    author identity, num_authors), as backends.frame_partial returns them,
+    so partials of different groups add up exactly. Returns the manifest
+    fields naming the files used.
+    """
+    stem = Path(name).stem
+    partial_dir = Path(store_dir) / 'partials'
+    partial_dir.mkdir(parents=True, exist_ok=True)
+    flat = partial.reset_index()
+    flat['year_month'] = flat['year_month'].astype(str)
+    flat['author'] = flat['author'].astype(str)
+    flat.to_parquet(partial_dir / f"{stem}.parquet", engine='pyarrow')
+    spellings.reset_index(drop=True).to_parquet(partial_dir / f"{stem}.spellings.parquet", engine='pyarrow')
+    return {'partial': f"partials/{stem}.parquet", 'spellings': f"partials/{stem}.spellings.parquet"}
+
+
+def save_manifest(store_dir, params, manifest):
+    """Write the store manifest after the partials it lists."""
+    Path(store_dir).mkdir(parents=True, exist_ok=True)
+    (Path(store_dir) / 'manifest.json').write_text(json.dumps({'params': params, 'exports': manifest}, indent=2))
+
+
+def months_of(table):
+    """Months present in a (year_month, author) table."""
+    if table.empty:
+        return set()
+    return set(table.index.get_level_values('year_month').unique())
+
+
+def export_groups(current):
+    """Exports of one site whose windows overlap, directly or through other exports.
+
+    Each group is aggregated as one merged table (see merge.load_merged),
+    so an article in several overlapping windows is counted once. Exports
+    whose filename has no date range are groups of their own.
+
+    Returns a dict of group name (its first export) -> sorted export names.
+    """
+    groups, by_site = [], defaultdict(list)
+    for name, path in current.items():
+        info = parse_export_name(path)
+        if info is None:
+            groups.append([name])
+        else:
+            by_site[info['site']].append((info['start'], info['end'], name))
+
+    for windows in by_site.values():
+        group, group_end = [], None
+        for start, end, name in sorted(windows):
+            if group and start > group_end:
+                groups.append(group)
+                group, group_end = [], None
+            group.append(name)
+            group_end = end if group_end is None else max(group_end, end)
+        groups.append(group)
+    return {names[0]: names for names in sorted(sorted(group) for group in groups)}
+
+
+def aggregate_group(paths, params, ignored_authors, backend):
+    """Partial aggregate and spellings of one export group, merging overlapping exports row by row."""
+    sums = params['sums']
+    if len(paths) == 1:
+        return partial_file(paths[0], sums, params['after_date'], ignored_authors, by_month=True, backend=backend)
+    df, dropped = load_merged(paths, needed_columns(sums))
+    if dropped:
+        print(f"Skipped {dropped} rows already counted in a finer overlapping export")
+    return partial_frame(df, sums, params['after_date'], ignored_authors, by_month=True, backend=backend)
+
+
+def sync_store(directory, store_dir, params, manifest, partials, ignored_authors, backend):
+    """Ingest new or modified exports and drop removed ones.
+
+    Exports are stored by group (see export_groups), and only groups with
+    a new, changed or removed export are aggregated again. Updates
+    manifest and partials in place, saves the manifest whenever it changed
+    and returns the set of months whose totals changed.
+    """
+    current = {path.name: path for path in export_files([directory])}
+    states = {name: export_state(path) for name, path in current.items()}
+    groups = export_groups(current)
+    known = {name: state for entry in manifest.values() for name, state in entry['exports'].items()}
+    affected = set()
+    changed = False
+
+    for name in [n for n in known if n not in current]:
+        print(f"Removed: {name}")
+    for name, state in states.items():
+        if known.get(name) != state:
+            print(f"{'Updated' if name in known else 'New'}: {name}")
+
+    # Stale groups go first, so a regrouped export's files can be reused by its new group
+    for group in list(manifest):
+        if group in groups and manifest[group]['exports'] == {name: states[name] for name in groups[group]}:
+            continue
+        affected |= months_of(partials.pop(group)[0])
+        entry = manifest.pop(group)
+        for stored in (entry['partial'], entry['spellings']):
+            (Path(store_dir) / stored).unlink(missing_ok=True)
+        changed = True
+
+    for group, names in groups.items():
+        if group in manifest:
+            continue
+        partial, spellings = aggregate_group([current[name] for name in names], params, ignored_authors, backend)
+        affected |= months_of(partial)
+        partials[group] = (partial, spellings)
+        manifest[group] = {
+            'exports': {name: states[name] for name in names},
+            **save_partial(store_dir, group, partial, spellings),
+        }
+        changed = True
+
+    if changed:
+        save_manifest(store_dir, params, manifest)
+    return affected
+
+
+def missing_reports(partials, reports_dir):
+    """Months with stored data but no report in reports_dir."""
+    months = set().union(*(months_of(partial) for partial, _ in partials.values()))
+    return {month for month in months if not (Path(reports_dir) / f"{month}.txt").exists()}
+
+
+def merged_months(partials, months, sums):
+    """(year_month, author) sums of the given months over every stored export group.
+
+    Partials are added up by author identity, and identities resolved to
+    display names once, from the spellings of every stored group.
+    """
+    parts = []
+    for partial, _ in partials.values():
+        if partial.empty:
+            continue
+        in_months = partial.index.get_level_values('year_month').isin(list(months))
+        if in_months.any():
+            parts.append(partial[in_months])
+    if not parts:
+        return pd.DataFrame()
+    spellings = [spellings for _, spellings in partials.values()]
+    return merge_partials(parts, spellings, sums).sort_index()
+
+
+def write_month_reports(partials, months, reports_dir, metric_keys, top_n, format):
+    """Rewrite the report of each given month; months with no data lose their report."""
+    reports_dir = Path(reports_dir)
+    reports_dir.mkdir(parents=True, exist_ok=True)
+    table = merged_months(partials, months, window_sums(metric_keys))
+    monthly_metrics = nest_monthly_table(finalize_metrics(table, list(metric_keys))) if not table.empty else {}
+
+    for month in sorted(months):
+        report = reports_dir / f"{month}.txt"
+        if month not in monthly_metrics:
+            report.unlink(missing_ok=True)
+            continue
+        with open(report, 'w') as out:
+            print_all_rankings(monthly_metrics.select([month]), metric_keys, format, top_n, out=out)
+        print(f"Wrote {report}")
+
+
+def wait_for_change(directory, interval, inotify=None):
+    """Block until the directory may have changed.
+
+    With inotify, wakes on file events (checking at least every interval
+    seconds); otherwise sleeps for interval seconds and the caller rescans.
+    """
+    if inotify is None:
+        time.sleep(interval)
+        return
+    inotify.read(timeout=int(interval * 1000), read_delay=500)
+
+
+@click.command()
+@click.argument('directory', type=click.Path(exists=True, file_okay=False))
+@click.option('--store', 'store_dir', required=True, help='Directory for the incremental aggregate store')
+@click.option('--reports', 'reports_dir', required=True, help='Directory the per-month reports are written to')
+@click.option('--top-n', default=5, help='Number of top journalists to show per month (default: 5)')
+@click.option('--after-date', default=None, help='Only include articles published after this date (YYYY-MM-DD)')
+@click.option('--ignore-authors', '-i', multiple=True, help='Authors to ignore (can be specified multiple times)')
+@click.option('--format', type=click.Choice(['verbose', 'compact']), default='verbose', help='Report format style')
+@click.option('--metric', '-m', 'metric_keys', multiple=True, type=click.Choice(list(METRIC_CATALOG)),
+              help='Metric to rank by (can be specified multiple times, default: views, visitors, social_refs, new_visitors, engaged_minutes)')
+@click.option('--backend', type=click.Choice(BACKENDS), default='auto',
+              help='Dataframe backend used to aggregate each new export')
+@click.option('--aliases', 'aliases_file', type=click.Path(exists=True), default=None,
+              help='JSON file mapping canonical author names to lists of their variants')
+@click.option('--interval', type=float, default=5.0, help='Seconds between directory scans when polling (default: 5)')
+@click.option('--once', is_flag=True, help='Ingest changes and update reports once, then exit')
+def main(directory, store_dir, reports_dir, top_n, after_date, ignore_authors, format, metric_keys, backend,
+         aliases_file, interval, once):
+    """Keep monthly reports for an export directory up to date.
+
+    Each new or modified export is aggregated once into the store, and only
+    the months it touches have their reports rewritten.
+    """
+
+    metric_keys = list(metric_keys) or DEFAULT_METRICS
+    use_aliases(aliases_file)
+    try:
+        backend = resolve_backend(backend)
+    except ImportError as e:
+        raise click.ClickException(str(e))
+
+    params = store_params(metric_keys, after_date, ignore_authors)
+    manifest, partials = load_store(store_dir, params)
+    if manifest:
+        exports = sum(len(entry['exports']) for entry in manifest.values())
+        print(f"Loaded stored aggregates of {exports} export(s) from: {store_dir}")
+
+    inotify = None
+    if not once:
+        inotify_simple = import_inotify()
+        if inotify_simple is not None:
+            inotify = inotify_simple.INotify()
+            flags = inotify_simple.flags
+            inotify.add_watch(directory, flags.CLOSE_WRITE | flags.MOVED_TO | flags.MOVED_FROM | flags.DELETE)
+            print(f"Watching {directory} (inotify)")
+        else:
+            print(f"Watching {directory} (polling every {interval:g}s)")
+
+    while True:
+        start = time.perf_counter()
+        affected = sync_store(directory, store_dir, params, manifest, partials, set(ignore_authors), backend)
+        months = affected | missing_reports(partials, reports_dir)
+        if months:
+            write_month_reports(partials, months, reports_dir, metric_keys, top_n, format)
+            print(f"Updated {len(months)} month(s) in {time.perf_counter() - start:.1f}s")
+        if once:
+            break
+        wait_for_change(directory, interval, inotify)
+
+
+if __name__ == '__main__':
+    main()
@@ -43,11 +43,17 @@ with rankings across multiple metrics.
 import pandas as pd
 import numpy as np
 import click
+import contextlib
+import json
 from pathlib import Path
 from datetime import datetime
+import sys
 import warnings
 from tqdm import tqdm
 
+from parsely_analysis.render import FORMATS, ranking_table, render_tables, write_lines
+from parsely_analysis.watch import export_state, save_manifest
+
 warnings.filterwarnings('ignore')
 
 # Define metrics to analyze
@@ -103,10 +109,72 @@ def parse_date_range_from_filename(filename):
     return None, None
 
 
-def load_csv_files(directory):
-    """Load all CSV files from a directory."""
+# Columns read from each export, to save memory
+NEEDED_COLS = ['URL', 'Title', 'Publish date', 'Authors', 'Section', 'Tags',
+               'Visitors', 'Views', 'Engaged minutes', 'New vis.', 'Social refs']
+
+
+def read_export(csv_file):
+    """Read the needed columns of one export."""
+    try:
+        return pd.read_csv(csv_file, usecols=lambda x: x in NEEDED_COLS)
+    except ValueError:
+        # If column selection fails, read all columns and keep the needed ones
+        df = pd.read_csv(csv_file)
+        return df[[col for col in df.columns if col in NEEDED_COLS]]
+
+
+def load_stored_exports(csv_files, store_dir):
+    """Rows of each export, parsing only exports that are new or changed since the store was written.
+
+    Exports are kept in store_dir as Parquet and listed in a manifest keyed by
+    the file's modification time and size, as in the watch aggregate store;
+    exports no longer in the directory are dropped from it.
+    """
+    store_dir = Path(store_dir)
+    manifest_file = store_dir / 'manifest.json'
+    params = {'columns': NEEDED_COLS}
+    manifest = {}
+    if manifest_file.exists():
+        stored = json.loads(manifest_file.read_text())
+        if stored.get('params') == params:
+            manifest = stored['exports']
+
+    current = {csv_file.name for csv_file in csv_files}
+    changed = False
+    for name in [n for n in manifest if n not in current]:
+        (store_dir / manifest.pop(name)['partial']).unlink(missing_ok=True)
+        changed = True
+
+    frames = {}
+    for csv_file in csv_files:
+        state = export_state(csv_file)
+        entry = manifest.get(csv_file.name)
+        if entry and entry['state'] == state and (store_dir / entry['partial']).exists():
+            frames[csv_file.name] = pd.read_parquet(store_dir / entry['partial'])
+            continue
+        df = read_export(csv_file)
+        partial = f"exports/{csv_file.stem}.parquet"
+        (store_dir / 'exports').mkdir(parents=True, exist_ok=True)
+        df.to_parquet(store_dir / partial, engine='pyarrow')
+        manifest[csv_file.name] = {'state': state, 'partial': partial}
+        frames[csv_file.name] = df
+        changed = True
+
+    if changed:
+        save_manifest(store_dir, params, manifest)
+    return frames
+
+
+def load_csv_files(directory, store_dir=None):
+    """Load all CSV files from a directory.
+
+    With store_dir, exports are read through an incremental store there (see
+    load_stored_exports), so only new or modified exports are parsed.
+    """
     path = Path(directory)
     csv_files = list(path.glob('*.csv'))
+    stored = load_stored_exports(csv_files, store_dir) if store_dir else {}
     
     dataframes = []
     file_metadata = []
@@ -120,15 +188,7 @@ def load_csv_files(directory):
             'created': creation_time.strftime('%Y-%m-%d %H:%M:%S')
         })
         
-        # Read only the columns we need to save memory
-        needed_cols = ['URL', 'Title', 'Publish date', 'Authors', 'Section', 'Tags',
-                      'Visitors', 'Views', 'Engaged minutes', 'New vis.', 'Social refs']
-        
-        try:
-            df = pd.read_csv(csv_file, usecols=lambda x: x in needed_cols)
-        except:
-            # If column selection fails, read all columns
-            df = pd.read_csv(csv_file)
+        df = stored[csv_file.name] if store_dir else read_export(csv_file)
         
         df['source_file'] = csv_file.name
         
@@ -255,16 +315,93 @@ def format_number(num):
     return f"{int(num):,}" if pd.notna(num) else "0"
 
 
-def print_date_range_report(df, top_n, metrics, ignore_authors, file_metadata):
-    """Print report for date range data."""
-    # Print file metadata
-    print("=" * 62)
-    print("INPUT FILES")
-    print("=" * 62)
+def input_files_lines(file_metadata):
+    """Lines listing the input files and when they were written."""
+    lines = ["=" * 62, "INPUT FILES", "=" * 62]
     for file_info in file_metadata:
-        print(f"File: {file_info['filename']}")
-        print(f"Created: {file_info['created']}")
-    print()
+        lines.append(f"File: {file_info['filename']}")
+        lines.append(f"Created: {file_info['created']}")
+    lines.append("")
+    return lines
+
+
+def top_table(stats, metric, top_n, meta=None):
+    """Ranking table of the top_n authors of stats by one metric, with their article counts."""
+    display_name = METRIC_DISPLAY_NAMES[metric]
+    top_df = stats.sort_values(metric, ascending=False).head(top_n)
+    articles = 'publications' if metric == 'publications' else 'num_articles'
+
+    # Percentage difference between 1st and 2nd
+    notes = []
+    if len(top_df) >= 2:
+        first_val = top_df.iloc[0][metric]
+        second_val = top_df.iloc[1][metric]
+        if second_val > 0:
+            notes.append(f"1st vs 2nd: +{int((first_val - second_val) / second_val * 100)}%")
+
+    meta = {'metric': metric, **(meta or {})}
+    title = f"TOP {top_n} JOURNALISTS BY {display_name}"
+    if 'month' in meta:
+        title = f"{meta['month']}: {title}"
+    rows = zip(range(1, len(top_df) + 1), top_df['Author'], top_df[metric], top_df[articles])
+    return ranking_table(title, ['Rank', 'Journalist', 'Value', 'Articles'], rows, meta=meta, notes=notes,
+                         formats={'Value': format_number})
+
+
+def format_date_range_table(table, top_n):
+    """Text lines of one date range ranking."""
+    display_name = METRIC_DISPLAY_NAMES[table['meta']['metric']]
+    pct_diff = table['notes'][0] if table['notes'] else ""
+    lines = [
+        "=" * 62,
+        f"TOP {top_n} JOURNALISTS BY {display_name:<30}{pct_diff:>20}",
+        "=" * 62,
+        f"{'Rank':<6}{'Journalist':<30}{display_name:<18}",
+        "-" * 62,
+    ]
+    for rank, author, value, _ in table['rows']:
+        lines.append(f"{rank:<6}{author:<30}{format_number(value):<18}")
+    lines.append("")
+    return lines
+
+
+def format_monthly_tables(month_tables, metric):
+    """Text lines of one metric's monthly rankings: #1 counts, then a line per month."""
+    lines = [
+        "=" * 62,
+        f"MONTHLY RANKINGS: {METRIC_DISPLAY_NAMES[metric]}",
+        "=" * 62,
+        "",
+    ]
+
+    # Track wins per journalist (using first name only)
+    wins = {}
+    for table in month_tables:
+        winner_first = table['rows'][0][1].split()[0]
+        wins[winner_first] = wins.get(winner_first, 0) + 1
+
+    lines.append("Months as #1 ranked:")
+    for author, count in sorted(wins.items(), key=lambda x: x[1], reverse=True):
+        lines.append(f"{author:<8}{count}")
+    lines.append("")
+
+    # Month lines use first names only
+    for table in month_tables:
+        authors = ', '.join(row[1].split()[0] for row in table['rows'])
+        values = ', '.join(format_number(row[2]) for row in table['rows'])
+        articles = ', '.join(str(row[3]) for row in table['rows'])
+        lines.append(f"{table['meta']['month']}  {authors} - {values} - {articles}")
+    lines.append("")
+    return lines
+
+
+def print_date_range_report(df, top_n, metrics, ignore_authors, file_metadata, tables=None):
+    """Print report for date range data.
+
+    With a tables list, the rankings are appended to it for a
+    markdown/csv/json report instead of being printed.
+    """
+    print("\n".join(input_files_lines(file_metadata)))
     
     # Process data
     processed_df = process_data(df, ignore_authors)
@@ -286,45 +423,22 @@ def print_date_range_report(df, top_n, metrics, ignore_authors, file_metadata):
     # Aggregate by author with date range for publications
     author_stats = aggregate_by_author(processed_df, metrics, start_date, end_date)
     
-    # Print top journalists for each metric
-    for metric, col_name in metrics.items():
-        # Sort by metric
-        sorted_df = author_stats.sort_values(metric, ascending=False).head(top_n)
-        
-        if not sorted_df.empty:
-            # Calculate percentage difference between 1st and 2nd
-            pct_diff = ""
-            if len(sorted_df) >= 2:
-                first_val = sorted_df.iloc[0][metric]
-                second_val = sorted_df.iloc[1][metric]
-                if second_val > 0:
-                    pct = int((first_val - second_val) / second_val * 100)
-                    pct_diff = f"1st vs 2nd: +{pct}%"
-            
-            display_name = METRIC_DISPLAY_NAMES[metric]
-            print("=" * 62)
-            print(f"TOP {top_n} JOURNALISTS BY {display_name:<30}{pct_diff:>20}")
-            print("=" * 62)
-            print(f"{'Rank':<6}{'Journalist':<30}{display_name:<18}")
-            print("-" * 62)
-            
-            for i, row in sorted_df.iterrows():
-                rank = sorted_df.index.get_loc(i) + 1
-                print(f"{rank:<6}{row['Author']:<30}{format_number(row[metric]):<18}")
-            
-            print()
+    # Rank every metric once, then write the report in one go
+    range_tables = [top_table(author_stats, metric, top_n) for metric in metrics]
+    range_tables = [table for table in range_tables if table['rows']]
+    if tables is not None:
+        tables.extend(range_tables)
+        return
+    write_lines([line for table in range_tables for line in format_date_range_table(table, top_n)])
 
 
-def print_monthly_report(df, top_n, metrics, ignore_authors, file_metadata):
-    """Print report for monthly data."""
-    # Print file metadata
-    print("=" * 62)
-    print("INPUT FILES")
-    print("=" * 62)
-    for file_info in file_metadata:
-        print(f"File: {file_info['filename']}")
-        print(f"Created: {file_info['created']}")
-    print()
+def print_monthly_report(df, top_n, metrics, ignore_authors, file_metadata, tables=None):
+    """Print report for monthly data.
+
+    With a tables list, the rankings are appended to it for a
+    markdown/csv/json report instead of being printed.
+    """
+    print("\n".join(input_files_lines(file_metadata)))
     
     # Process data
     processed_df = process_data(df, ignore_authors)
@@ -336,68 +450,26 @@ def print_monthly_report(df, top_n, metrics, ignore_authors, file_metadata):
     # Group by month
     processed_df['Year-Month'] = processed_df['report_date'].dt.strftime('%Y-%m')
     
-    monthly_results = {}
-    
-    # Process each metric
-    for metric, col_name in metrics.items():
-        display_name = METRIC_DISPLAY_NAMES[metric]
-        print("=" * 62)
-        print(f"MONTHLY RANKINGS: {display_name}")
-        print("=" * 62)
-        print()
-        
-        # Track wins per journalist
-        wins = {}
-        monthly_data = []
-        
-        # Process each month
-        for year_month in sorted(processed_df['Year-Month'].unique()):
-            month_df = processed_df[processed_df['Year-Month'] == year_month]
-            
-            # Get date range from file data for this month
-            month_start = None
-            month_end = None
-            if 'file_start_date' in month_df.columns and 'file_end_date' in month_df.columns:
-                month_start = month_df['file_start_date'].iloc[0]
-                month_end = month_df['file_end_date'].iloc[0]
-            
-            # Aggregate by author for this month with proper date range
-            month_stats = aggregate_by_author(month_df, metrics, month_start, month_end)
-            
-            # Get top N for this metric
-            top_df = month_stats.sort_values(metric, ascending=False).head(top_n)
-            
-            if not top_df.empty:
-                # Track winner (using first name only)
-                winner_full = top_df.iloc[0]['Author']
-                winner_first = winner_full.split()[0]
-                wins[winner_first] = wins.get(winner_first, 0) + 1
-                
-                # Format month data - use first names only
-                month_label = datetime.strptime(year_month, '%Y-%m').strftime('%Y-%m')
-                authors = ', '.join([name.split()[0] for name in top_df['Author'].tolist()])
-                values = ', '.join([format_number(val) for val in top_df[metric]])
-                
-                # For publications metric, show publications count; for others show num_articles
-                if metric == 'publications':
-                    articles = ', '.join([str(val) for val in top_df['publications']])
-                else:
-                    articles = ', '.join([str(val) for val in top_df['num_articles']])
-                
-                monthly_data.append(f"{month_label}  {authors} - {values} - {articles}")
-        
-        # Print wins summary
-        print("Months as #1 ranked:")
-        for author, count in sorted(wins.items(), key=lambda x: x[1], reverse=True):
-            print(f"{author:<8}{count}")
-        
-        print()
-        
-        # Print monthly details
-        for line in monthly_data:
-            print(line)
-        
-        print()
+    # Aggregate each month once, with the date range of its file for publications
+    month_stats = {}
+    for year_month, month_df in processed_df.groupby('Year-Month', sort=True):
+        month_start = None
+        month_end = None
+        if 'file_start_date' in month_df.columns and 'file_end_date' in month_df.columns:
+            month_start = month_df['file_start_date'].iloc[0]
+            month_end = month_df['file_end_date'].iloc[0]
+        month_stats[year_month] = aggregate_by_author(month_df, metrics, month_start, month_end)
+    
+    lines = []
+    for metric in metrics:
+        month_tables = [top_table(stats, metric, top_n, {'month': year_month}) for year_month, stats in month_stats.items()]
+        month_tables = [table for table in month_tables if table['rows']]
+        if tables is not None:
+            tables.extend(month_tables)
+        else:
+            lines.extend(format_monthly_tables(month_tables, metric))
+    if tables is None:
+        write_lines(lines)
 
 
 @click.command()
@@ -406,24 +478,38 @@ def print_monthly_report(df, top_n, metrics, ignore_authors, file_metadata):
 @click.option('--top-n-range', default=6, type=int, help='Number of top journalists to show for date range')
 @click.option('--top-n-monthly', default=3, type=int, help='Number of top journalists to show per month')
 @click.option('--ignore-authors', multiple=True, help='Authors to ignore in analysis')
-def main(monthly_datadir, range_datadir, top_n_range, top_n_monthly, ignore_authors):
+@click.option('--store', 'store_dir', type=click.Path(), default=None,
+              help='Keep parsed exports here and re-read only new or modified CSVs on later runs')
+@click.option('--output-format', type=click.Choice(FORMATS), default='text',
+              help='Report format: text (default), markdown, csv or json; non-text reports go to stdout, progress to stderr')
+def main(monthly_datadir, range_datadir, top_n_range, top_n_monthly, ignore_authors, store_dir, output_format):
     """Generate journalist performance reports from Parse.ly data."""
     
     ignore_authors_set = set(ignore_authors)
     
+    # Text is written report by report; other formats collect every table into one document
+    report_out = sys.stdout
+    tables = None
+    if output_format != 'text':
+        tables = []
+        click.get_current_context().with_resource(contextlib.redirect_stdout(sys.stderr))
+    
     # Process date range data
     if range_datadir:
         print("Loading date range data...")
-        range_df, range_metadata = load_csv_files(range_datadir)
+        range_df, range_metadata = load_csv_files(range_datadir, store_dir and Path(store_dir) / 'range')
         if not range_df.empty:
-            print_date_range_report(range_df, top_n_range, METRICS, ignore_authors_set, range_metadata)
+            print_date_range_report(range_df, top_n_range, METRICS, ignore_authors_set, range_metadata, tables)
     
     # Process monthly data
     if monthly_datadir:
         print("\nLoading monthly data...")
-        monthly_df, monthly_metadata = load_csv_files(monthly_datadir)
+        monthly_df, monthly_metadata = load_csv_files(monthly_datadir, store_dir and Path(store_dir) / 'monthly')
         if not monthly_df.empty:
-            print_monthly_report(monthly_df, top_n_monthly, METRICS, ignore_authors_set, monthly_metadata)
+            print_monthly_report(monthly_df, top_n_monthly, METRICS, ignore_authors_set, monthly_metadata, tables)
+    
+    if tables is not None:
+        report_out.write(render_tables(tables, output_format))
 
 
 if __name__ == '__main__':
@@ -0,0 +1,99 @@
+"""Author aliases must merge variants, be ignorable by any variant and never credit one author twice."""
+
+import json
+
+import pandas as pd
+import pytest
+
+from parsely_analysis.aliases import AuthorIdentities, short_names, use_aliases
+from parsely_analysis.backends import aggregate_file, polars_available
+
+METRICS = ['views', 'solo_articles', 'collab_articles']
+
+BACKENDS = [
+    ('pandas', 1),
+    ('pandas', 2),
+    pytest.param('polars', 1, marks=pytest.mark.skipif(not polars_available(), reason='polars not installed')),
+]
+
+
+@pytest.fixture
+def export(tmp_path):
+    """Four articles by variants of INDY staff, one of them bylined under two variants."""
+    pd.DataFrame({
+        'URL': [f'https://example.com/{i}' for i in range(5)],
+        'Publish date': '2025-01-01 10:00:00',
+        'Authors': ['Staff', 'INDY staff', 'Staff, INDY staff', 'indy  STAFF, Lena Geller', 'Lena Geller'],
+        'Views': [10, 20, 40, 80, 160],
+    }).to_csv(tmp_path / 'export.csv', index=False)
+    aliases = tmp_path / 'aliases.json'
+    aliases.write_text(json.dumps({'INDY staff': ['Staff']}))
+    use_aliases(aliases)
+    yield str(tmp_path / 'export.csv')
+    use_aliases(None)
+
+
+@pytest.mark.parametrize('backend, workers', BACKENDS)
+def test_variants_merge_and_repeated_bylines_count_once(export, backend, workers):
+    table = aggregate_file(export, METRICS, backend=backend, workers=workers)
+    table.index = table.index.astype(str)
+    staff = table.loc['INDY staff']
+    assert staff['views'] == 10 + 20 + 40 + 40
+    assert staff['article_count'] == 4
+    assert (staff['solo_articles'], staff['collab_articles']) == (3, 1)
+    assert table.loc['Lena Geller', 'views'] == 40 + 160
+
+
+@pytest.mark.parametrize('backend, workers', BACKENDS)
+def test_ignoring_a_variant_ignores_the_author(export, backend, workers):
+    table = aggregate_file(export, METRICS, ignored_authors=('Staff',), backend=backend, workers=workers)
+    table.index = table.index.astype(str)
+    assert list(table.index) == ['Lena Geller']
+    assert table.loc['Lena Geller', 'views'] == 80 + 160
+    assert table.loc['Lena Geller', 'solo_articles'] == 2
+
+
+def test_query_uses_identities(export):
+    pytest.importorskip('duckdb')
+    from parsely_analysis.query import connect, rank_authors
+
+    con = connect(export)
+    ranking = rank_authors(con, ['views', 'article_count', 'collab_articles'], top_n=None).set_index('author')
+    assert ranking.loc['INDY staff', 'views'] == 10 + 20 + 40 + 40
+    assert ranking.loc['INDY staff', 'article_count'] == 4
+    assert ranking.loc['INDY staff', 'collab_articles'] == 1
+
+    ranking = rank_authors(con, ['views'], top_n=None, ignored_authors=['Staff']).set_index('author')
+    assert list(ranking.index) == ['Lena Geller']
+    assert ranking.loc['Lena Geller', 'views'] == 80 + 160
+
+
+
+def test_short_names_never_collide():
+    names = short_names(['Sarah Edwards', 'Sarah Willets', 'Lena Geller', 'Jane Porter', 'Jane Poole', 'Staff'])
+    assert names == {'Sarah Edwards': 'Sarah E.', 'Sarah Willets': 'Sarah W.', 'Lena Geller': 'Lena',
+                     'Jane Porter': 'Jane Porter', 'Jane Poole': 'Jane Poole', 'Staff': 'Staff'}
+
+
+def test_identities_key_spellings_and_label_short_names():
+    identities = AuthorIdentities(ignored=['staff'])
+    keys = [identities.key(name) for name in ['Sarah Edwards', 'sarah  edwards', 'Sarah Willets', 'Staff']]
+    assert keys == ['sarah edwards', 'sarah edwards', 'sarah willets', None]
+    assert identities.label({'sarah edwards': 2, 'sarah willets': 1}) == {'Sarah E.': 2, 'Sarah W.': 1}
+
+
+def test_sites_merge_by_identity_and_name_authors_once(tmp_path):
+    from parsely_analysis.sites import merge_sums, site_sums
+
+    paths = []
+    for site, bylines, views in [('a-com', ['lena geller', 'lena geller'], [0.1, 0.2]),
+                                 ('b-com', ['Lena Geller, Jane Porter', 'Lena Geller'], [0.3, 0.4])]:
+        path = tmp_path / f'posts-export-by-page-views-Jan-01-2025-Jan-31-2025-{site}.csv'
+        pd.DataFrame({'URL': [f'https://{site}/{i}' for i in range(2)], 'Publish date': '2025-01-01 10:00:00',
+                      'Authors': bylines, 'Views': views}).to_csv(path, index=False)
+        paths.append(site_sums([str(path)], ['views'], backend='pandas'))
+
+    table = merge_sums(paths, ['views'])
+    assert list(table.index) == ['Lena Geller', 'Jane Porter']
+    assert table.loc['Lena Geller', 'views'] == (1000 + 2000 + 1500 + 4000) / 10000
+    assert table.loc['Lena Geller', 'article_count'] == 4
@@ -0,0 +1,94 @@
+"""The pandas and polars backends must produce the same per-author tables."""
+
+import numpy as np
+import pandas as pd
+import pytest
+from click.testing import CliRunner
+
+from parsely_analysis import journalist_metrics, monthly_auth_rank
+from parsely_analysis.backends import aggregate_file, aggregate_frame, compare_tables, date_summary, needed_columns
+from parsely_analysis.loader import load_export
+from parsely_analysis.metrics import DEFAULT_METRICS
+
+pytest.importorskip('polars')
+
+METRICS = list(DEFAULT_METRICS) + ['solo_articles', 'collab_articles', 'avg_minutes_per_view']
+AUTHORS = ['Lisa Sorg', 'Jane Porter', 'Staff', 'Sarah Edwards', 'lisa sorg', 'Geoff West']
+
+
+@pytest.fixture(scope='module')
+def export(tmp_path_factory):
+    """A CSV export whose metric columns switch from integers to floats past schema inference."""
+    rng = np.random.default_rng(7)
+    n = 12000
+    authors = [
+        ', '.join(rng.choice(AUTHORS, size=rng.integers(1, 4), replace=False)) if i % 50 else ''
+        for i in range(n)
+    ]
+    dates = pd.Timestamp('2024-01-01') + pd.to_timedelta(rng.integers(0, 540, size=n), unit='D')
+    dates = dates.strftime('%Y-%m-%d %H:%M:%S').to_numpy(dtype=object)
+    dates[5::97] = 'not a date'
+    views = rng.integers(0, 5000, size=n).astype(object)
+    views[11000] = 3.5
+    views[11500] = 12.25
+    minutes = rng.integers(0, 900, size=n).astype(object)
+    minutes[10500:] = np.round(rng.random(n - 10500) * 100, 3)
+    df = pd.DataFrame({
+        'URL': [f'https://example.com/{i}' for i in range(n)],
+        'Title': [f'Article {i}' for i in range(n)],
+        'Publish date': dates,
+        'Authors': authors,
+        'Section': rng.choice(['News', 'Arts', 'Food'], size=n),
+        'Tags': rng.choice(['a', 'b,c', ''], size=n),
+        'Visitors': rng.integers(0, 4000, size=n),
+        'Views': views,
+        'Engaged minutes': minutes,
+        'New vis.': rng.integers(0, 3000, size=n),
+        'Social refs': rng.integers(0, 100, size=n),
+    })
+    path = tmp_path_factory.mktemp('export') / 'export.csv'
+    df.to_csv(path, index=False)
+    return str(path)
+
+
+@pytest.mark.parametrize('by_month', [False, True])
+@pytest.mark.parametrize('after_date', [None, '2024-09-01'])
+@pytest.mark.parametrize('ignored_authors', [(), ('Staff',)])
+def test_backends_agree(export, by_month, after_date, ignored_authors):
+    pandas_table = aggregate_file(export, METRICS, after_date, ignored_authors, by_month, backend='pandas')
+    polars_table = aggregate_file(export, METRICS, after_date, ignored_authors, by_month, backend='polars')
+    assert len(pandas_table) > 0
+    assert list(polars_table.columns) == list(pandas_table.columns)
+    assert compare_tables(pandas_table, polars_table) == 0.0
+
+
+@pytest.mark.parametrize('by_month', [False, True])
+def test_loaded_frame_backends_agree(export, by_month):
+    df = load_export(export, columns=needed_columns(METRICS))
+    pandas_table = aggregate_frame(df.copy(), METRICS, '2024-09-01', ('Staff',), by_month, backend='pandas')
+    polars_table = aggregate_frame(df.copy(), METRICS, '2024-09-01', ('Staff',), by_month, backend='polars')
+    assert list(polars_table.columns) == list(pandas_table.columns)
+    assert compare_tables(pandas_table, polars_table) == 0.0
+
+
+@pytest.mark.parametrize('after_date', [None, '2024-09-01'])
+def test_date_summaries_agree(export, after_date):
+    assert date_summary(export, after_date, 'polars') == date_summary(export, after_date, 'pandas')
+
+
+@pytest.mark.parametrize('cli', [journalist_metrics.main, monthly_auth_rank.main])
+@pytest.mark.parametrize('backend', ['pandas', 'polars'])
+def test_invalid_after_date(export, cli, backend):
+    result = CliRunner().invoke(cli, [export, '--backend', backend, '--after-date', '2025-13-45', '--no-cache'])
+    assert result.exception is None
+    assert "Error parsing date filter '2025-13-45'" in result.output
+
+
+@pytest.mark.parametrize('cli', [journalist_metrics.main, monthly_auth_rank.main])
+def test_load_diagnostics_agree(export, cli):
+    outputs = {}
+    for backend in ('pandas', 'polars'):
+        result = CliRunner().invoke(cli, [export, '--backend', backend, '--after-date', '2024-09-01', '--no-cache'])
+        assert result.exception is None
+        outputs[backend] = [line for line in result.output.splitlines() if not line.startswith('Loading data from')]
+    assert outputs['pandas'] == outputs['polars']
@@ -0,0 +1,78 @@
+"""Bootstrap rank stability must be reproducible from a seed and centred on the observed rankings."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from parsely_analysis import bootstrap
+from parsely_analysis.bootstrap import bootstrap_rankings, bootstrap_table, format_bootstrap, resample_counts
+from parsely_analysis.metrics import aggregate_metrics
+
+METRICS = ['views', 'avg_views']
+
+
+@pytest.fixture(scope='module')
+def articles():
+    """Articles by one clear leader and a pack of close followers."""
+    rng = np.random.default_rng(17)
+    n = 400
+    authors = rng.choice(['Jane Porter', 'Lisa Sorg', 'Geoff West', 'Sarah Edwards'], size=n)
+    authors[::4] = 'Lena Geller'
+    authors[1::9] = 'Lena Geller, Jane Porter'
+    views = rng.integers(100, 200, size=n)
+    views[::4] *= 10
+    return pd.DataFrame({
+        'URL': [f'https://example.com/{i}' for i in range(n)],
+        'Publish date': '2025-01-01 10:00:00',
+        'Authors': authors,
+        'Visitors': rng.integers(50, 100, size=n),
+        'Views': views,
+    })
+
+
+def test_same_seed_same_intervals(articles):
+    first = bootstrap_rankings(articles, METRICS, 50, 3, seed=1)
+    second = bootstrap_rankings(articles, METRICS, 50, 3, seed=1)
+    for key in METRICS:
+        pd.testing.assert_frame_equal(first[key], second[key])
+    other = bootstrap_rankings(articles, METRICS, 50, 3, seed=2)
+    assert not first['views'][['value_lo', 'value_hi']].equals(other['views'][['value_lo', 'value_hi']])
+
+
+def test_batch_size_does_not_change_the_resamples(articles, monkeypatch):
+    expected = bootstrap_rankings(articles, ['views'], 30, 3, seed=5)['views']
+    # A handful of resamples per batch instead of all thirty in one
+    monkeypatch.setattr(bootstrap, 'BATCH_ELEMENTS', 4 * len(articles))
+    pd.testing.assert_frame_equal(bootstrap_rankings(articles, ['views'], 30, 3, seed=5)['views'], expected)
+
+
+def test_observed_values_and_a_clear_leader(articles):
+    stability = bootstrap_rankings(articles, METRICS, 200, 3, seed=3)
+    table = aggregate_metrics(articles, METRICS)
+    for key in METRICS:
+        top = table[key].sort_values(ascending=False).head(3)
+        assert list(stability[key].index) == list(top.index)
+        np.testing.assert_allclose(stability[key]['value'], top.to_numpy(), rtol=1e-12)
+
+    views = stability['views']
+    assert views.index[0] == 'Lena Geller'
+    assert views['p_first'].iloc[0] == 1.0
+    assert (views['rank_lo'].iloc[0], views['rank_hi'].iloc[0]) == (1, 1)
+    assert (views['value_lo'] <= views['value']).all() and (views['value'] <= views['value_hi']).all()
+    assert np.isnan(views['p_beats_next'].iloc[-1])
+
+
+def test_resamples_draw_every_article_slot():
+    counts = resample_counts(np.random.default_rng(0), 25, 8)
+    assert counts.shape == (8, 25)
+    assert (counts.sum(axis=1) == 25).all()
+
+
+def test_table_and_text(articles):
+    stability = bootstrap_rankings(articles, ['views'], 20, 2, seed=4)['views']
+    table = bootstrap_table(stability, 'views', 20, 2)
+    assert table['columns'][3] == 'P(top 2)'
+    assert [row[:2] for row in table['rows']] == [(1, 'Lena Geller'), (2, stability.index[1])]
+    lines = format_bootstrap(table)
+    assert lines[2] == "RANK STABILITY BY PAGE VIEWS (20 resamples)"
+    assert lines[6].split()[:3] == ['1', 'Lena', 'Geller']
@@ -0,0 +1,83 @@
+"""Cached reports must be replayed for the same inputs and options, and only for those."""
+
+import json
+import os
+
+import pandas as pd
+import pytest
+from click.testing import CliRunner
+
+from parsely_analysis import cache, journalist_metrics
+from parsely_analysis.backends import polars_available
+
+
+def write_export(path, views):
+    pd.DataFrame({
+        'URL': [f'https://example.com/{i}' for i in range(3)],
+        'Publish date': '2025-01-01 10:00:00',
+        'Authors': ['Lena Geller', 'Jane Porter', 'Lena Geller, Jane Porter'],
+        'Views': views,
+    }).to_csv(path, index=False)
+
+
+@pytest.fixture
+def export(tmp_path, monkeypatch):
+    monkeypatch.setattr(cache, 'DEFAULT_CACHE_DIR', tmp_path / 'cache')
+    path = tmp_path / 'export.csv'
+    write_export(path, [10, 20, 40])
+    return path
+
+
+def run(*args):
+    result = CliRunner(mix_stderr=False).invoke(journalist_metrics.main, [*map(str, args), '-m', 'views'])
+    assert result.exit_code == 0, result.output
+    return result
+
+
+def fail_if_computed(monkeypatch):
+    """Make any recomputation of the rankings fail the run."""
+    def computed(*args, **kwargs):
+        raise AssertionError("report was recomputed")
+    monkeypatch.setattr(journalist_metrics, 'top_journalists_table', computed)
+
+
+def test_hit_replays_report_whatever_the_execution_options(export, monkeypatch):
+    first = run(export, '--backend', 'pandas')
+    fail_if_computed(monkeypatch)
+    options = [('--backend', 'pandas'), ('--workers', '2'), ('--cache-format', 'arrow')]
+    if polars_available():
+        options.append(('--backend', 'polars'))
+    for option in options:
+        assert run(export, *option).stdout == first.stdout
+
+
+def test_other_options_miss(export, monkeypatch):
+    run(export, '--top-n', '5')
+    fail_if_computed(monkeypatch)
+    result = CliRunner().invoke(journalist_metrics.main, [str(export), '-m', 'views', '--top-n', '1'])
+    assert result.exit_code != 0
+
+
+def test_changed_input_invalidates(export):
+    first = run(export)
+    stat = export.stat()
+    write_export(export, [100, 20, 40])
+    os.utime(export, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    second = run(export)
+    assert second.stdout != first.stdout
+    assert 'Lena Geller' in second.stdout.split('Jane Porter')[0]
+
+
+def test_formats_render_from_stored_tables(export, monkeypatch):
+    run(export)
+    fail_if_computed(monkeypatch)
+    document = json.loads(run(export, '--output-format', 'json').stdout)
+    assert [row['Journalist'] for row in document[0]['rows']] == ['Jane Porter', 'Lena Geller']
+
+
+def test_timing_lines_stay_out_of_the_report(export, monkeypatch):
+    first = run(export, '--bootstrap', '5', '--seed', '1')
+    assert 'RANK STABILITY' in first.stdout
+    assert 'resamples in' not in first.stdout
+    fail_if_computed(monkeypatch)
+    assert run(export, '--bootstrap', '5', '--seed', '1').stdout == first.stdout
@@ -0,0 +1,82 @@
+"""The catalog must pick the fewest non-overlapping exports covering a period, and report what none covers."""
+
+import pandas as pd
+import pytest
+from click.testing import CliRunner
+
+from parsely_analysis import catalog
+from parsely_analysis.catalog import interval_cover, print_gaps, select_exports
+
+
+def entry(start, end, site='indyweek.com'):
+    return {'site': site, 'start_date': pd.Timestamp(start), 'end_date': pd.Timestamp(end), 'path': f'{start}_{end}'}
+
+
+def spans(chosen):
+    return [(str(e['start_date'].date()), str(e['end_date'].date())) for e in chosen]
+
+
+JAN, FEB, MAR = entry('2025-01-01', '2025-01-31'), entry('2025-02-01', '2025-02-28'), entry('2025-03-01', '2025-03-31')
+QUARTER = entry('2025-01-01', '2025-03-31')
+YEAR = entry('2024-07-01', '2025-06-30')
+
+
+@pytest.mark.parametrize('entries, start, end, expected', [
+    # Monthly files beat a longer export running past the period
+    ([YEAR, JAN, FEB, MAR], '2025-01-01', '2025-03-31', [JAN, FEB, MAR]),
+    # Then the fewest files
+    ([JAN, FEB, MAR, QUARTER], '2025-01-01', '2025-03-31', [QUARTER]),
+    ([JAN, FEB, QUARTER], '2025-01-01', '2025-02-28', [JAN, FEB]),
+    # Covering every day comes first, even with a long export
+    ([JAN, MAR, YEAR], '2025-01-01', '2025-03-31', [YEAR]),
+    # Only the first export may start before the period
+    ([JAN, FEB, MAR], '2025-01-15', '2025-02-28', [JAN, FEB]),
+])
+def test_minimal_cover(entries, start, end, expected):
+    chosen, gaps = interval_cover(entries, pd.Timestamp(start), pd.Timestamp(end))
+    assert gaps == []
+    assert spans(chosen) == spans(expected)
+
+
+def test_gaps_are_reported(capsys):
+    chosen, gaps = interval_cover([JAN, MAR], pd.Timestamp('2024-12-15'), pd.Timestamp('2025-04-10'))
+    assert spans(chosen) == spans([JAN, MAR])
+    assert gaps == [(pd.Timestamp('2024-12-15'), pd.Timestamp('2024-12-31')),
+                    (pd.Timestamp('2025-02-01'), pd.Timestamp('2025-02-28')),
+                    (pd.Timestamp('2025-04-01'), pd.Timestamp('2025-04-10'))]
+    print_gaps('indyweek.com', gaps[1:2])
+    assert capsys.readouterr().out == "Warning: no indyweek.com export covers 2025-02-01 to 2025-02-28\n"
+
+
+def test_select_exports_covers_each_site():
+    other = entry('2025-01-01', '2025-03-31', site='example.com')
+    selection = select_exports([JAN, MAR, other], end=pd.Timestamp('2025-03-31'))
+    assert spans(selection['example.com'][0]) == spans([other])
+    assert spans(selection['indyweek.com'][0]) == spans([JAN, MAR])
+    assert selection['indyweek.com'][1] == [(pd.Timestamp('2025-02-01'), pd.Timestamp('2025-02-28'))]
+    assert list(select_exports([JAN, MAR, other], site='example.com')) == ['example.com']
+
+
+def test_cli_lists_the_cover_and_warns_about_gaps(tmp_path):
+    exports = tmp_path / 'exports'
+    exports.mkdir()
+    for month in ['Jan-01-2025-Jan-31-2025', 'Mar-01-2025-Mar-31-2025']:
+        pd.DataFrame({
+            'URL': ['https://example.com/1', 'https://example.com/2'],
+            'Title': ['One', 'Two,\n"lines"'],
+            'Authors': ['Lena Geller', 'Jane Porter'],
+        }).to_csv(exports / f'posts-export-by-page-views-{month}-indyweek-com.csv', index=False)
+    args = [str(exports), '--catalog', str(tmp_path / 'catalog.sqlite')]
+
+    result = CliRunner().invoke(catalog.main, args)
+    assert result.exit_code == 0, result.output
+    assert [line.split()[3] for line in result.output.splitlines() if 'indyweek.com' in line] == ['2', '2']
+
+    result = CliRunner().invoke(catalog.main, [*args, '--from', '2025-01-01', '--to', '2025-03-31'])
+    assert result.exit_code == 0, result.output
+    lines = result.output.splitlines()
+    assert lines[0] == "Warning: no indyweek.com export covers 2025-02-01 to 2025-02-28"
+    assert [line.rsplit('/', 1)[1] for line in lines[1:]] == [
+        'posts-export-by-page-views-Jan-01-2025-Jan-31-2025-indyweek-com.csv',
+        'posts-export-by-page-views-Mar-01-2025-Mar-31-2025-indyweek-com.csv',
+    ]
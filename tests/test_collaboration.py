@@ -0,0 +1,64 @@
+"""Co-author pairs must count every pair of credited authors on every article once."""
+
+from itertools import combinations
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from parsely_analysis.collaboration import (coauthor_pairs, collaboration_tables, collaborator_counts,
+                                            format_collaboration)
+from parsely_analysis.metrics import aggregate_metrics
+
+AUTHORS = ['Lisa Sorg', 'Jane Porter', 'Staff', 'Sarah Edwards', 'Geoff West']
+
+
+def articles(authors, views):
+    return pd.DataFrame({
+        'URL': [f'https://example.com/{i}' for i in range(len(authors))],
+        'Publish date': '2025-01-01 10:00:00',
+        'Authors': authors,
+        'Views': views,
+    })
+
+
+def test_pairs_are_keyed_alphabetically_and_ranked():
+    df = articles(['Zoe Kim, Amy Lu', 'Amy Lu, Zoe Kim, Bo Chan', 'Zoe Kim, Amy Lu', 'Bo Chan'], [100, 300, 50, 10])
+    table = coauthor_pairs(df)
+    assert list(table.index) == [('Amy Lu', 'Zoe Kim'), ('Amy Lu', 'Bo Chan'), ('Bo Chan', 'Zoe Kim')]
+    assert table['shared_articles'].tolist() == [3, 1, 1]
+    # Two of three equal shares of the 300-view article go to each pair on it
+    assert table['shared_credit'].tolist() == [100 + 200 + 50, 200, 200]
+    assert collaborator_counts(table).to_dict() == {'Amy Lu': 2, 'Zoe Kim': 2, 'Bo Chan': 2}
+
+
+def test_matches_counting_every_pair():
+    rng = np.random.default_rng(29)
+    n = 400
+    df = articles([', '.join(rng.choice(AUTHORS, size=rng.integers(1, 5), replace=False)) for _ in range(n)],
+                  rng.integers(0, 1000, size=n))
+    table = coauthor_pairs(df, ignored_authors=('Staff',))
+
+    expected = {}
+    for byline, views in zip(df['Authors'], df['Views']):
+        names = [name for name in byline.split(', ') if name != 'Staff']
+        for pair in combinations(sorted(names), 2):
+            shared, credit = expected.get(pair, (0, 0.0))
+            expected[pair] = (shared + 1, credit + 2 * views / len(names))
+    assert sorted(table.index) == sorted(expected)
+    for pair, (shared, credit) in expected.items():
+        assert table.loc[pair, 'shared_articles'] == shared
+        assert table.loc[pair, 'shared_credit'] == pytest.approx(credit)
+
+
+def test_tables_and_text():
+    df = articles(['Zoe Kim, Amy Lu', 'Amy Lu', 'Amy Lu', 'Zoe Kim, Bo Chan', 'Zoe Kim'], [100, 10, 10, 40, 5])
+    pairs, ratios = collaboration_tables(aggregate_metrics(df, ['views']), coauthor_pairs(df), min_articles=2)
+    assert pairs['rows'] == [('Amy Lu', 'Zoe Kim', 1, 100.0), ('Bo Chan', 'Zoe Kim', 1, 40.0)]
+    assert pairs['columns'][3] == 'Shared Page Views'
+    # Only journalists with more than min_articles articles
+    assert [row[0] for row in ratios['rows']] == ['Zoe Kim', 'Amy Lu']
+    assert ratios['rows'][0][1:] == (2 / 3, 3, 2, 2)
+    lines = format_collaboration([pairs, ratios])
+    assert lines[6].split() == ['Amy', 'Lu', '+', 'Zoe', 'Kim', '1', '100']
+    assert lines[-2].split() == ['Zoe', 'Kim', '66.7%', '3', '2', '2']
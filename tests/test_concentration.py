@@ -0,0 +1,67 @@
+"""Concentration statistics must match computing them author by author."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from parsely_analysis.concentration import author_concentration, concentration_table, format_concentration
+
+AUTHORS = ['Lisa Sorg', 'Jane Porter', 'Staff', 'Sarah Edwards', 'Geoff West']
+
+
+def articles(authors, views):
+    return pd.DataFrame({
+        'URL': [f'https://example.com/{i}' for i in range(len(authors))],
+        'Publish date': '2025-01-01 10:00:00',
+        'Authors': authors,
+        'Views': views,
+    })
+
+
+def gini(values):
+    values = np.sort(values)
+    n = len(values)
+    return sum((2 * i - n - 1) * x for i, x in enumerate(values, 1)) / (n * values.sum())
+
+
+def test_even_and_one_hit_authors():
+    df = articles(['Even'] * 3 + ['Hit'] * 3 + ['Even, Hit'], [10, 10, 10, 0, 0, 100, 20])
+    table = author_concentration(df)
+    assert table.loc['Even'].tolist() == [40, 4, 10, 0.25, 0.0]
+    # The shared article credits 10 to each; Hit's values are 0, 0, 10, 100
+    assert table.loc['Hit', 'total'] == 110
+    assert table.loc['Hit', 'median'] == 5
+    assert table.loc['Hit', 'top_share'] == pytest.approx(100 / 110)
+    assert table.loc['Hit', 'gini'] == pytest.approx(gini(np.array([0, 0, 10, 100])))
+
+
+def test_matches_per_author_computation():
+    rng = np.random.default_rng(23)
+    n = 500
+    df = articles([', '.join(rng.choice(AUTHORS, size=rng.integers(1, 3), replace=False)) for _ in range(n)],
+                  rng.integers(0, 1000, size=n))
+    table = author_concentration(df, ignored_authors=('Staff',))
+    assert 'Staff' not in table.index
+
+    credited = {}
+    for byline, views in zip(df['Authors'], df['Views']):
+        names = [name for name in byline.split(', ') if name != 'Staff']
+        for name in names:
+            credited.setdefault(name, []).append(views / len(names))
+    assert sorted(table.index) == sorted(credited)
+    for author, values in credited.items():
+        values = np.array(values)
+        row = table.loc[author]
+        assert row['articles'] == len(values)
+        assert row['total'] == pytest.approx(values.sum())
+        assert row['median'] == pytest.approx(np.median(values))
+        assert row['top_share'] == pytest.approx(values.max() / values.sum())
+        assert row['gini'] == pytest.approx(gini(values))
+
+
+def test_authors_without_views_have_no_shares():
+    table = author_concentration(articles(['Quiet', 'Quiet', 'Loud'], [0, 0, 5]))
+    assert np.isnan(table.loc['Quiet', 'gini']) and np.isnan(table.loc['Quiet', 'top_share'])
+    rendered = concentration_table(table, 'views', top_n=5)
+    assert [row[1] for row in rendered['rows']] == ['Loud', 'Quiet']
+    assert format_concentration(rendered)[-1].split()[-2:] == ['-', '-']
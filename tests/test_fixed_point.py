@@ -0,0 +1,63 @@
+"""Split-credit totals must be exact, whatever order the rows come in."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from parsely_analysis.backends import aggregate_frame, polars_available
+from parsely_analysis.metrics import DEFAULT_METRICS
+
+METRICS = list(DEFAULT_METRICS) + ['solo_articles', 'collab_articles']
+AUTHORS = ['Lisa Sorg', 'Jane Porter', 'Staff', 'Sarah Edwards', 'Geoff West', 'Lena Geller', 'Thomas Goldsmith']
+
+BACKENDS = [
+    'pandas',
+    pytest.param('polars', marks=pytest.mark.skipif(not polars_available(), reason='polars not installed')),
+]
+
+
+@pytest.fixture(scope='module')
+def articles():
+    """Articles with fractional metrics split between one to four authors."""
+    rng = np.random.default_rng(3)
+    n = 3000
+    dates = pd.Timestamp('2024-01-01') + pd.to_timedelta(rng.integers(0, 365, size=n), unit='D')
+    return pd.DataFrame({
+        'URL': [f'https://example.com/{i}' for i in range(n)],
+        'Publish date': dates.strftime('%Y-%m-%d %H:%M:%S'),
+        'Authors': [', '.join(rng.choice(AUTHORS, size=rng.integers(1, 5), replace=False)) for _ in range(n)],
+        'Visitors': rng.integers(0, 4000, size=n),
+        'Views': np.round(rng.random(n) * 1000, 2),
+        'Engaged minutes': np.round(rng.random(n) * 100, 3),
+        'New vis.': rng.integers(0, 3000, size=n),
+        'Social refs': rng.integers(0, 100, size=n),
+    })
+
+
+def by_name(table):
+    table = table.reset_index().astype({'author': str})
+    return table.sort_values(list(table.columns[:table.columns.get_loc('author') + 1]), ignore_index=True)
+
+
+@pytest.mark.parametrize('backend', BACKENDS)
+@pytest.mark.parametrize('by_month', [False, True])
+def test_totals_identical_under_row_shuffling(articles, backend, by_month):
+    expected = by_name(aggregate_frame(articles.copy(), METRICS, by_month=by_month, backend=backend))
+    for seed in range(3):
+        shuffled = articles.sample(frac=1, random_state=seed, ignore_index=True)
+        table = by_name(aggregate_frame(shuffled, METRICS, by_month=by_month, backend=backend))
+        pd.testing.assert_frame_equal(table, expected, check_exact=True)
+
+
+@pytest.mark.parametrize('views', [[0.1, 0.2, 0.3], [0.3, 0.2, 0.1]])
+def test_split_credit_is_correctly_rounded(views):
+    # Summing the float thirds gives 0.2 in one order and 0.19999999999999998 in the other
+    df = pd.DataFrame({
+        'URL': [f'https://example.com/{i}' for i in range(3)],
+        'Publish date': '2025-01-01 10:00:00',
+        'Authors': ['Lena Geller, Jane Porter, Staff'] * 3,
+        'Views': views,
+    })
+    table = aggregate_frame(df, ['views'], backend='pandas')
+    assert table['views'].tolist() == [0.2, 0.2, 0.2]
+    assert table['article_count'].tolist() == [3, 3, 3]
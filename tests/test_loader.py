@@ -0,0 +1,61 @@
+"""Parallel CSV parsing must return the same frame as the single-threaded pandas read."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from parsely_analysis.backends import aggregate_file, compare_tables
+from parsely_analysis.loader import load_export, read_csv_parallel, regular_quoting
+
+
+@pytest.fixture(scope='module')
+def export(tmp_path_factory):
+    """A CSV export spanning several pandas read chunks, with new authors appearing late."""
+    rng = np.random.default_rng(11)
+    n = 20000
+    # Names that sort first appear only in later chunks, so neither reader meets them in sorted order
+    authors = np.array([f'Writer {i:03d}' for i in range(200)], dtype=object)
+    late = np.array(['3183934309', 'AJ Williams', 'aaron smith'], dtype=object)
+    column = authors[rng.integers(0, len(authors), size=n)]
+    column[12000::7] = late[rng.integers(0, len(late), size=len(column[12000::7]))]
+    column[::13] = np.nan
+    df = pd.DataFrame({
+        'URL': [f'https://example.com/{i}' for i in range(n)],
+        'Title': [f'Title, "quoted"\nline {i}' if i % 101 == 0 else f'Title {i}' for i in range(n)],
+        'Publish date': '2025-01-01 10:00:00',
+        'Authors': column,
+        'Section': rng.choice(['News', 'Arts', 'Food', ''], size=n),
+        'Tags': rng.choice(['music,news', 'food', 'zz top', 'arts'], size=n),
+        'Views': rng.integers(0, 5000, size=n),
+        # 64 columns in all, so pandas reads 8192 rows per chunk
+        **{f'Other {i}': 0 for i in range(57)},
+    })
+    path = tmp_path_factory.mktemp('export') / 'export.csv'
+    df.to_csv(path, index=False)
+    return str(path)
+
+
+@pytest.mark.parametrize('columns', [None, ['Authors', 'Tags', 'Views']])
+def test_parallel_read_matches_pandas(export, columns):
+    expected = load_export(export, columns)
+    result = read_csv_parallel(export, columns, workers=3)
+    pd.testing.assert_frame_equal(result, expected)
+    for col in ('Authors', 'Section', 'Tags'):
+        if col in expected.columns:
+            assert result[col].cat.categories.equals(expected[col].cat.categories)
+            assert result[col].cat.categories.is_monotonic_increasing
+
+
+def test_unquoted_quote_falls_back_to_serial_read(tmp_path):
+    """A '"' inside an unquoted field flips quote parity, which must not move record boundaries."""
+    titles = ['A 5" tall tale' if i == 3 else f'"Title, {i}\nsecond line"' if i % 2 else f'Title {i}'
+              for i in range(400)]
+    path = tmp_path / 'export.csv'
+    path.write_text('URL,Title,Publish date,Authors,Views\n' + ''.join(
+        f'https://example.com/{i},{title},2025-01-01 10:00:00,Writer {i % 7},{i}\n' for i, title in enumerate(titles)))
+    assert not regular_quoting(path)
+    expected = load_export(path)
+    assert len(expected) == 400
+    pd.testing.assert_frame_equal(read_csv_parallel(path, workers=4), expected)
+    serial = aggregate_file(path, ['views'], backend='pandas')
+    assert compare_tables(aggregate_file(path, ['views'], backend='pandas', workers=4), serial) == 0.0
@@ -0,0 +1,58 @@
+"""Overlapping exports of one site must count each article once, in sites and in watch."""
+
+import json
+
+import pandas as pd
+from click.testing import CliRunner
+
+from parsely_analysis import watch
+from parsely_analysis.merge import load_merged
+
+MONTHLY = 'posts-export-by-page-views-Jan-01-2025-Jan-31-2025-example-com.csv'
+RANGE = 'posts-export-by-page-views-Dec-01-2024-Feb-28-2025-example-com.csv'
+
+
+def write_export(path, urls, authors, views, dates):
+    pd.DataFrame({'URL': urls, 'Publish date': dates, 'Authors': authors, 'Views': views}).to_csv(path, index=False)
+
+
+def overlapping_exports(directory):
+    """A monthly export and a range export sharing one article under two spellings of its URL."""
+    write_export(directory / MONTHLY, ['https://www.example.com/a/', 'https://example.com/b'],
+                 ['Lena Geller', 'Jane Porter'], [100, 10], ['2025-01-05 10:00:00', '2025-01-07 10:00:00'])
+    write_export(directory / RANGE, ['http://example.com/a?utm_source=x', 'https://example.com/c'],
+                 ['Lena Geller', 'Lena Geller'], [300, 1000], ['2025-01-05 10:00:00', '2025-02-01 10:00:00'])
+
+
+def test_finer_window_wins(tmp_path):
+    overlapping_exports(tmp_path)
+    df, dropped = load_merged([tmp_path / RANGE, tmp_path / MONTHLY])
+    assert dropped == 1
+    assert sorted(df['Views']) == [10, 100, 1000]
+
+
+def test_watch_counts_an_article_in_overlapping_exports_once(tmp_path):
+    exports = tmp_path / 'exports'
+    exports.mkdir()
+    overlapping_exports(exports)
+    args = [str(exports), '--store', str(tmp_path / 'store'), '--reports', str(tmp_path / 'reports'),
+            '--once', '--backend', 'pandas', '-m', 'views']
+    result = CliRunner().invoke(watch.main, args)
+    assert result.exit_code == 0, result.output
+    assert 'Skipped 1 rows' in result.output
+
+    params = watch.store_params(['views'], None, [])
+    manifest, partials = watch.load_store(tmp_path / 'store', params)
+    assert [sorted(entry['exports']) for entry in manifest.values()] == [sorted([MONTHLY, RANGE])]
+    table = watch.merged_months(partials, watch.missing_reports(partials, tmp_path / 'none'), params['sums'])
+    assert table.loc[(pd.Period('2025-01', 'M'), 'Lena Geller'), 'views'] == 100
+    assert table.loc[(pd.Period('2025-02', 'M'), 'Lena Geller'), 'views'] == 1000
+
+    # Removing the range export leaves the monthly one on its own; a lost report is written again
+    (exports / RANGE).unlink()
+    (tmp_path / 'reports' / '2025-01.txt').unlink()
+    result = CliRunner().invoke(watch.main, args)
+    assert result.exit_code == 0, result.output
+    stored = json.loads((tmp_path / 'store' / 'manifest.json').read_text())
+    assert [list(entry['exports']) for entry in stored['exports'].values()] == [[MONTHLY]]
+    assert sorted(p.name for p in (tmp_path / 'reports').iterdir()) == ['2025-01.txt']
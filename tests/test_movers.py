@@ -0,0 +1,64 @@
+"""Month-over-month movement must compare each author's rank and value with the month before."""
+
+import numpy as np
+import pandas as pd
+
+from parsely_analysis.movers import compute_movers, format_movers, movers_tables
+
+
+def month_table(months):
+    """(year_month, author) sums table from {month: {author: (views, visitors)}}, one article each."""
+    rows = [(pd.Period(month, 'M'), author, views, visitors, 1)
+            for month, authors in months.items() for author, (views, visitors) in authors.items()]
+    table = pd.DataFrame(rows, columns=['year_month', 'author', 'views', 'visitors', 'article_count'])
+    return table.set_index(['year_month', 'author']).astype({'views': float})
+
+
+TABLE = month_table({
+    '2025-01': {'Ann': (100, 1), 'Bea': (50, 2), 'Cal': (10, 1)},
+    '2025-02': {'Ann': (40, 1), 'Bea': (80, 4), 'Cal': (60, 6)},
+    '2025-03': {'Ann': (200, 4), 'Bea': (70, 1)},
+})
+
+
+def by_author(movers, key, matrix, t):
+    return {author: value for author, value in zip(movers['authors'], movers[key][matrix][t])}
+
+
+def test_ranks_changes_and_growth():
+    movers = compute_movers(TABLE, ['views', 'avg_views'])
+    assert [str(m) for m in movers['months']] == ['2025-01', '2025-02', '2025-03']
+    assert by_author(movers, 'views', 'ranks', 1) == {'Ann': 3, 'Bea': 1, 'Cal': 2}
+    assert by_author(movers, 'views', 'rank_change', 1) == {'Ann': -2, 'Bea': 1, 'Cal': 1}
+    assert by_author(movers, 'views', 'growth', 1) == {'Ann': -0.6, 'Bea': 0.6, 'Cal': 5.0}
+
+    # An author missing from a month has neither a rank nor a change in it
+    march = by_author(movers, 'views', 'rank_change', 2)
+    assert (march['Ann'], march['Bea']) == (2, -1) and np.isnan(march['Cal'])
+    assert np.isnan(by_author(movers, 'views', 'ranks', 2)['Cal'])
+
+    # Ratio metrics are ranked on the ratio of the month's sums
+    assert by_author(movers, 'avg_views', 'ranks', 1) == {'Ann': 1, 'Bea': 2, 'Cal': 3}
+    assert by_author(movers, 'avg_views', 'values', 2)['Ann'] == 50
+
+
+def test_tables_list_gains_drops_and_growth_per_month():
+    tables = movers_tables(compute_movers(TABLE, ['views']), 'views', top_n=1)
+    assert [table['meta']['month'] for table in tables] == ['2025-02', '2025-03']
+    assert tables[0]['rows'] == [
+        ('gain', 'Bea', 2, 1, 1, 0.6, 50.0, 80.0),
+        ('drop', 'Ann', 1, 3, -2, -0.6, 100.0, 40.0),
+        ('growth', 'Cal', 3, 2, 1, 5.0, 10.0, 60.0),
+    ]
+    assert [row[:2] for row in tables[1]['rows']] == [('gain', 'Ann'), ('drop', 'Bea'), ('growth', 'Ann')]
+
+    lines = format_movers('views', tables)
+    assert "  Biggest rank drops:" in lines
+    assert any(line.strip().startswith('Ann') and '#1   -> #3   (-2)' in line for line in lines)
+
+
+def test_months_without_movement():
+    table = month_table({'2025-01': {'Ann': (100, 1)}, '2025-02': {'Bea': (80, 1)}})
+    tables = movers_tables(compute_movers(table, ['views']), 'views', top_n=5)
+    assert tables[0]['rows'] == []
+    assert format_movers('views', tables).count("    (none)") == 3
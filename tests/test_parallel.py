@@ -0,0 +1,68 @@
+"""Parallel aggregation must return the serial result for any number of workers."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from parsely_analysis.backends import aggregate_file
+from parsely_analysis.metrics import DEFAULT_METRICS
+
+METRICS = list(DEFAULT_METRICS) + ['solo_articles', 'collab_articles', 'avg_minutes_per_view']
+AUTHORS = ['Lisa Sorg', 'Jane Porter', 'Staff', 'Sarah Edwards', 'lisa sorg', 'Geoff West']
+
+
+@pytest.fixture(scope='module', params=['csv', 'parquet'])
+def export(request, tmp_path_factory):
+    """An export with multi-line titles, bylines repeating an author and some invalid dates."""
+    rng = np.random.default_rng(5)
+    n = 5000
+    dates = pd.Timestamp('2024-01-01') + pd.to_timedelta(rng.integers(0, 540, size=n), unit='D')
+    dates = dates.strftime('%Y-%m-%d %H:%M:%S').to_numpy(dtype=object)
+    dates[5::97] = 'not a date'
+    df = pd.DataFrame({
+        'URL': [f'https://example.com/{i}' for i in range(n)],
+        'Title': [f'Title, "quoted"\nline {i}' if i % 31 == 0 else f'Title {i}' for i in range(n)],
+        'Publish date': dates,
+        'Authors': [', '.join(rng.choice(AUTHORS, size=rng.integers(1, 4))) if i % 50 else '' for i in range(n)],
+        'Visitors': rng.integers(0, 4000, size=n),
+        'Views': np.round(rng.random(n) * 1000, 2),
+        'Engaged minutes': np.round(rng.random(n) * 100, 3),
+        'New vis.': rng.integers(0, 3000, size=n),
+        'Social refs': rng.integers(0, 100, size=n),
+    })
+    path = tmp_path_factory.mktemp('export') / f'export.{request.param}'
+    if request.param == 'csv':
+        df.to_csv(path, index=False)
+    else:
+        df.to_parquet(path, index=False)
+    return str(path)
+
+
+def plain(table):
+    """A table with its author level as plain strings, so categorical and object keys compare equal."""
+    table = table.reset_index()
+    return table.astype({'author': str})
+
+
+@pytest.mark.parametrize('by_month, after_date, ignored_authors', [
+    (False, None, ()),
+    (True, None, ()),
+    (True, '2024-09-01', ('Staff',)),
+])
+def test_parallel_matches_serial_for_any_worker_count(export, by_month, after_date, ignored_authors):
+    serial = plain(aggregate_file(export, METRICS, after_date, ignored_authors, by_month, backend='pandas'))
+    for workers in (2, 3, 4, 7):
+        table = aggregate_file(export, METRICS, after_date, ignored_authors, by_month, workers=workers)
+        pd.testing.assert_frame_equal(plain(table), serial, check_exact=True)
+
+
+def test_more_workers_than_rows(tmp_path):
+    path = tmp_path / 'export.csv'
+    pd.DataFrame({
+        'URL': ['https://example.com/1', 'https://example.com/2'],
+        'Publish date': '2025-01-01 10:00:00',
+        'Authors': ['Lena Geller', 'Lena Geller, Jane Porter'],
+        'Views': [10, 20],
+    }).to_csv(path, index=False)
+    serial = plain(aggregate_file(path, ['views'], backend='pandas'))
+    pd.testing.assert_frame_equal(plain(aggregate_file(path, ['views'], workers=8)), serial, check_exact=True)
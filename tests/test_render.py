@@ -0,0 +1,83 @@
+"""Every output format must be rendered from the same ranking tables."""
+
+import csv
+import io
+import json
+
+import numpy as np
+import pandas as pd
+from click.testing import CliRunner
+
+from parsely_analysis import journalist_metrics
+from parsely_analysis.render import freeze_tables, ranking_table, render_tables, write_lines
+
+
+def tables():
+    return [
+        ranking_table("TOP 2 JOURNALISTS BY PAGE VIEWS", ['Rank', 'Journalist', 'Views'],
+                      [(1, 'Lena | Geller', np.float64(1234.5)), (2, 'Jane Porter', np.nan)],
+                      meta={'report': 'top', 'metric': 'views'}, notes=["From 2025-01-01"],
+                      formats={'Views': lambda value: "-" if np.isnan(value) else f"{value:,.0f}"}),
+        ranking_table("TOP TAGS", ['Rank', 'Tag', 'Articles'], [(np.int64(1), 'music', np.int64(7))],
+                      meta={'report': 'tags', 'month': '2025-01'}),
+    ]
+
+
+def test_csv_shares_one_header():
+    rows = list(csv.DictReader(io.StringIO(render_tables(tables(), 'csv'))))
+    assert list(rows[0]) == ['report', 'metric', 'month', 'Rank', 'Journalist', 'Views', 'Tag', 'Articles']
+    assert rows[0] == {'report': 'top', 'metric': 'views', 'month': '', 'Rank': '1', 'Journalist': 'Lena | Geller',
+                       'Views': '1234.5', 'Tag': '', 'Articles': ''}
+    assert rows[1]['Views'] == ''
+    assert (rows[2]['report'], rows[2]['month'], rows[2]['Tag'], rows[2]['Journalist']) == ('tags', '2025-01', 'music', '')
+
+
+def test_json_keeps_raw_values():
+    document = json.loads(render_tables(tables(), 'json'))
+    assert [table['title'] for table in document] == ["TOP 2 JOURNALISTS BY PAGE VIEWS", "TOP TAGS"]
+    assert document[0]['metric'] == 'views' and document[0]['notes'] == ["From 2025-01-01"]
+    assert document[0]['rows'] == [{'Rank': 1, 'Journalist': 'Lena | Geller', 'Views': 1234.5},
+                                   {'Rank': 2, 'Journalist': 'Jane Porter', 'Views': None}]
+    assert document[1]['rows'] == [{'Rank': 1, 'Tag': 'music', 'Articles': 7}]
+
+
+def test_markdown_uses_display_formats():
+    lines = render_tables(tables(), 'markdown').splitlines()
+    assert lines[:3] == ["## TOP 2 JOURNALISTS BY PAGE VIEWS", "", "From 2025-01-01  "]
+    assert "| 1 | Lena \\| Geller | 1,234 |" in lines
+    assert "| 2 | Jane Porter | - |" in lines
+
+
+def test_frozen_tables_render_the_same():
+    frozen = json.loads(json.dumps(freeze_tables(tables())))
+    for output_format in ('markdown', 'csv', 'json'):
+        assert render_tables(frozen, output_format) == render_tables(tables(), output_format)
+
+
+def test_write_lines_writes_once():
+    out = io.StringIO()
+    write_lines(["a", "b"], out)
+    assert out.getvalue() == "a\nb\n"
+
+
+def test_cli_formats_agree(tmp_path):
+    path = tmp_path / 'export.csv'
+    pd.DataFrame({
+        'URL': [f'https://example.com/{i}' for i in range(4)],
+        'Publish date': '2025-01-01 10:00:00',
+        'Authors': ['Lena Geller', 'Jane Porter', 'Lena Geller, Jane Porter', 'Geoff West'],
+        'Views': [100, 20, 40, 5],
+    }).to_csv(path, index=False)
+    outputs = {}
+    for output_format in ('csv', 'json'):
+        result = CliRunner(mix_stderr=False).invoke(
+            journalist_metrics.main, [str(path), '-m', 'views', '--no-cache', '--output-format', output_format])
+        assert result.exit_code == 0, result.output
+        outputs[output_format] = result.stdout
+
+    document = json.loads(outputs['json'])
+    rows = list(csv.DictReader(io.StringIO(outputs['csv'])))
+    assert len(rows) == sum(len(table['rows']) for table in document)
+    first = document[0]['rows']
+    assert [row['Journalist'] for row in first] == ['Lena Geller', 'Jane Porter', 'Geoff West']
+    assert [row['Journalist'] for row in rows[:3]] == ['Lena Geller', 'Jane Porter', 'Geoff West']